@@ -0,0 +1,116 @@
+"""
+Benchmark do BarcaExpert
+
+Cria uma loja sintética em um banco SQLite temporário, executa os cenários
+cronometrados e grava os resultados em JSON.
+
+Uso (a partir da pasta src):
+    python -m benchmark --produtos 5000 --clientes 500 --vendas 20000 --dias 365 --saida resultado.json
+    python -m benchmark --comparar antes.json depois.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmark.cenarios import CENARIOS, resumir
+from benchmark.gerador import popular_banco
+from db.database import Database
+
+
+def executar(args):
+    cenarios = args.cenarios or list(CENARIOS)
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = Database(os.path.join(diretorio, 'benchmark.db'))
+        db.inicializar_tabelas()
+
+        inicio = time.perf_counter()
+        dados = popular_banco(db, args.produtos, args.clientes, args.vendas, args.dias,
+                              args.itens, args.semente)
+        tempo_carga = time.perf_counter() - inicio
+        print(f"Base sintética criada em {tempo_carga:.2f}s")
+
+        resultados = {}
+        for nome in cenarios:
+            funcao, repeticoes_padrao = CENARIOS[nome]
+            repeticoes = args.repeticoes or repeticoes_padrao
+            aleatorio = random.Random(args.semente)
+            try:
+                resultados[nome] = resumir(funcao(db, dados, aleatorio, repeticoes))
+            except ImportError as e:
+                # Ex.: pandas/openpyxl ausentes para o cenário de exportação
+                resultados[nome] = {'ignorado': str(e)}
+            print(f"{nome:<12} {resultados[nome]}")
+
+        estatisticas_pool = db.estatisticas_conexao()
+        db.fechar()
+
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'parametros': {
+            'produtos': args.produtos, 'clientes': args.clientes, 'vendas': args.vendas,
+            'dias': args.dias, 'itens': args.itens, 'semente': args.semente,
+        },
+        'carga_s': round(tempo_carga, 3),
+        'cenarios': resultados,
+        'pool': estatisticas_pool,
+    }
+
+
+def comparar(caminho_antes, caminho_depois):
+    """Mostrar a variação de p50/p95 entre dois arquivos de resultado"""
+    with open(caminho_antes, encoding='utf-8') as f:
+        antes = json.load(f)['cenarios']
+    with open(caminho_depois, encoding='utf-8') as f:
+        depois = json.load(f)['cenarios']
+
+    print(f"{'CENÁRIO':<12} {'MÉTRICA':<8} {'ANTES':>10} {'DEPOIS':>10} {'VARIAÇÃO':>9}")
+    for nome in sorted(set(antes) & set(depois)):
+        for metrica in ('p50_ms', 'p95_ms'):
+            a, d = antes[nome].get(metrica), depois[nome].get(metrica)
+            if a is None or d is None:
+                continue
+            variacao = f"{(d - a) / a * 100:+.1f}%" if a else 'n/a'
+            print(f"{nome:<12} {metrica:<8} {a:>10.3f} {d:>10.3f} {variacao:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do banco de dados do BarcaExpert")
+    parser.add_argument('--produtos', type=int, default=1000)
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--vendas', type=int, default=5000)
+    parser.add_argument('--dias', type=int, default=90)
+    parser.add_argument('--itens', type=int, default=5, help="máximo de itens por venda")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--repeticoes', type=int, default=None,
+                        help="repetições por cenário (padrão definido em cada cenário)")
+    parser.add_argument('--cenarios', nargs='*', choices=list(CENARIOS))
+    parser.add_argument('--saida', help="arquivo JSON para gravar os resultados")
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTES', 'DEPOIS'))
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+
+    resultado = executar(args)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"Resultados gravados em {args.saida}")
+    else:
+        json.dump(resultado, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import statistics
+import tempfile
+import time
+
+
+def resumir(tempos):
+    """Estatísticas (em milissegundos) de uma lista de durações em segundos"""
+    if not tempos:
+        return {'execucoes': 0}
+    ordenados = sorted(tempos)
+
+    def percentil(p):
+        return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))] * 1000
+
+    return {
+        'execucoes': len(tempos),
+        'total_ms': round(sum(tempos) * 1000, 3),
+        'media_ms': round(statistics.fmean(tempos) * 1000, 4),
+        'p50_ms': round(percentil(50), 4),
+        'p95_ms': round(percentil(95), 4),
+        'p99_ms': round(percentil(99), 4),
+        'max_ms': round(ordenados[-1] * 1000, 4),
+    }
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for i in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(i)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def cenario_checkout(db, dados, aleatorio, repeticoes):
+    """Venda completa de um carrinho (registrar_venda), como no F4 do caixa"""
+    from controler.venda_controller import VendaController
+
+    controller = VendaController(db, usuario_id=1)
+    precos = {linha['id']: linha['preco_venda']
+              for linha in db.buscar_todos("SELECT id, preco_venda FROM produtos WHERE estoque > 10")}
+    ids = list(precos)
+
+    def vender(_):
+        controller.carrinho = [
+            {'produto_id': produto_id, 'nome': '', 'quantidade': 1,
+             'preco_unitario': precos[produto_id], 'subtotal': precos[produto_id]}
+            for produto_id in aleatorio.sample(ids, min(len(ids), aleatorio.randint(1, 10)))
+        ]
+        controller.registrar_venda(None, 'dinheiro')
+
+    return medir(vender, repeticoes)
+
+
+def cenario_busca(db, dados, aleatorio, repeticoes):
+    """Pesquisa de produtos por trecho do nome, como em buscar_produto"""
+    from utils.busca_interativa import BuscaInterativa
+    from benchmark.gerador import MARCAS, TIPOS
+
+    busca = BuscaInterativa(db)
+    termos = [termo[:5] for termo in MARCAS + TIPOS]
+
+    def buscar(_):
+        busca.pesquisar_produtos(aleatorio.choice(termos), aleatorio.choice(['nome', 'texto']), com_estoque=True)
+
+    return medir(buscar, repeticoes)
+
+
+def cenario_fiado(db, dados, aleatorio, repeticoes):
+    """Total em aberto (fiado) de um cliente, como em consultar_limite_credito"""
+    from controler.cliente_controller import ClienteController
+
+    controller = ClienteController(db)
+    ids = dados['ids_clientes'] or [0]
+    return medir(lambda _: controller.total_em_aberto(aleatorio.choice(ids)), repeticoes)
+
+
+def cenario_exportacao(db, dados, aleatorio, repeticoes):
+    """Exportação de produtos e do relatório de vendas para Excel"""
+    from controler.import_export_controller import ImportExportController
+
+    controller = ImportExportController(db)
+    with tempfile.TemporaryDirectory() as diretorio:
+        def exportar(_):
+            controller.gerar_exportacao_produtos(diretorio)
+            controller.gerar_relatorio_vendas(diretorio)
+
+        return medir(exportar, repeticoes)
+
+
+# nome -> (função, repetições padrão)
+CENARIOS = {
+    'checkout': (cenario_checkout, 200),
+    'busca': (cenario_busca, 200),
+    'fiado': (cenario_fiado, 500),
+    'exportacao': (cenario_exportacao, 3),
+}
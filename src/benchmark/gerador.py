@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta
+from model.cliente import somente_digitos
+
+# Vocabulário usado para montar nomes de produtos parecidos com os de uma banca
+MARCAS = ['Coca-Cola', 'Guaraná', 'Skol', 'Brahma', 'Lacta', 'Nestlé', 'Garoto', 'Elma Chips',
+          'Trident', 'Halls', 'Veja', 'Placar', 'Caras', 'Marlboro', 'Fini', 'Bauducco']
+TIPOS = ['Refrigerante', 'Cerveja', 'Chocolate', 'Salgadinho', 'Chiclete', 'Bala', 'Revista',
+         'Biscoito', 'Água', 'Suco', 'Pão de Mel', 'Açaí', 'Cigarro', 'Pastilha']
+TAMANHOS = ['350ml', '600ml', '1L', '2L', '25g', '90g', '100g', '150g', 'Ed. Especial', 'UN']
+NOMES = ['Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Fábio', 'Gabriela', 'Heitor', 'Isabel',
+         'João', 'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael', 'Sofia', 'Tiago']
+SOBRENOMES = ['Silva', 'Souza', 'Oliveira', 'Santos', 'Pereira', 'Lima', 'Costa', 'Ribeiro',
+              'Almeida', 'Carvalho', 'Gomes', 'Martins']
+FORMAS_PAGAMENTO = ['dinheiro', 'credito', 'debito', 'pix', 'fiado']
+
+
+def nome_produto(aleatorio):
+    return f"{aleatorio.choice(TIPOS)} {aleatorio.choice(MARCAS)} {aleatorio.choice(TAMANHOS)}"
+
+
+def popular_banco(db, produtos=1000, clientes=200, vendas=5000, dias=90,
+                  itens_por_venda=5, semente=42, lote=5000):
+    """Gravar uma loja sintética no banco informado (já inicializado).
+    Os dados são determinísticos para a mesma semente. Retorna um resumo
+    com as quantidades e os ids gerados."""
+    aleatorio = random.Random(semente)
+
+    categorias = [linha['id'] for linha in db.buscar_todos("SELECT id FROM categorias WHERE ativo = 1")]
+    usuario_id = db.buscar_um("SELECT id FROM usuarios ORDER BY id LIMIT 1")['id']
+
+    # Produtos: código de barras EAN-13 sintético e único
+    registros = []
+    for i in range(produtos):
+        custo = aleatorio.randint(50, 5000)
+        registros.append((
+            f"789{i:010d}", f"{nome_produto(aleatorio)} #{i}", "Produto gerado para benchmark",
+            aleatorio.choice(categorias), custo, int(custo * aleatorio.uniform(1.2, 2.0)),
+            aleatorio.randint(0, 500), aleatorio.randint(0, 20), 'UN'
+        ))
+    db.executar_varios('''
+        INSERT INTO produtos (codigo_barras, nome, descricao, categoria_id, preco_custo,
+                              preco_venda, estoque, estoque_minimo, unidade)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', registros)
+    precos = {linha['id']: linha['preco_venda']
+              for linha in db.buscar_todos("SELECT id, preco_venda FROM produtos")}
+    ids_produtos = list(precos)
+
+    registros = []
+    for i in range(clientes):
+        nome = f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {i}"
+        telefone = f"(11) 9{aleatorio.randint(1000, 9999)}-{aleatorio.randint(1000, 9999)}"
+        cpf_cnpj = (f"{aleatorio.randint(100, 999)}.{aleatorio.randint(100, 999)}."
+                    f"{aleatorio.randint(100, 999)}-{aleatorio.randint(10, 99)}")
+        registros.append((
+            nome, telefone, f"cliente{i}@exemplo.com", cpf_cnpj,
+            aleatorio.choice([0, 5000, 10000, 50000]), somente_digitos(cpf_cnpj), somente_digitos(telefone)
+        ))
+    db.executar_varios('''
+        INSERT INTO clientes (nome, telefone, email, cpf_cnpj, limite_credito,
+                              cpf_cnpj_digitos, telefone_digitos)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', registros)
+    ids_clientes = [linha['id'] for linha in db.buscar_todos("SELECT id FROM clientes")]
+
+    # Vendas espalhadas pelos últimos `dias` dias, gravadas em lotes
+    inicio = datetime.now() - timedelta(days=dias)
+    segundos = max(1, dias * 86400)
+    proximo_id = (db.buscar_um("SELECT COALESCE(MAX(id), 0) AS id FROM vendas")['id'] or 0) + 1
+    cabecalhos, itens = [], []
+    for venda_id in range(proximo_id, proximo_id + vendas):
+        cliente_id = aleatorio.choice(ids_clientes) if ids_clientes and aleatorio.random() < 0.4 else None
+        forma = aleatorio.choice(FORMAS_PAGAMENTO if cliente_id else FORMAS_PAGAMENTO[:-1])
+        data = inicio + timedelta(seconds=aleatorio.randrange(segundos))
+        total = 0
+        for produto_id in aleatorio.sample(ids_produtos, min(len(ids_produtos), aleatorio.randint(1, itens_por_venda))):
+            quantidade = aleatorio.randint(1, 3)
+            preco = precos[produto_id]
+            itens.append((venda_id, produto_id, quantidade, preco, preco * quantidade))
+            total += preco * quantidade
+        cabecalhos.append((venda_id, cliente_id, usuario_id, total, forma, data.strftime('%Y-%m-%d %H:%M:%S')))
+
+        if len(itens) >= lote:
+            _gravar_vendas(db, cabecalhos, itens)
+            cabecalhos, itens = [], []
+    if cabecalhos:
+        _gravar_vendas(db, cabecalhos, itens)
+
+    return {
+        'produtos': produtos,
+        'clientes': clientes,
+        'vendas': vendas,
+        'dias': dias,
+        'semente': semente,
+        'ids_produtos': ids_produtos,
+        'ids_clientes': ids_clientes,
+    }
+
+
+def _gravar_vendas(db, cabecalhos, itens):
+    with db.transacao() as t:
+        t.executar_varios('''
+            INSERT INTO vendas (id, cliente_id, usuario_id, valor_total, forma_pagamento, data_venda)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', cabecalhos)
+        t.executar_varios('''
+            INSERT INTO venda_itens (venda_id, produto_id, quantidade, preco_unitario, subtotal)
+            VALUES (?, ?, ?, ?, ?)
+        ''', itens)
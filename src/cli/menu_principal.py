@@ -1,7 +1,7 @@
 import os
 import sys
 from datetime import datetime
-from utils.tui import read_key, print_footer_hotkeys, prompt_text, clear_screen, print_header
+from utils.tui import read_key, print_footer_hotkeys, prompt_text, clear_screen, print_header, print_title, print_table
 from dotenv import load_dotenv, set_key
 import os
 
@@ -264,14 +264,74 @@ class MenuPrincipal:
     
     def menu_relatorios(self):
         """Menu de relatórios"""
+        while True:
+            self.limpar_tela()
+            self.exibir_cabecalho()
+            print("\nMÓDULO DE RELATÓRIOS")
+            print("1. Tempos de busca e consultas (p50/p95/p99)")
+            print("0. Voltar")
+            print()
+            ansi_enabled = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
+            footer_color = os.getenv('ANSI_FOOTER_COLOR', 'cyan')
+            print_footer_hotkeys([("F1", "Tempos"), ("F12", "Voltar")], ansi_enabled, footer_color)
+            key = read_key()
+            if key in {"1", "0"}:
+                opcao = key
+            elif key == "F1":
+                opcao = "1"
+            elif key == "F12":
+                opcao = "0"
+            else:
+                opcao = prompt_text("Escolha uma opção: ")
+            
+            if opcao == "1":
+                self.relatorio_tempos()
+            elif opcao == "0":
+                break
+            else:
+                print("Opção inválida!")
+                input("Pressione Enter para continuar...")
+    
+    def relatorio_tempos(self, limite_sql=15):
+        """Percentis de tempo das buscas (por entidade/modo/origem) e das instruções
+        SQL mais lentas desde o início do sistema, mais os contadores do catálogo"""
         self.limpar_tela()
         self.exibir_cabecalho()
-        print("\nMÓDULO DE RELATÓRIOS")
-        print("Em desenvolvimento...")
         ansi_enabled = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
-        footer_color = os.getenv('ANSI_FOOTER_COLOR', 'cyan')
-        print_footer_hotkeys([("F12","Voltar")], ansi_enabled, footer_color)
-        input("Pressione Enter para continuar...")
+        header_color = os.getenv('ANSI_HEADER_COLOR', 'yellow')
+        
+        def linhas(itens, largura):
+            return [[chave[:largura], str(r['execucoes']), f"{r['p50_ms']:.2f}", f"{r['p95_ms']:.2f}",
+                     f"{r['p99_ms']:.2f}", f"{r['max_ms']:.2f}"] for _, chave, r in itens]
+        colunas = [("N", 7), ("P50 MS", 9), ("P95 MS", 9), ("P99 MS", 9), ("MÁX MS", 9)]
+        
+        buscas = self.db.metricas.resumo('busca')
+        print_title("BUSCAS (ENTIDADE/MODO/ORIGEM)", ansi_enabled, header_color)
+        if buscas:
+            print_table([("BUSCA", 30)] + colunas, linhas(buscas, 30), ansi_enabled, header_color, zebra=True)
+            cache = self.db.servico_busca.cache.estatisticas()
+            print(f"\nCache de busca: {cache['acertos']} acertos, {cache['refinamentos']} refinamentos, "
+                  f"{cache['faltas']} faltas ({cache['entradas']}/{cache['capacidade']} termos)")
+        else:
+            print("Nenhuma busca registrada.")
+        
+        instrucoes = self.db.metricas.resumo('sql')
+        print()
+        print_title(f"INSTRUÇÕES SQL MAIS LENTAS (P95, {min(limite_sql, len(instrucoes))} de {len(instrucoes)})",
+                    ansi_enabled, header_color)
+        print_table([("INSTRUÇÃO", 60)] + colunas, linhas(instrucoes[:limite_sql], 60),
+                    ansi_enabled, header_color, zebra=True)
+        print(f"\nInstruções acima de {self.db.limite_consulta_lenta_ms} ms são gravadas com o plano "
+              f"em logs/consultas_lentas_*.log")
+        
+        catalogo = self.db.catalogo.estatisticas()
+        print()
+        print_title("CATÁLOGO DE PRODUTOS EM MEMÓRIA", ansi_enabled, header_color)
+        print(f"{catalogo['produtos']} produtos na versão {catalogo['versao']}: {catalogo['acertos']} leituras "
+              f"sem alteração, {catalogo['recargas']} recargas parciais ({catalogo['linhas_recarregadas']} "
+              f"linhas relidas), {catalogo['cargas_completas']} cargas completas, "
+              f"{catalogo['exclusoes_podadas']} exclusões podadas")
+        input("\nPressione Enter para continuar...")
     
     def menu_importar_exportar(self):
         """Menu de importação/exportação"""
@@ -295,6 +355,7 @@ class MenuPrincipal:
         print(f"2. ANSI Header Color: {header_color}")
         print(f"3. ANSI Footer Color: {footer_color}")
         print(f"4. Auto Login (sim/nao): {auto_login}")
+        print("5. Manutenção do banco (checkpoint/optimize)")
         print("0. Voltar")
         print()
         print_footer_hotkeys([("F12","Voltar")])
@@ -312,10 +373,25 @@ class MenuPrincipal:
         elif opcao == '4':
             val = input("sim/nao: ").strip().lower() or auto_login
             set_key(env_path, 'AUTO_LOGIN', 'sim' if val == 'sim' else 'nao')
+        elif opcao == '5':
+            self.manutencao_banco()
+            return
         else:
             return
         input("\nConfiguração salva. Pressione Enter para continuar...")
     
+    def manutencao_banco(self):
+        """Executar checkpoint do WAL e PRAGMA optimize"""
+        try:
+            ocupado, paginas_log, paginas_copiadas = self.db.checkpoint()
+            self.db.otimizar()
+            print(f"\nCheckpoint concluído: {paginas_copiadas}/{paginas_log} páginas transferidas"
+                  f"{' (banco ocupado, checkpoint parcial)' if ocupado else ''}")
+            print("Estatísticas do planejador atualizadas.")
+        except Exception as e:
+            print(f"Erro na manutenção do banco: {e}")
+        input("\nPressione Enter para continuar...")
+    
     def menu_usuarios(self):
         """Menu de usuários"""
         if self.usuario_logado['nivel_permissao'] != 'admin':
@@ -1,5 +1,9 @@
 import sqlite3
 from utils.busca_interativa import BuscaInterativa
+from model.dinheiro import Dinheiro
+from model.cliente import somente_digitos
+from model.venda import Venda
+from utils.paginador import PaginadorKeyset, exibir_paginado
 from utils.tui import clear_screen, print_header, print_footer_hotkeys, prompt_text, print_title, print_table
 
 class ClienteController:
@@ -9,34 +13,20 @@ class ClienteController:
         self.usuario_logado = usuario_logado
     
     def listar_clientes(self):
-        """Listar todos os clientes"""
+        """Listar todos os clientes, uma página por vez"""
         try:
-            clear_screen()
-            print_header(self.usuario_logado['nome'] if self.usuario_logado else None)
-            clientes = self.db.executar_consulta(
-                "SELECT * FROM clientes WHERE ativo = 1 ORDER BY nome"
+            paginador = PaginadorKeyset(
+                self.db,
+                "SELECT id, nome, telefone, email, limite_credito FROM clientes WHERE ativo = 1",
+                contagem="SELECT COUNT(*) FROM clientes WHERE ativo = 1"
             )
             
-            import os
-            ansi_enabled = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
-            header_color = os.getenv('ANSI_HEADER_COLOR', 'yellow')
-            print_title("LISTA DE CLIENTES", ansi_enabled, header_color)
             headers = [("ID", 4), ("NOME", 25), ("TELEFONE", 15), ("EMAIL", 25), ("LIMITE", 10)]
-            rows = []
-            for cliente in clientes:
-                rows.append([
-                    str(cliente['id']),
-                    str(cliente['nome']),
-                    str(cliente['telefone'] or 'N/A'),
-                    str(cliente['email'] or 'N/A'),
-                    f"R$ {cliente['limite_credito']:.2f}"
-                ])
-            print_table(headers, rows, ansi_enabled, header_color, zebra=True)
-            import os
-            enabled_colors = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
-            footer_color = os.getenv('ANSI_FOOTER_COLOR', 'cyan')
-            print_footer_hotkeys([("F12","Voltar")], enabled_colors, footer_color)
-            input("\nPressione Enter para continuar...")
+            exibir_paginado(
+                paginador, "LISTA DE CLIENTES", headers,
+                lambda c: [str(c[0]), str(c[1]), str(c[2] or 'N/A'), str(c[3] or 'N/A'), f"R$ {c[4]:.2f}"],
+                self.usuario_logado['nome'] if self.usuario_logado else None
+            )
             
         except sqlite3.Error as e:
             print(f"Erro ao listar clientes: {e}")
@@ -52,12 +42,22 @@ class ClienteController:
             email = input("Email: ") or None
             endereco = input("Endereço: ") or None
             cpf_cnpj = input("CPF/CNPJ: ") or None
-            limite_credito = float(input("Limite de crédito: R$ ") or 0)
+            existente = self.buscar_por_documento(cpf_cnpj)
+            if existente:
+                print(f"Já existe cliente com este CPF/CNPJ: {existente['nome']} (ID {existente['id']})")
+                if input("Cadastrar mesmo assim? (s/n): ").lower() != 's':
+                    print("Operação cancelada.")
+                    input("Pressione Enter para continuar...")
+                    return
+            limite_credito = Dinheiro.de_reais(input("Limite de crédito: R$ ") or 0)
             
             cliente_id = self.db.executar_consulta('''
-                INSERT INTO clientes (nome, telefone, email, endereco, cpf_cnpj, limite_credito)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (nome, telefone, email, endereco, cpf_cnpj, limite_credito))
+                INSERT INTO clientes (nome, telefone, email, endereco, cpf_cnpj, limite_credito,
+                                      cpf_cnpj_digitos, telefone_digitos)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (nome, telefone, email, endereco, cpf_cnpj, limite_credito,
+                  somente_digitos(cpf_cnpj), somente_digitos(telefone)))
+            self.db.notificar_alteracao('clientes', [cliente_id])
             
             print(f"\nCliente cadastrado com sucesso! ID: {cliente_id}")
             
@@ -88,9 +88,12 @@ class ClienteController:
             
             self.db.executar_consulta('''
                 UPDATE clientes 
-                SET nome = ?, telefone = ?, email = ?, endereco = ?, limite_credito = ?
+                SET nome = ?, telefone = ?, email = ?, endereco = ?, limite_credito = ?,
+                    telefone_digitos = ?
                 WHERE id = ?
-            ''', (nome, telefone, email, endereco, float(limite_credito), cliente_id))
+            ''', (nome, telefone, email, endereco, Dinheiro.de_reais(limite_credito),
+                  somente_digitos(telefone), cliente_id))
+            self.db.notificar_alteracao('clientes', [cliente_id])
             
             print("Cliente atualizado com sucesso!")
             
@@ -113,12 +116,12 @@ class ClienteController:
             print(f"\nCliente selecionado: {cliente['nome']}")
             
             # Verificar se cliente tem vendas em aberto
-            vendas_aberto = self.db.executar_consulta('''
+            vendas_aberto = self.db.buscar_um('''
                 SELECT COUNT(*) as qtd FROM vendas 
                 WHERE cliente_id = ? AND forma_pagamento = 'fiado' AND status = 'concluida'
             ''', (cliente_id,))
             
-            if vendas_aberto[0]['qtd'] > 0:
+            if vendas_aberto['qtd'] > 0:
                 print("Não é possível excluir cliente com vendas em aberto!")
                 return
             
@@ -128,6 +131,7 @@ class ClienteController:
                     "UPDATE clientes SET ativo = 0 WHERE id = ?", 
                     (cliente_id,)
                 )
+                self.db.notificar_alteracao('clientes', [cliente_id])
                 print("Cliente excluído com sucesso!")
             else:
                 print("Operação cancelada.")
@@ -148,11 +152,7 @@ class ClienteController:
             cliente_id = cliente['id']
             
             # Calcular total em aberto
-            total_aberto = self.db.executar_consulta('''
-                SELECT COALESCE(SUM(valor_total), 0) as total
-                FROM vendas 
-                WHERE cliente_id = ? AND forma_pagamento = 'fiado' AND status = 'concluida'
-            ''', (cliente_id,))[0]['total']
+            total_aberto = self.total_em_aberto(cliente_id)
             
             limite_disponivel = cliente['limite_credito'] - total_aberto
             
@@ -166,20 +166,38 @@ class ClienteController:
             # Listar vendas em aberto
             if total_aberto > 0:
                 print("\nVENDAS EM ABERTO:")
-                vendas_aberto = self.db.executar_consulta('''
+                vendas_aberto = self.db.buscar_todos('''
                     SELECT id, data_venda, valor_total 
                     FROM vendas 
                     WHERE cliente_id = ? AND forma_pagamento = 'fiado' AND status = 'concluida'
                     ORDER BY data_venda
-                ''', (cliente_id,))
+                ''', (cliente_id,), modelo=Venda)
                 
                 for venda in vendas_aberto:
-                    print(f"  Venda {venda['id']} - {venda['data_venda']} - R$ {venda['valor_total']:.2f}")
+                    print(f"  Venda {venda.id} - {venda.data_venda:%d/%m/%Y %H:%M} - R$ {venda.valor_total:.2f}")
             
         except sqlite3.Error as e:
             print(f"Erro ao consultar limite: {e}")
         input("\nPressione Enter para continuar...")
     
+    def total_em_aberto(self, cliente_id):
+        """Soma das vendas fiado ainda não quitadas do cliente"""
+        return self.db.buscar_um('''
+            SELECT COALESCE(SUM(valor_total), 0) as "total [CENTAVOS]"
+            FROM vendas 
+            WHERE cliente_id = ? AND forma_pagamento = 'fiado' AND status = 'concluida'
+        ''', (cliente_id,))['total']
+    
+    def buscar_por_documento(self, cpf_cnpj):
+        """Cliente ativo com o CPF/CNPJ informado (com ou sem pontuação), ou None.
+        Busca exata pelo índice de cpf_cnpj_digitos."""
+        digitos = somente_digitos(cpf_cnpj)
+        if not digitos:
+            return None
+        return self.db.buscar_um(
+            "SELECT * FROM clientes WHERE cpf_cnpj_digitos = ? AND ativo = 1", (digitos,)
+        )
+    
     def selecionar_cliente_interativo(self):
         """Selecionar cliente de forma interativa para venda"""
         try:
@@ -1,6 +1,177 @@
 import os
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from model.cliente import somente_digitos
+from utils.colunar import gravar_parquet, iterar_parquet, ler_parquet
+from utils.exportador import caminho_exportacao, gravar_linhas
+
+# Colunas gravadas pela importação, na ordem das tuplas de preparar_importacao
+COLUNAS_IMPORTACAO = ('nome', 'descricao', 'categoria_id', 'preco_custo', 'preco_venda',
+                      'estoque', 'estoque_minimo', 'codigo_barras', 'ncm', 'cest', 'unidade')
+
+INSERIR = (f"INSERT INTO produtos ({', '.join(COLUNAS_IMPORTACAO)}) "
+           f"VALUES ({', '.join('?' * len(COLUNAS_IMPORTACAO))})")
+
+# Colunas que o modo atualizar pode alterar: o código de barras é a chave e o estoque
+# não é sobrescrito pela planilha (é movimentado pelas vendas). Só as que estão na
+# planilha são alteradas (ver colunas_atualizadas)
+ATUALIZADAS = tuple(coluna for coluna in COLUNAS_IMPORTACAO if coluna not in ('codigo_barras', 'estoque'))
+
+# Gatilhos de produtos suspensos durante a importação em massa e as instruções que
+# fazem o mesmo trabalho para todas as linhas novas (id > ?) de uma só vez
+GATILHOS_CARGA = {
+    'produtos_fts_ai': (
+        "INSERT INTO produtos_fts (rowid, nome, descricao, codigo_barras) "
+        "SELECT id, nome, descricao, codigo_barras FROM produtos WHERE id > ?",
+    ),
+    'produtos_versao_ai': (
+        "UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'produtos'",
+        "UPDATE produtos SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'produtos') "
+        "WHERE id > ?",
+    ),
+}
+
+COLUNAS_EXPORTACAO_PRODUTOS = ('id', 'nome', 'descricao', 'categoria', 'preco_custo', 'preco_venda',
+                               'estoque', 'estoque_minimo', 'codigo_barras', 'ncm', 'cest', 'unidade')
+
+# Exportação colunar (Parquet): consulta e colunas com o tipo do Arrow. Valores em
+# centavos (int64), como no banco. Vendas e itens são particionados pelo mês da venda:
+# a consulta começa pelo mês e vem ordenada por ele.
+TABELAS_COLUNARES = {
+    'vendas': (
+        """SELECT substr(data_venda, 1, 7), id, cliente_id, usuario_id, valor_total,
+                  forma_pagamento, status, data_venda
+           FROM vendas ORDER BY data_venda, id""",
+        (('id', 'int64'), ('cliente_id', 'int64'), ('usuario_id', 'int64'), ('valor_total', 'int64'),
+         ('forma_pagamento', 'string'), ('status', 'string'), ('data_venda', 'timestamp[us]')),
+        'mes',
+    ),
+    'venda_itens': (
+        """SELECT substr(v.data_venda, 1, 7), i.id, i.venda_id, i.produto_id, i.quantidade,
+                  i.preco_unitario, i.subtotal
+           FROM vendas v JOIN venda_itens i ON i.venda_id = v.id
+           ORDER BY v.data_venda, v.id""",
+        (('id', 'int64'), ('venda_id', 'int64'), ('produto_id', 'int64'), ('quantidade', 'int64'),
+         ('preco_unitario', 'int64'), ('subtotal', 'int64')),
+        'mes',
+    ),
+    'produtos': (
+        """SELECT id, codigo_barras, nome, descricao, categoria_id, preco_custo, preco_venda, estoque,
+                  estoque_minimo, ncm, cest, cfop, unidade, ativo, data_criacao, data_atualizacao
+           FROM produtos ORDER BY id""",
+        (('id', 'int64'), ('codigo_barras', 'string'), ('nome', 'string'), ('descricao', 'string'),
+         ('categoria_id', 'int64'), ('preco_custo', 'int64'), ('preco_venda', 'int64'), ('estoque', 'int64'),
+         ('estoque_minimo', 'int64'), ('ncm', 'string'), ('cest', 'string'), ('cfop', 'string'),
+         ('unidade', 'string'), ('ativo', 'int8'), ('data_criacao', 'timestamp[us]'),
+         ('data_atualizacao', 'timestamp[us]')),
+        None,
+    ),
+    'clientes': (
+        """SELECT id, nome, telefone, email, endereco, cpf_cnpj, limite_credito, ativo, data_cadastro
+           FROM clientes ORDER BY id""",
+        (('id', 'int64'), ('nome', 'string'), ('telefone', 'string'), ('email', 'string'),
+         ('endereco', 'string'), ('cpf_cnpj', 'string'), ('limite_credito', 'int64'), ('ativo', 'int8'),
+         ('data_cadastro', 'timestamp[us]')),
+        None,
+    ),
+}
+
+# Importação colunar: tabelas referenciadas antes das que as referenciam
+ORDEM_IMPORTACAO_COLUNAR = ('clientes', 'produtos', 'vendas', 'venda_itens')
+
+# Exportação incremental: vendas (e itens dessas vendas) com versao_linha entre a marca
+# da última exportação e a versão atual. Venda alterada sai de novo num arquivo mais novo.
+VENDAS_INCREMENTAIS = '''
+    SELECT v.id, v.data_venda, v.cliente_id,
+           COALESCE(c.nome, 'Não informado') as cliente,
+           u.nome as vendedor, v.valor_total / 100.0 as valor_total,
+           v.forma_pagamento, v.status
+    FROM vendas v
+    LEFT JOIN clientes c ON v.cliente_id = c.id
+    LEFT JOIN usuarios u ON v.usuario_id = u.id
+    WHERE v.versao_linha > ? AND v.versao_linha <= ?
+    ORDER BY v.id
+'''
+
+ITENS_INCREMENTAIS = '''
+    SELECT i.venda_id, i.id, i.produto_id, p.nome as produto, i.quantidade,
+           i.preco_unitario / 100.0 as preco_unitario, i.subtotal / 100.0 as subtotal
+    FROM vendas v
+    JOIN venda_itens i ON i.venda_id = v.id
+    LEFT JOIN produtos p ON i.produto_id = p.id
+    WHERE v.versao_linha > ? AND v.versao_linha <= ?
+    ORDER BY i.venda_id, i.id
+'''
+
+
+def colunas_atualizadas(df):
+    """Colunas de ATUALIZADAS presentes na planilha; a coluna 'categoria' (nome) vale por categoria_id.
+    As demais ficam como estão nos produtos existentes."""
+    presentes = set(df.columns) | ({'categoria_id'} if 'categoria' in df.columns else set())
+    return tuple(coluna for coluna in ATUALIZADAS if coluna in presentes)
+
+
+def _alterado(colunas, existente='p', importado='i'):
+    """Condição SQL: o produto existente difere do importado em alguma das colunas,
+    ou está inativo (a importação o reativa)"""
+    return " OR ".join([f"{existente}.{coluna} IS NOT {importado}.{coluna}" for coluna in colunas]
+                       + [f"{existente}.ativo = 0"])
+
+
+def _inserir_ou_atualizar(colunas):
+    """Inclui os códigos novos e altera só as colunas informadas dos produtos que mudaram
+    (o WHERE true evita a ambiguidade do ON CONFLICT depois de um SELECT)"""
+    return f'''
+        INSERT INTO produtos ({", ".join(COLUNAS_IMPORTACAO)})
+        SELECT {", ".join(COLUNAS_IMPORTACAO)} FROM temp.importacao_produtos WHERE true
+        ON CONFLICT (codigo_barras) DO UPDATE SET
+            {"".join(f"{coluna} = excluded.{coluna}, " for coluna in colunas)}ativo = 1,
+            data_atualizacao = CURRENT_TIMESTAMP
+        WHERE {_alterado(colunas, 'produtos', 'excluded')}
+    '''
+
+
+def _mostrar_progresso(gravadas):
+    print(f"\r{gravadas} linhas gravadas", end="", flush=True)
+
+
+def _texto(serie):
+    """Coluna como texto sem espaços nas pontas; vazio vira nulo. Números inteiros
+    lidos como float (ex.: código de barras em coluna com células vazias) perdem o ".0"."""
+    if pd.api.types.is_float_dtype(serie) and (serie.dropna() % 1 == 0).all():
+        serie = serie.astype('Int64')
+    texto = serie.astype('string').str.strip()
+    return texto.mask(texto == '')
+
+
+def _numero(serie):
+    """Coluna numérica; textos aceitam "R$" e vírgula decimal ("1.234,56"). Inválidos viram nulo."""
+    if not pd.api.types.is_numeric_dtype(serie):
+        texto = serie.astype('string').str.replace('R$', '', regex=False).str.strip()
+        com_virgula = texto.str.contains(',', regex=False, na=False)
+        texto = texto.mask(com_virgula, texto.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+        serie = pd.to_numeric(texto, errors='coerce')
+    return serie.astype('float64')
+
+
+def _centavos(serie):
+    """Reais para centavos inteiros, arredondando meio centavo para longe do zero
+    como Dinheiro.de_reais (a folga absorve o erro de representação do float)"""
+    reais = _numero(serie)
+    return (np.sign(reais) * np.floor(reais.abs() * 100 + 0.5 + 1e-7)).astype('Int64')
+
+
+def _inteiro(serie):
+    """Coluna de inteiros; valores com casas decimais ou inválidos viram nulo"""
+    numeros = _numero(serie)
+    return numeros.where(numeros % 1 == 0).astype('Int64')
+
+
+def _valores(serie):
+    """Lista de valores Python (int/str) com None no lugar dos nulos, pronta para o sqlite3"""
+    return serie.astype(object).where(serie.notna(), None).tolist()
+
 
 class ImportExportController:
     def __init__(self, database):
@@ -14,6 +185,8 @@ class ImportExportController:
             print("2. Importar produtos via Excel")
             print("3. Exportar produtos para Excel")
             print("4. Exportar relatório de vendas")
+            print("5. Exportar base para análise (Parquet)")
+            print("6. Importar base exportada (Parquet)")
             print("0. Voltar")
             
             opcao = input("\nEscolha uma opção: ")
@@ -26,6 +199,10 @@ class ImportExportController:
                 self.exportar_produtos_excel()
             elif opcao == "4":
                 self.exportar_relatorio_vendas()
+            elif opcao == "5":
+                self.exportar_base_colunar()
+            elif opcao == "6":
+                self.importar_base_colunar()
             elif opcao == "0":
                 break
             else:
@@ -62,6 +239,7 @@ class ImportExportController:
             print("\nINSTRUÇÕES:")
             print("- Preencha os dados na planilha mantendo o formato")
             print("- A coluna 'categoria_id' deve conter IDs válidos das categorias")
+            print("  (ou use a coluna 'categoria' com o nome; em branco = Diversos)")
             print("- Salve o arquivo e use a opção 'Importar produtos via Excel'")
             
         except Exception as e:
@@ -80,142 +258,418 @@ class ImportExportController:
             # Ler arquivo Excel
             df = pd.read_excel(caminho)
             
-            # Validar colunas obrigatórias
-            colunas_obrigatorias = ['nome', 'preco_custo', 'preco_venda', 'estoque']
+            print(f"\nEncontrados {len(df)} produtos para importar")
+            print("1. Incluir como produtos novos")
+            print("2. Atualizar pelo código de barras (inclui os que não existirem)")
+            atualizar = input("Modo [1]: ").strip() == "2"
+            
+            # Validar colunas obrigatórias (no modo atualizar o estoque não é gravado
+            # nos produtos existentes, e o código de barras é a chave)
+            if atualizar:
+                colunas_obrigatorias = ['codigo_barras', 'nome', 'preco_custo', 'preco_venda']
+            else:
+                colunas_obrigatorias = ['nome', 'preco_custo', 'preco_venda', 'estoque']
             for coluna in colunas_obrigatorias:
                 if coluna not in df.columns:
                     print(f"Coluna obrigatória '{coluna}' não encontrada!")
                     return
             
-            print(f"\nEncontrados {len(df)} produtos para importar")
-            print("Iniciando importação...")
-            
-            sucesso = 0
-            erros = 0
-            
-            for index, row in df.iterrows():
-                try:
-                    # Preparar dados
-                    dados = {
-                        'nome': str(row['nome']),
-                        'descricao': str(row.get('descricao', '')),
-                        'categoria_id': int(row.get('categoria_id', 7)),  # Default: Diversos
-                        'preco_custo': float(row['preco_custo']),
-                        'preco_venda': float(row['preco_venda']),
-                        'estoque': int(row['estoque']),
-                        'estoque_minimo': int(row.get('estoque_minimo', 0)),
-                        'codigo_barras': str(row.get('codigo_barras', '')) or None,
-                        'ncm': str(row.get('ncm', '')) or None,
-                        'cest': str(row.get('cest', '')) or None,
-                        'unidade': str(row.get('unidade', 'UN'))
-                    }
-                    
-                    # Inserir no banco
-                    self.db.executar_consulta('''
-                        INSERT INTO produtos (
-                            nome, descricao, categoria_id, preco_custo, preco_venda,
-                            estoque, estoque_minimo, codigo_barras, ncm, cest, unidade
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', tuple(dados.values()))
-                    
-                    sucesso += 1
-                    
-                except Exception as e:
-                    print(f"Erro na linha {index + 2}: {e}")
-                    erros += 1
+            # Validar e converter todas as colunas de uma vez
+            registros, erros = self.preparar_importacao(df, atualizar)
+            if erros:
+                self.relatar_erros_importacao(erros)
+            colunas = colunas_atualizadas(df)
+            
+            if atualizar and registros:
+                # Simulação antes de gravar
+                previa = self.comparar_importacao(registros, colunas=colunas)
+                print(f"\nColunas atualizadas: {', '.join(colunas)}")
+                print(f"Novos: {previa['novos']} | Alterados: {previa['alterados']} | "
+                      f"Sem alteração: {previa['iguais']}")
+                if previa['inativos']:
+                    print(f"{previa['inativos']} produto(s) inativo(s) na planilha serão reativados")
+                for nome, atual, novo in previa['exemplos']:
+                    print(f"  {nome[:40]:<40} R$ {atual:.2f} -> R$ {novo:.2f}")
+                if input("Confirmar a gravação? (s/n): ").strip().lower() != 's':
+                    print("Importação cancelada.")
+                    return
+            
+            print(f"Gravando {len(registros)} produtos...")
+            resumo = self.gravar_produtos(
+                registros, lambda feitos: print(f"\r{feitos}/{len(registros)} processados", end="", flush=True),
+                atualizar, colunas)
+            
+            if resumo['novos'] or resumo['alterados']:
+                # Carga em massa: os caches em memória recarregam por completo
+                self.db.notificar_alteracao('produtos')
             
             print(f"\nImportação concluída!")
-            print(f"Sucesso: {sucesso} | Erros: {erros}")
+            print(f"Novos: {resumo['novos']} | Alterados: {resumo['alterados']} | "
+                  f"Sem alteração: {resumo['iguais']} | Erros: {len({linha for linha, _ in erros})}")
             
         except Exception as e:
             print(f"Erro na importação: {e}")
         input("\nPressione Enter para continuar...")
     
-    def exportar_produtos_excel(self):
-        """Exportar produtos para Excel"""
-        try:
-            # Buscar produtos
-            produtos = self.db.executar_consulta('''
-                SELECT p.*, c.nome as categoria_nome
-                FROM produtos p 
-                LEFT JOIN categorias c ON p.categoria_id = c.id 
-                WHERE p.ativo = 1
-                ORDER BY p.nome
-            ''')
-            
-            # Converter para DataFrame
-            dados = []
-            for produto in produtos:
-                dados.append({
-                    'id': produto['id'],
-                    'nome': produto['nome'],
-                    'descricao': produto['descricao'],
-                    'categoria': produto['categoria_nome'],
-                    'preco_custo': produto['preco_custo'],
-                    'preco_venda': produto['preco_venda'],
-                    'estoque': produto['estoque'],
-                    'estoque_minimo': produto['estoque_minimo'],
-                    'codigo_barras': produto['codigo_barras'],
-                    'ncm': produto['ncm'],
-                    'cest': produto['cest'],
-                    'unidade': produto['unidade']
-                })
-            
-            df = pd.DataFrame(dados)
+    def preparar_importacao(self, df, atualizar=False):
+        """Validar e converter a planilha inteira com operações de coluna.
+        Retorna (registros, erros): tuplas na ordem de COLUNAS_IMPORTACAO para as
+        linhas válidas e (linha da planilha, motivo) para cada problema encontrado.
+        Com atualizar=True, código de barras já cadastrado não é erro (o produto será atualizado),
+        mas é obrigatório."""
+        df = df.reset_index(drop=True)
+        linhas_planilha = df.index + 2  # cabeçalho na linha 1
+        problemas = []
+        
+        def coluna(nome, padrao=None):
+            return df[nome] if nome in df.columns else pd.Series(padrao, index=df.index, dtype=object)
+        
+        nome = _texto(coluna('nome'))
+        problemas.append((nome.isna(), "nome em branco"))
+        
+        preco_custo = _centavos(coluna('preco_custo'))
+        preco_venda = _centavos(coluna('preco_venda'))
+        problemas.append((preco_custo.isna() | (preco_custo < 0), "preço de custo inválido"))
+        problemas.append((preco_venda.isna() | (preco_venda < 0), "preço de venda inválido"))
+        
+        # No modo atualizar o estoque só vale para os produtos novos (em branco, zero)
+        estoque = _inteiro(coluna('estoque').fillna(0) if atualizar else coluna('estoque'))
+        estoque_minimo = _inteiro(coluna('estoque_minimo').fillna(0))
+        problemas.append((estoque.isna(), "estoque inválido"))
+        problemas.append((estoque_minimo.isna(), "estoque mínimo inválido"))
+        
+        # Categorias: nomes da coluna 'categoria' viram ids (nome desconhecido fica nulo e
+        # é recusado); só sem id e sem nome o produto vai para Diversos
+        categorias = self.db.categorias
+        categoria_id = coluna('categoria_id')
+        em_branco = _texto(categoria_id).isna()
+        if 'categoria' in df.columns:
+            nome_categoria = _texto(df['categoria'])
+            categoria_id = categoria_id.where(~em_branco, nome_categoria.map(
+                lambda nome: categorias.id_por_nome(nome) if pd.notna(nome) else None).astype(object))
+            em_branco &= nome_categoria.isna()
+        categoria_id = _inteiro(categoria_id.where(~em_branco, categorias.id_por_nome('Diversos')))
+        problemas.append((~categoria_id.isin(categorias.ids_ativos()), "categoria inexistente"))
+        
+        # Código de barras é único: repetido na planilha ou já cadastrado. No modo atualizar
+        # é a chave: sem ele a linha nunca encontraria o produto e seria incluída de novo
+        codigo_barras = _texto(coluna('codigo_barras'))
+        problemas.append((codigo_barras.notna() & codigo_barras.duplicated(), "código de barras repetido na planilha"))
+        if atualizar:
+            problemas.append((codigo_barras.isna(), "código de barras obrigatório no modo atualizar"))
+        else:
+            existentes = {linha[0] for linha in self.db.iterar_linhas(
+                "SELECT codigo_barras FROM produtos WHERE codigo_barras IS NOT NULL", tuplas=True,
+                somente_leitura=True)}
+            problemas.append((codigo_barras.isin(existentes), "código de barras já cadastrado"))
+        
+        erros = []
+        invalidas = pd.Series(False, index=df.index)
+        for mascara, motivo in problemas:
+            mascara = mascara.fillna(True).astype(bool).to_numpy()
+            invalidas |= mascara
+            erros.extend((int(linha), motivo) for linha in linhas_planilha[mascara])
+        erros.sort()
+        
+        validas = ~invalidas
+        colunas = [nome, _texto(coluna('descricao')), categoria_id, preco_custo, preco_venda,
+                   estoque, estoque_minimo, codigo_barras, _texto(coluna('ncm')), _texto(coluna('cest')),
+                   _texto(coluna('unidade')).fillna('UN')]
+        registros = list(zip(*(_valores(serie[validas]) for serie in colunas)))
+        return registros, erros
+    
+    def relatar_erros_importacao(self, erros, diretorio='export', limite=20):
+        """Mostrar os primeiros erros e gravar a lista completa em CSV"""
+        for linha, motivo in erros[:limite]:
+            print(f"Linha {linha}: {motivo}")
+        if len(erros) > limite:
+            print(f"... e mais {len(erros) - limite} erro(s)")
+        os.makedirs(diretorio, exist_ok=True)
+        caminho = os.path.join(diretorio, f"erros_importacao_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        pd.DataFrame(erros, columns=['linha', 'motivo']).to_csv(caminho, index=False)
+        print(f"Relatório de erros: {caminho}")
+        return caminho
+    
+    def gravar_produtos(self, registros, progresso=None, atualizar=False, colunas=ATUALIZADAS):
+        """Gravar os registros numa única transação e retornar o resumo
+        {'novos', 'alterados', 'iguais', 'inativos'}.
+        Sem atualizar, insere em lotes de executemany. Com atualizar=True, os registros
+        passam por uma tabela temporária e um único INSERT ... ON CONFLICT(codigo_barras)
+        inclui os novos e altera, nos produtos que mudaram, só as colunas informadas
+        (as da planilha); produtos inativos encontrados são reativados.
+        progresso(gravados) é chamado após cada lote."""
+        if not registros:
+            return {'novos': 0, 'alterados': 0, 'iguais': 0, 'inativos': 0}
+        with self.db.transacao() as t:
+            # Os gatilhos por linha custam mais que o próprio INSERT: durante a carga
+            # saem de cena e o efeito deles é aplicado de uma vez no fim (mesma transação)
+            suspensos = []
+            for nome, instrucoes in GATILHOS_CARGA.items():
+                gatilho = t.executar("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                                     (nome,)).fetchone()
+                if gatilho:
+                    t.executar(f"DROP TRIGGER {nome}")
+                    suspensos.append((gatilho[0], instrucoes))
+            ultimo_id = t.executar("SELECT COALESCE(MAX(id), 0) FROM produtos").fetchone()[0]
             
-            # Criar diretório se não existir
-            os.makedirs('export', exist_ok=True)
+            if atualizar:
+                self._carregar_temporaria(t, registros, progresso)
+                resumo = self._comparar_temporaria(t, colunas)
+                t.executar(_inserir_ou_atualizar(colunas))
+                t.executar("DROP TABLE temp.importacao_produtos")
+            else:
+                self._inserir_em_lotes(t, INSERIR, registros, progresso)
+                resumo = {'novos': len(registros), 'alterados': 0, 'iguais': 0, 'inativos': 0}
             
-            # Salvar arquivo
-            data_hora = datetime.now().strftime('%Y%m%d_%H%M%S')
-            caminho = f'export/produtos_exportados_{data_hora}.xlsx'
-            df.to_excel(caminho, index=False)
+            for criacao, instrucoes in suspensos:
+                for instrucao in instrucoes:
+                    t.executar(instrucao, (ultimo_id,) if '?' in instrucao else ())
+                t.executar(criacao)
+        return resumo
+    
+    def comparar_importacao(self, registros, exemplos=10, colunas=ATUALIZADAS):
+        """Simulação do modo atualizar: quantos registros seriam novos, alterados (nas colunas
+        informadas) ou iguais e quantos produtos inativos seriam reativados, mais alguns
+        exemplos de alteração (nome, preço atual, preço novo). Nada é gravado."""
+        if not registros:
+            return {'novos': 0, 'alterados': 0, 'iguais': 0, 'inativos': 0, 'exemplos': []}
+        with self.db.transacao() as t:
+            self._carregar_temporaria(t, registros)
+            resumo = self._comparar_temporaria(t, colunas)
+            resumo['exemplos'] = [tuple(linha) for linha in t.executar(f'''
+                SELECT i.nome, p.preco_venda AS "atual [CENTAVOS]", i.preco_venda AS "novo [CENTAVOS]"
+                FROM temp.importacao_produtos i JOIN produtos p ON p.codigo_barras = i.codigo_barras
+                WHERE {_alterado(colunas)}
+                LIMIT ?
+            ''', (exemplos,))]
+            t.executar("DROP TABLE temp.importacao_produtos")
+        return resumo
+    
+    def _inserir_em_lotes(self, t, query, registros, progresso=None):
+        lote = self.db.config.get('importacao.lote', 5000)
+        for inicio in range(0, len(registros), lote):
+            t.executar_varios(query, registros[inicio:inicio + lote])
+            if progresso:
+                progresso(min(inicio + lote, len(registros)))
+    
+    def _carregar_temporaria(self, t, registros, progresso=None):
+        """Copiar os registros para a tabela temporária importacao_produtos (só desta conexão)"""
+        t.executar("DROP TABLE IF EXISTS temp.importacao_produtos")
+        t.executar('''
+            CREATE TEMP TABLE importacao_produtos (
+                nome TEXT, descricao TEXT, categoria_id INTEGER, preco_custo INTEGER, preco_venda INTEGER,
+                estoque INTEGER, estoque_minimo INTEGER, codigo_barras TEXT, ncm TEXT, cest TEXT, unidade TEXT
+            )
+        ''')
+        self._inserir_em_lotes(t, INSERIR.replace("INTO produtos", "INTO temp.importacao_produtos"),
+                               registros, progresso)
+    
+    def _comparar_temporaria(self, t, colunas):
+        """Contar, numa passada, os registros da tabela temporária sem produto com o mesmo
+        código de barras (novos), com alguma das colunas diferente ou inativos (alterados),
+        idênticos (iguais) e, entre os alterados, os inativos"""
+        alterado = _alterado(colunas)
+        linha = t.executar(f'''
+            SELECT COALESCE(SUM(p.id IS NULL), 0),
+                   COALESCE(SUM(p.id IS NOT NULL AND ({alterado})), 0),
+                   COALESCE(SUM(p.id IS NOT NULL AND NOT ({alterado})), 0),
+                   COALESCE(SUM(p.ativo = 0), 0)
+            FROM temp.importacao_produtos i
+            LEFT JOIN produtos p ON p.codigo_barras = i.codigo_barras
+        ''').fetchone()
+        return {'novos': linha[0], 'alterados': linha[1], 'iguais': linha[2], 'inativos': linha[3]}
+    
+    def exportar_produtos_excel(self):
+        """Exportar produtos para Excel (ou CSV)"""
+        try:
+            formato = self.escolher_formato()
+            caminho, total = self.gerar_exportacao_produtos(formato=formato, progresso=_mostrar_progresso)
             
-            print(f"Produtos exportados com sucesso: {caminho}")
-            print(f"Total de produtos exportados: {len(produtos)}")
+            print(f"\nProdutos exportados com sucesso: {caminho}")
+            print(f"Total de produtos exportados: {total}")
             
         except Exception as e:
             print(f"Erro ao exportar produtos: {e}")
         input("\nPressione Enter para continuar...")
     
+    def escolher_formato(self):
+        """Perguntar o formato do arquivo exportado (padrão: Excel)"""
+        print("Formato: 1. Excel (.xlsx)  2. CSV  3. CSV compactado (.csv.gz)")
+        return {'2': 'csv', '3': 'csv.gz'}.get(input("Formato [1]: ").strip(), 'xlsx')
+    
+    def gerar_exportacao_produtos(self, diretorio='export', formato='xlsx', progresso=None):
+        """Gravar o arquivo de produtos ativos e retornar (caminho, quantidade)"""
+        # Linhas do catálogo em memória, com os preços convertidos para reais
+        produtos = self.db.catalogo.linhas(('id', 'nome', 'descricao', 'categoria_nome', 'preco_custo',
+                                            'preco_venda', 'estoque', 'estoque_minimo', 'codigo_barras',
+                                            'ncm', 'cest', 'unidade'))
+        linhas = (p[:4] + (p[4] / 100, p[5] / 100) + p[6:] for p in produtos)
+        
+        caminho = caminho_exportacao(diretorio, 'produtos_exportados', formato)
+        total = gravar_linhas(caminho, COLUNAS_EXPORTACAO_PRODUTOS, linhas, formato, progresso, aba='Produtos')
+        return caminho, total
+    
     def exportar_relatorio_vendas(self):
-        """Exportar relatório de vendas para Excel"""
+        """Exportar relatório de vendas para Excel (ou CSV)"""
         try:
-            # Buscar vendas
-            vendas = self.db.executar_consulta('''
-                SELECT v.*, c.nome as cliente_nome, u.nome as usuario_nome
-                FROM vendas v
-                LEFT JOIN clientes c ON v.cliente_id = c.id
-                LEFT JOIN usuarios u ON v.usuario_id = u.id
-                ORDER BY v.data_venda DESC
-            ''')
-            
-            # Converter para DataFrame
-            dados = []
-            for venda in vendas:
-                dados.append({
-                    'id': venda['id'],
-                    'data_venda': venda['data_venda'],
-                    'cliente': venda['cliente_nome'] or 'Não informado',
-                    'vendedor': venda['usuario_nome'],
-                    'valor_total': venda['valor_total'],
-                    'forma_pagamento': venda['forma_pagamento'],
-                    'status': venda['status']
-                })
-            
-            df = pd.DataFrame(dados)
+            print("1. Todas as vendas")
+            print("2. Só as vendas novas ou alteradas desde a última exportação incremental")
+            incremental = input("Exportar [1]: ").strip() == "2"
+            formato = self.escolher_formato()
             
-            # Criar diretório se não existir
-            os.makedirs('export', exist_ok=True)
+            if incremental:
+                caminho, vendas, itens = self.gerar_exportacao_incremental(formato=formato,
+                                                                           progresso=_mostrar_progresso)
+                if caminho is None:
+                    print("Nenhuma venda nova ou alterada desde a última exportação.")
+                else:
+                    print(f"\nVendas exportadas: {caminho}")
+                    print(f"Vendas: {vendas} | Itens: {itens}")
+            else:
+                caminho, total = self.gerar_relatorio_vendas(formato=formato, progresso=_mostrar_progresso)
+                
+                print(f"\nRelatório de vendas exportado: {caminho}")
+                print(f"Total de vendas no relatório: {total}")
             
-            # Salvar arquivo
-            data_hora = datetime.now().strftime('%Y%m%d_%H%M%S')
-            caminho = f'export/relatorio_vendas_{data_hora}.xlsx'
-            df.to_excel(caminho, index=False)
+        except Exception as e:
+            print(f"Erro ao exportar relatório: {e}")
+        input("\nPressione Enter para continuar...")
+    
+    def gerar_exportacao_incremental(self, diretorio=os.path.join('export', 'vendas_incrementais'),
+                                     formato='csv', progresso=None):
+        """Gravar só as vendas (e seus itens) incluídas ou alteradas desde a última exportação
+        incremental, num novo par de arquivos (vendas_v<de>-<até>_<data>, venda_itens_...)
+        que nunca substitui um anterior, e avançar a marca em exportacoes.
+        Retorna (caminho das vendas, vendas, itens), ou (None, 0, 0) se não houver alteração."""
+        marca = self.db.buscar_um("SELECT versao FROM exportacoes WHERE nome = 'vendas'")
+        desde = marca['versao'] if marca else 0
+        # Alterações gravadas depois desta leitura ficam com versão maior e saem na próxima
+        ate = self.db.buscar_um("SELECT versao FROM versoes_tabelas WHERE tabela = 'vendas'")['versao']
+        if ate <= desde:
+            return None, 0, 0
+        
+        # A faixa de versões no nome identifica o par e não se repete depois que a marca avança
+        faixa = f"v{desde + 1}-{ate}"
+        caminho = caminho_exportacao(diretorio, f"vendas_{faixa}", formato)
+        caminho_itens = caminho_exportacao(diretorio, f"venda_itens_{faixa}", formato)
+        with self.db.abrir_cursor(VENDAS_INCREMENTAIS, (desde, ate), tuplas=True, somente_leitura=True) as cursor:
+            vendas = gravar_linhas(caminho, [d[0] for d in cursor.description], cursor, formato, progresso,
+                                   aba='Vendas')
+        with self.db.abrir_cursor(ITENS_INCREMENTAIS, (desde, ate), tuplas=True, somente_leitura=True) as cursor:
+            itens = gravar_linhas(caminho_itens, [d[0] for d in cursor.description], cursor, formato,
+                                  aba='Itens')
+        
+        # A marca só avança depois que os dois arquivos foram gravados
+        ultima = self.db.buscar_um('''
+            SELECT MAX(id), MAX(data_venda) FROM vendas WHERE versao_linha > ? AND versao_linha <= ?
+        ''', (desde, ate))
+        self.db.executar_consulta('''
+            INSERT INTO exportacoes (nome, versao, ultimo_id, ultima_data, data_exportacao)
+            VALUES ('vendas', ?, ?, ?, ?)
+            ON CONFLICT (nome) DO UPDATE SET versao = excluded.versao, ultimo_id = excluded.ultimo_id,
+                ultima_data = excluded.ultima_data, data_exportacao = excluded.data_exportacao
+        ''', (ate, ultima[0], ultima[1], datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        return caminho, vendas, itens
+    
+    def gerar_relatorio_vendas(self, diretorio='export', formato='xlsx', progresso=None):
+        """Gravar o arquivo com todas as vendas e retornar (caminho, quantidade)"""
+        caminho = caminho_exportacao(diretorio, 'relatorio_vendas', formato)
+        # As linhas passam do cursor direto para o arquivo, em lotes
+        with self.db.abrir_cursor('''
+            SELECT v.id, v.data_venda,
+                   COALESCE(c.nome, 'Não informado') as cliente,
+                   u.nome as vendedor, v.valor_total / 100.0 as valor_total,
+                   v.forma_pagamento, v.status
+            FROM vendas v
+            LEFT JOIN clientes c ON v.cliente_id = c.id
+            LEFT JOIN usuarios u ON v.usuario_id = u.id
+            ORDER BY v.data_venda DESC
+        ''', tuplas=True, somente_leitura=True) as cursor:
+            colunas = [d[0] for d in cursor.description]
+            total = gravar_linhas(caminho, colunas, cursor, formato, progresso, aba='Vendas')
+        return caminho, total
+    
+    def exportar_base_colunar(self):
+        """Exportar vendas, itens, produtos e clientes em Parquet"""
+        try:
+            caminho, totais = self.gerar_exportacao_colunar()
             
-            print(f"Relatório de vendas exportado: {caminho}")
-            print(f"Total de vendas no relatório: {len(vendas)}")
+            print(f"Base exportada: {caminho}")
+            for tabela, total in totais.items():
+                print(f"  {tabela:<12} {total} linhas")
+            print("Para ler no pandas: ImportExportController.carregar_colunar(caminho, 'vendas', '2025-01', '2025-12')")
             
         except Exception as e:
-            print(f"Erro ao exportar relatório: {e}")
-        input("\nPressione Enter para continuar...")
\ No newline at end of file
+            print(f"Erro ao exportar base: {e}")
+        input("\nPressione Enter para continuar...")
+    
+    def gerar_exportacao_colunar(self, diretorio='export', tabelas=None):
+        """Gravar as tabelas em Parquet, uma pasta por tabela, e retornar (caminho, {tabela: linhas})"""
+        caminho = os.path.join(diretorio, f"analise_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        totais = {}
+        for tabela in tabelas or TABELAS_COLUNARES:
+            consulta, colunas, particao = TABELAS_COLUNARES[tabela]
+            linhas = self.db.iterar_linhas(consulta, tuplas=True, somente_leitura=True)
+            totais[tabela] = gravar_parquet(os.path.join(caminho, tabela), colunas, linhas, particao)
+        return caminho, totais
+    
+    def importar_base_colunar(self):
+        """Gravar no banco uma base exportada pela opção 5"""
+        caminho = input("Pasta da exportação (ex.: export/analise_20250101_120000): ").strip()
+        if not os.path.isdir(caminho):
+            print(f"Pasta não encontrada: {caminho}")
+            input("\nPressione Enter para continuar...")
+            return
+        try:
+            totais = self.importar_colunar(
+                caminho, progresso=lambda tabela, gravadas: print(f"\r  {tabela:<12} {gravadas} linhas", end=""))
+            print()
+            print("Base importada:")
+            for tabela, total in totais.items():
+                print(f"  {tabela:<12} {total} linhas")
+        except Exception as e:
+            print(f"\nErro ao importar base: {e}")
+        input("\nPressione Enter para continuar...")
+    
+    def importar_colunar(self, caminho, tabelas=None, inicio=None, fim=None, progresso=None):
+        """Gravar no banco as tabelas de uma exportação de gerar_exportacao_colunar.
+        Linhas com id já cadastrado são atualizadas e as demais incluídas, um lote por
+        transação; em vendas e venda_itens, inicio/fim ('AAAA-MM') limitam os meses lidos.
+        progresso(tabela, gravadas) é chamado a cada lote. Retorna {tabela: linhas gravadas}."""
+        totais = {}
+        lote = self.db.config.get('importacao.lote', 5000)
+        for tabela in ORDEM_IMPORTACAO_COLUNAR:
+            pasta = os.path.join(caminho, tabela)
+            if (tabelas is not None and tabela not in tabelas) or not os.path.isdir(pasta):
+                continue
+            colunas, lotes = iterar_parquet(pasta, inicio, fim, lote)
+            if tabela == 'clientes':
+                # As cópias só com dígitos (busca por CPF/CNPJ e telefone) não são exportadas
+                cpf, telefone = colunas.index('cpf_cnpj'), colunas.index('telefone')
+                colunas = colunas + ['cpf_cnpj_digitos', 'telefone_digitos']
+                lotes = ([linha + (somente_digitos(linha[cpf]), somente_digitos(linha[telefone])) for linha in bloco]
+                         for bloco in lotes)
+            query = f"""
+                INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})
+                ON CONFLICT (id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in colunas if c != 'id')}
+            """
+            totais[tabela] = 0
+            for bloco in lotes:
+                with self.db.transacao() as t:
+                    t.executar_varios(query, bloco)
+                totais[tabela] += len(bloco)
+                if progresso:
+                    progresso(tabela, totais[tabela])
+        for tabela in ('clientes', 'produtos'):
+            if totais.get(tabela):
+                self.db.notificar_alteracao(tabela)
+        return totais
+    
+    @staticmethod
+    def carregar_colunar(caminho, tabela, inicio=None, fim=None, colunas=None):
+        """DataFrame de uma tabela exportada por gerar_exportacao_colunar.
+        Em vendas e venda_itens, inicio/fim ('AAAA-MM') limitam os meses lidos."""
+        dados = ler_parquet(os.path.join(caminho, tabela), inicio, fim, colunas)
+        if dados is None:
+            return pd.DataFrame(columns=colunas or [nome for nome, _ in TABELAS_COLUNARES[tabela][1]])
+        return dados.to_pandas()
@@ -1,6 +1,8 @@
 import sqlite3
 from datetime import datetime
 from utils.busca_interativa import BuscaInterativa
+from model.dinheiro import Dinheiro
+from utils.paginador import PaginadorCatalogo, exibir_paginado
 from utils.tui import clear_screen, print_header, print_footer_hotkeys, prompt_text, read_key, print_title, print_table
 
 class ProdutoController:
@@ -10,38 +12,18 @@ class ProdutoController:
         self.usuario_logado = usuario_logado
     
     def listar_produtos(self):
-        """Listar todos os produtos"""
+        """Listar todos os produtos, uma página por vez"""
         try:
-            clear_screen()
-            print_header(self.usuario_logado['nome'] if self.usuario_logado else None)
-            produtos = self.db.executar_consulta('''
-                SELECT p.*, c.nome as categoria_nome 
-                FROM produtos p 
-                LEFT JOIN categorias c ON p.categoria_id = c.id 
-                WHERE p.ativo = 1
-                ORDER BY p.nome
-            ''')
+            paginador = PaginadorCatalogo(self.db.catalogo,
+                                          ('id', 'nome', 'categoria_nome', 'preco_venda', 'estoque', 'ncm'),
+                                          config=self.db.config)
             
-            import os
-            ansi_enabled = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
-            header_color = os.getenv('ANSI_HEADER_COLOR', 'yellow')
-            print_title("LISTA DE PRODUTOS", ansi_enabled, header_color)
             headers = [("ID", 4), ("NOME", 20), ("CATEGORIA", 15), ("PREÇO", 10), ("ESTOQUE", 8), ("NCM", 12)]
-            rows = []
-            for produto in produtos:
-                rows.append([
-                    str(produto['id']),
-                    str(produto['nome']),
-                    str(produto['categoria_nome']),
-                    f"R$ {produto['preco_venda']:.2f}",
-                    str(produto['estoque']),
-                    (produto['ncm'] or 'N/A')
-                ])
-            print_table(headers, rows, ansi_enabled, header_color, zebra=True)
-            enabled_colors = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
-            footer_color = os.getenv('ANSI_FOOTER_COLOR', 'cyan')
-            print_footer_hotkeys([("F12","Voltar")], enabled_colors, footer_color)
-            input("\nPressione Enter para continuar...")
+            exibir_paginado(
+                paginador, "LISTA DE PRODUTOS", headers,
+                lambda p: [str(p[0]), str(p[1]), str(p[2]), f"R$ {p[3]:.2f}", str(p[4]), (p[5] or 'N/A')],
+                self.usuario_logado['nome'] if self.usuario_logado else None
+            )
             
         except sqlite3.Error as e:
             print(f"Erro ao listar produtos: {e}")
@@ -66,8 +48,8 @@ class ProdutoController:
                 return
             categoria_id = categoria['id']
             
-            preco_custo = float(prompt_text("Preço de custo: R$ "))
-            preco_venda = float(prompt_text("Preço de venda: R$ "))
+            preco_custo = Dinheiro.de_reais(prompt_text("Preço de custo: R$ "))
+            preco_venda = Dinheiro.de_reais(prompt_text("Preço de venda: R$ "))
             estoque = int(prompt_text("Estoque inicial: "))
             estoque_minimo = int(prompt_text("Estoque mínimo: "))
             codigo_barras = prompt_text("Código de barras (opcional): ") or None
@@ -82,6 +64,7 @@ class ProdutoController:
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (nome, descricao, categoria_id, preco_custo, preco_venda, 
                   estoque, estoque_minimo, codigo_barras, ncm, cest, unidade))
+            self.db.notificar_alteracao('produtos', [produto_id])
             
             print(f"\nProduto cadastrado com sucesso! ID: {produto_id}")
             input("Pressione Enter para continuar...")
@@ -117,8 +100,9 @@ class ProdutoController:
                 SET nome = ?, descricao = ?, preco_custo = ?, preco_venda = ?, 
                     estoque = ?, ncm = ?, data_atualizacao = CURRENT_TIMESTAMP
                 WHERE id = ?
-            ''', (nome, descricao, float(preco_custo), float(preco_venda), 
+            ''', (nome, descricao, Dinheiro.de_reais(preco_custo), Dinheiro.de_reais(preco_venda), 
                   int(estoque), ncm, produto_id))
+            self.db.notificar_alteracao('produtos', [produto_id])
             
             print("Produto atualizado com sucesso!")
             
@@ -146,6 +130,7 @@ class ProdutoController:
                     "UPDATE produtos SET ativo = 0 WHERE id = ?", 
                     (produto_id,)
                 )
+                self.db.notificar_alteracao('produtos', [produto_id])
                 print("Produto excluído com sucesso!")
             else:
                 print("Operação cancelada.")
@@ -158,40 +143,33 @@ class ProdutoController:
         """Consultar situação do estoque"""
         try:
             # Produtos com estoque baixo
-            estoque_baixo = self.db.executar_consulta('''
-                SELECT p.*, c.nome as categoria_nome
-                FROM produtos p 
-                LEFT JOIN categorias c ON p.categoria_id = c.id
-                WHERE p.estoque <= p.estoque_minimo AND p.ativo = 1
-                ORDER BY p.estoque ASC
-            ''')
+            catalogo = self.db.catalogo
+            estoque_baixo = catalogo.linhas(('nome', 'estoque', 'estoque_minimo'),
+                                            onde=lambda p: p[1] <= p[2], ordem='estoque')
             
             print("\nPRODUTOS COM ESTOQUE BAIXO")
             print("-" * 80)
             
             if estoque_baixo:
                 for produto in estoque_baixo:
-                    print(f"{produto['nome']} - Estoque: {produto['estoque']} "
-                          f"(Mínimo: {produto['estoque_minimo']})")
+                    print(f"{produto[0]} - Estoque: {produto[1]} (Mínimo: {produto[2]})")
             else:
                 print("Nenhum produto com estoque baixo.")
             
             print("\n" + "=" * 80)
             
-            # Estoque por categoria
-            estoque_categoria = self.db.executar_consulta('''
-                SELECT c.nome, COUNT(p.id) as qtd_produtos, SUM(p.estoque) as total_estoque
-                FROM categorias c
-                LEFT JOIN produtos p ON c.id = p.categoria_id AND p.ativo = 1
-                WHERE c.ativo = 1
-                GROUP BY c.id, c.nome
-            ''')
+            # Estoque por categoria: categorias do registro, totais somados do catálogo
+            totais = {}
+            for categoria_id, estoque in catalogo.linhas(('categoria_id', 'estoque'), ordem=None):
+                qtd, soma = totais.get(categoria_id, (0, 0))
+                totais[categoria_id] = (qtd + 1, soma + estoque)
+            categorias = self.db.categorias.ativas()
             
             print("\nESTOQUE POR CATEGORIA")
             print("-" * 50)
-            for cat in estoque_categoria:
-                print(f"{cat['nome']:<15} {cat['qtd_produtos']:<3} produtos | "
-                      f"Estoque total: {cat['total_estoque'] or 0}")
+            for cat in categorias:
+                qtd_produtos, total_estoque = totais.get(cat['id'], (0, 0))
+                print(f"{cat['nome']:<15} {qtd_produtos:<3} produtos | Estoque total: {total_estoque}")
             
         except sqlite3.Error as e:
             print(f"Erro ao consultar estoque: {e}")
@@ -1,7 +1,8 @@
 import sqlite3
 import os
-from datetime import datetime
 from utils.busca_interativa import BuscaInterativa
+from model.dinheiro import Dinheiro
+from model.venda import Venda
 from utils.tui import read_key, print_footer_hotkeys, prompt_text, clear_screen, print_header, print_title, print_table
 import os
 
@@ -94,8 +95,22 @@ class VendaController:
     def adicionar_produto_carrinho(self, tipo_forcado=None):
         """Adicionar produto ao carrinho. tipo_forcado permite forçar o modo de busca (ex.: 'nome')."""
         try:
-            # Usar busca interativa para selecionar produto
-            produto = self.busca.buscar_produto("SELECIONAR PRODUTO PARA VENDA", com_estoque=True, tipo_forcado=tipo_forcado)
+            produto = None
+            if tipo_forcado is None:
+                # Leitura do scanner: resolvida no índice em memória, sem consulta ao banco
+                codigo = prompt_text("Código de barras (ENTER para pesquisar): ").strip()
+                if codigo:
+                    registro = self.db.indice_barras.buscar(codigo)
+                    if registro is None:
+                        print(f"Código {codigo} não encontrado.")
+                    elif registro.estoque <= 0:
+                        print(f"{registro.nome} sem estoque!")
+                        return
+                    else:
+                        produto = registro._asdict()
+            if produto is None:
+                # Usar busca interativa para selecionar produto
+                produto = self.busca.buscar_produto("SELECIONAR PRODUTO PARA VENDA", com_estoque=True, tipo_forcado=tipo_forcado)
             if not produto:
                 print("Produto não selecionado!")
                 return
@@ -158,7 +173,7 @@ class VendaController:
             print("Carrinho vazio")
             return
         
-        total = 0
+        total = Dinheiro(0)
         for i, item in enumerate(self.carrinho, 1):
             print(f"{i}. {item['nome']} | {item['quantidade']} x R$ {item['preco_unitario']:.2f} = R$ {item['subtotal']:.2f}")
             total += item['subtotal']
@@ -174,7 +189,7 @@ class VendaController:
             return
         
         try:
-            total = sum(item['subtotal'] for item in self.carrinho)
+            total = sum((item['subtotal'] for item in self.carrinho), Dinheiro(0))
             
             print(f"\nTotal da venda: R$ {total:.2f}")
             print("\nFormas de pagamento:")
@@ -195,25 +210,7 @@ class VendaController:
             opcao_pagamento = input("\nForma de pagamento: ")
             forma_pagamento = forma_pagamento_opcoes.get(opcao_pagamento, 'dinheiro')
             
-            # Inserir venda
-            venda_id = self.db.executar_consulta('''
-                INSERT INTO vendas (cliente_id, usuario_id, valor_total, forma_pagamento)
-                VALUES (?, ?, ?, ?)
-            ''', (cliente_id, self.usuario_id, total, forma_pagamento))
-            
-            # Inserir itens da venda e atualizar estoque
-            for item in self.carrinho:
-                self.db.executar_consulta('''
-                    INSERT INTO venda_itens (venda_id, produto_id, quantidade, preco_unitario, subtotal)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (venda_id, item['produto_id'], item['quantidade'], item['preco_unitario'], item['subtotal']))
-                
-                # Atualizar estoque
-                self.db.executar_consulta('''
-                    UPDATE produtos 
-                    SET estoque = estoque - ? 
-                    WHERE id = ?
-                ''', (item['quantidade'], item['produto_id']))
+            venda_id = self.registrar_venda(cliente_id, forma_pagamento)
             
             print(f"\nVenda finalizada com sucesso! Nº {venda_id}")
             self.carrinho = []
@@ -221,6 +218,36 @@ class VendaController:
         except sqlite3.Error as e:
             print(f"Erro ao finalizar venda: {e}")
     
+    def registrar_venda(self, cliente_id, forma_pagamento):
+        """Gravar o carrinho atual como venda e retornar o número da venda.
+        Venda, itens e baixa de estoque são gravados em uma única transação."""
+        total = sum((item['subtotal'] for item in self.carrinho), Dinheiro(0))
+        
+        with self.db.transacao() as t:
+            venda_id = t.executar('''
+                INSERT INTO vendas (cliente_id, usuario_id, valor_total, forma_pagamento)
+                VALUES (?, ?, ?, ?)
+            ''', (cliente_id, self.usuario_id, total, forma_pagamento)).lastrowid
+            
+            t.executar_varios('''
+                INSERT INTO venda_itens (venda_id, produto_id, quantidade, preco_unitario, subtotal)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(venda_id, item['produto_id'], item['quantidade'], item['preco_unitario'], item['subtotal'])
+                  for item in self.carrinho])
+            
+            # Atualizar estoque (só baixa se ainda houver saldo suficiente)
+            baixa = t.executar_varios('''
+                UPDATE produtos 
+                SET estoque = estoque - ? 
+                WHERE id = ? AND estoque >= ?
+            ''', [(item['quantidade'], item['produto_id'], item['quantidade']) for item in self.carrinho])
+            
+            if baixa.rowcount != len(self.carrinho):
+                raise sqlite3.IntegrityError("Estoque insuficiente para um ou mais itens; venda não registrada")
+        
+        self.db.notificar_alteracao('produtos', [item['produto_id'] for item in self.carrinho])
+        return venda_id
+    
     def selecionar_cliente(self):
         """Selecionar cliente para venda"""
         try:
@@ -234,14 +261,14 @@ class VendaController:
     def historico_vendas(self):
         """Exibir histórico de vendas"""
         try:
-            vendas = self.db.executar_consulta('''
+            vendas = self.db.buscar_todos('''
                 SELECT v.*, c.nome as cliente_nome, u.nome as usuario_nome
                 FROM vendas v
                 LEFT JOIN clientes c ON v.cliente_id = c.id
                 LEFT JOIN usuarios u ON v.usuario_id = u.id
                 ORDER BY v.data_venda DESC
                 LIMIT 50
-            ''')
+            ''', modelo=Venda)
             
             import os
             ansi_enabled = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
@@ -250,10 +277,10 @@ class VendaController:
             headers = [("Nº", 4), ("DATA", 16), ("CLIENTE", 20), ("VALOR", 10), ("PAGAMENTO", 12), ("VENDEDOR", 15)]
             rows = []
             for venda in vendas:
-                data = datetime.strptime(venda['data_venda'], '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%y %H:%M')
-                cliente = venda['cliente_nome'] or '---'
+                cliente = venda.cliente_nome or '---'
                 rows.append([
-                    str(venda['id']), data, cliente, f"R$ {venda['valor_total']:.2f}", venda['forma_pagamento'], venda['usuario_nome']
+                    str(venda.id), venda.data_venda.strftime('%d/%m/%y %H:%M'), cliente,
+                    f"R$ {venda.valor_total:.2f}", venda.forma_pagamento.value, venda.usuario_nome
                 ])
             print_table(headers, rows, ansi_enabled, header_color, zebra=True)
             
@@ -264,13 +291,13 @@ class VendaController:
     def vendas_aberto(self):
         """Vendas em aberto (fiado)"""
         try:
-            vendas_aberto = self.db.executar_consulta('''
-                SELECT v.*, c.nome as cliente_nome, c.telefone
+            vendas_aberto = self.db.buscar_todos('''
+                SELECT v.*, c.nome as cliente_nome, c.telefone as cliente_telefone
                 FROM vendas v
                 JOIN clientes c ON v.cliente_id = c.id
                 WHERE v.forma_pagamento = 'fiado' AND v.status = 'concluida'
                 ORDER BY v.data_venda
-            ''')
+            ''', modelo=Venda)
             
             import os
             ansi_enabled = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
@@ -281,13 +308,13 @@ class VendaController:
                 return
             headers = [("Nº", 6), ("CLIENTE", 20), ("DATA", 10), ("VALOR", 10), ("TEL", 14)]
             rows = []
-            total_aberto = 0
+            total_aberto = Dinheiro(0)
             for venda in vendas_aberto:
-                data = datetime.strptime(venda['data_venda'], '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%y')
                 rows.append([
-                    str(venda['id']), venda['cliente_nome'], data, f"R$ {venda['valor_total']:.2f}", venda['telefone']
+                    str(venda.id), venda.cliente_nome, venda.data_venda.strftime('%d/%m/%y'),
+                    f"R$ {venda.valor_total:.2f}", venda.cliente_telefone
                 ])
-                total_aberto += venda['valor_total']
+                total_aberto += venda.valor_total
             print_table(headers, rows, ansi_enabled, header_color, zebra=True)
             print(f"\nTOTAL EM ABERTO: R$ {total_aberto:.2f}")
             
@@ -0,0 +1,230 @@
+import bisect
+import sqlite3
+import threading
+
+# Colunas mantidas em memória, na ordem da consulta abaixo
+ARMAZENADAS = ('id', 'codigo_barras', 'nome', 'descricao', 'categoria_id',
+               'preco_custo', 'preco_venda', 'estoque', 'estoque_minimo', 'ncm', 'cest', 'unidade')
+# categoria_nome vem do RegistroCategorias na hora da leitura
+COLUNAS = ARMAZENADAS + ('categoria_nome',)
+
+_CONSULTA = '''
+    SELECT p.id, p.codigo_barras, p.nome, p.descricao, p.categoria_id,
+           p.preco_custo, p.preco_venda, p.estoque, p.estoque_minimo, p.ncm, p.cest, p.unidade,
+           p.ativo
+    FROM produtos p
+'''
+
+_VERSAO = "SELECT versao FROM versoes_tabelas WHERE tabela = 'produtos'"
+
+# Maior versão já removida de produtos_excluidos: catálogo mais antigo que ela recarrega tudo
+_HORIZONTE = "SELECT versao FROM versoes_tabelas WHERE tabela = 'produtos_excluidos'"
+
+
+def _chave_ordem(valor):
+    # Nulos por último, sem comparar None com texto/número
+    return (valor is None, valor)
+
+
+class CatalogoProdutos:
+    """Cópia em memória dos produtos ativos, em colunas (uma lista por campo).
+
+    Cada leitura compara a versão gravada em versoes_tabelas (incrementada por
+    gatilho a cada alteração em produtos) com a versão carregada: se for igual,
+    a resposta sai da memória; se não, só as linhas com versao_linha maior e as
+    exclusões registradas em produtos_excluidos são relidas. Alterações feitas
+    por outro processo no mesmo arquivo também são percebidas.
+    """
+
+    def __init__(self, database):
+        self.db = database
+        self._colunas = {coluna: [] for coluna in ARMAZENADAS}
+        self._posicao = {}      # id -> posição nas listas
+        self._ordens = {}       # coluna -> posições ordenadas por ela (descartadas a cada recarga)
+        self.versao = None
+        self._lock = threading.RLock()
+        self.acertos = 0
+        self.recargas = 0
+        self.linhas_recarregadas = 0
+        self.cargas_completas = 0
+        self.exclusoes_podadas = 0
+
+    def _aplicar(self, linha):
+        """Incluir, substituir ou (se inativo) retirar a linha do catálogo"""
+        produto_id, ativo = linha[0], linha[-1]
+        posicao = self._posicao.get(produto_id)
+        if not ativo:
+            self._retirar(produto_id)
+        elif posicao is None:
+            self._posicao[produto_id] = len(self._posicao)
+            for coluna, valor in zip(ARMAZENADAS, linha):
+                self._colunas[coluna].append(valor)
+        else:
+            for coluna, valor in zip(ARMAZENADAS, linha):
+                self._colunas[coluna][posicao] = valor
+
+    def _retirar(self, produto_id):
+        """Remover trocando com a última posição (sem deslocar as listas)"""
+        posicao = self._posicao.pop(produto_id, None)
+        if posicao is None:
+            return
+        ultima = len(self._posicao)
+        for lista in self._colunas.values():
+            if posicao != ultima:
+                lista[posicao] = lista[ultima]
+            lista.pop()
+        if posicao != ultima:
+            self._posicao[self._colunas['id'][posicao]] = posicao
+
+    def carregar(self):
+        """(Re)carregar todos os produtos ativos"""
+        with self._lock:
+            versao = self.db.buscar_um(_VERSAO, somente_leitura=True)[0]
+            self._colunas = {coluna: [] for coluna in ARMAZENADAS}
+            self._posicao = {}
+            for linha in self.db.iterar_linhas(_CONSULTA + " WHERE p.ativo = 1", tuplas=True,
+                                               somente_leitura=True):
+                self._aplicar(linha)
+            self._ordens = {}
+            self.versao = versao
+            self.cargas_completas += 1
+
+    def atualizar(self):
+        """Trazer o catálogo para a versão atual do banco, relendo só o que mudou.
+        A versão é lida antes das linhas: uma escrita que chegue no meio é
+        relida na próxima vez, nunca perdida."""
+        with self._lock:
+            if self.versao is None:
+                self.carregar()
+                return
+            versao = self.db.buscar_um(_VERSAO, somente_leitura=True)[0]
+            if versao == self.versao:
+                self.acertos += 1
+                return
+            # Exclusões até o horizonte já foram podadas: não há como saber quais faltam
+            horizonte = self.db.buscar_um(_HORIZONTE, somente_leitura=True)
+            if horizonte is not None and horizonte[0] > self.versao:
+                self.carregar()
+                return
+            # Exclusões primeiro: um id excluído e inserido de novo volta com a linha nova
+            excluidos = self.db.buscar_todos("SELECT id FROM produtos_excluidos WHERE versao > ?",
+                                             (self.versao,), somente_leitura=True)
+            for (produto_id,) in excluidos:
+                self._retirar(produto_id)
+            linhas = self.db.buscar_todos(_CONSULTA + " WHERE p.versao_linha > ?",
+                                          (self.versao,), somente_leitura=True)
+            for linha in linhas:
+                self._aplicar(tuple(linha))
+            self._ordens = {}
+            self.versao = versao
+            self.recargas += 1
+            self.linhas_recarregadas += len(linhas)
+        if excluidos:
+            self._podar_exclusoes(versao)
+
+    def _podar_exclusoes(self, versao):
+        """Apagar de produtos_excluidos o que este catálogo (o único cache que lê a tabela)
+        já aplicou, para a consulta de exclusões não crescer para sempre. O horizonte
+        gravado faz um catálogo de outro processo, ainda mais antigo, recarregar tudo.
+        É só manutenção: se o banco estiver ocupado, fica para a próxima recarga."""
+        try:
+            with self.db.transacao() as t:
+                podadas = t.executar("DELETE FROM produtos_excluidos WHERE versao <= ?", (versao,)).rowcount
+                t.executar('''
+                    INSERT INTO versoes_tabelas (tabela, versao) VALUES ('produtos_excluidos', ?)
+                    ON CONFLICT (tabela) DO UPDATE SET versao = MAX(versao, excluded.versao)
+                ''', (versao,))
+            self.exclusoes_podadas += podadas
+        except sqlite3.Error:
+            pass
+
+    def _coluna(self, coluna):
+        if coluna == 'categoria_nome':
+            nome = self.db.categorias.nome
+            return [nome(categoria_id) for categoria_id in self._colunas['categoria_id']]
+        return self._colunas[coluna]
+
+    def _posicoes(self, ordem):
+        if ordem is None:
+            return range(len(self._posicao))
+        posicoes = self._ordens.get(ordem)
+        if posicoes is None:
+            valores = self._coluna(ordem)
+            chaves = self._colunas['id']
+            posicoes = self._ordens[ordem] = sorted(range(len(valores)),
+                                                    key=lambda i: (_chave_ordem(valores[i]), chaves[i]))
+        return posicoes
+
+    def linhas(self, colunas=COLUNAS, onde=None, ordem='nome'):
+        """Lista de tuplas com as colunas pedidas, ordenadas pela coluna ordem (e pelo id).
+        onde(linha) filtra as tuplas já montadas."""
+        self.atualizar()
+        with self._lock:
+            tuplas = list(zip(*(self._coluna(coluna) for coluna in colunas)))
+            resultado = [tuplas[i] for i in self._posicoes(ordem)]
+        if onde is not None:
+            resultado = [linha for linha in resultado if onde(linha)]
+        return resultado
+
+    def pagina(self, colunas, chave=None, quantidade=20, avancar=True, ordem='nome'):
+        """Até quantidade tuplas logo depois (ou, com avancar=False, logo antes) da chave
+        (valor da coluna ordem, id), na ordem (ordem, id), e se há mais linhas nessa direção.
+        A posição da chave sai de uma busca binária na ordem já calculada e só as tuplas
+        da página são montadas (paginação por chave, como o PaginadorKeyset)."""
+        self.atualizar()
+        with self._lock:
+            posicoes = self._posicoes(ordem)
+            valores, ids = self._coluna(ordem), self._colunas['id']
+            if chave is None:
+                inicio, fim = 0, quantidade
+            else:
+                alvo = (_chave_ordem(chave[0]), chave[1])
+                chave_de = lambda i: (_chave_ordem(valores[i]), ids[i])
+                if avancar:
+                    inicio = bisect.bisect_right(posicoes, alvo, key=chave_de)
+                    fim = inicio + quantidade
+                else:
+                    fim = bisect.bisect_left(posicoes, alvo, key=chave_de)
+                    inicio = max(0, fim - quantidade)
+            mais = fim < len(posicoes) if avancar else inicio > 0
+            nome_categoria = self.db.categorias.nome
+            linhas = [tuple(nome_categoria(self._colunas['categoria_id'][i]) if coluna == 'categoria_nome'
+                            else self._colunas[coluna][i] for coluna in colunas)
+                      for i in posicoes[inicio:fim]]
+        return linhas, mais
+
+    def colunas(self, colunas=COLUNAS, ordem='nome'):
+        """Dicionário coluna -> lista de valores, pronto para montar um DataFrame"""
+        self.atualizar()
+        with self._lock:
+            posicoes = self._posicoes(ordem)
+            resultado = {}
+            for coluna in colunas:
+                valores = self._coluna(coluna)
+                resultado[coluna] = [valores[i] for i in posicoes]
+            return resultado
+
+    def buscar(self, produto_id):
+        """Dicionário com os campos do produto ativo, ou None"""
+        self.atualizar()
+        with self._lock:
+            posicao = self._posicao.get(produto_id)
+            if posicao is None:
+                return None
+            produto = {coluna: self._colunas[coluna][posicao] for coluna in ARMAZENADAS}
+        produto['categoria_nome'] = self.db.categorias.nome(produto['categoria_id'])
+        return produto
+
+    def estatisticas(self):
+        return {
+            'produtos': len(self._posicao),
+            'versao': self.versao,
+            'acertos': self.acertos,
+            'recargas': self.recargas,
+            'linhas_recarregadas': self.linhas_recarregadas,
+            'cargas_completas': self.cargas_completas,
+            'exclusoes_podadas': self.exclusoes_podadas,
+        }
+
+    def __len__(self):
+        return len(self._posicao)
@@ -0,0 +1,72 @@
+import threading
+
+_CONSULTA = "SELECT id, nome, descricao, ativo FROM categorias ORDER BY nome, id"
+
+
+class RegistroCategorias:
+    """Tabela de categorias mantida inteira em memória (id -> categoria e nome -> id).
+
+    As categorias são poucas e quase não mudam: carregadas no primeiro uso e
+    recarregadas por completo a cada Database.notificar_alteracao('categorias').
+    Os nomes das categorias dos produtos são resolvidos aqui, sem JOIN.
+    """
+
+    def __init__(self, database):
+        self.db = database
+        self._por_id = {}       # id -> dict(id, nome, descricao, ativo)
+        self._por_nome = {}     # nome em minúsculas -> id
+        self._carregado = False
+        self._lock = threading.Lock()
+        database.observar('categorias', self.atualizar)
+
+    def carregar(self):
+        por_id = {linha['id']: dict(linha) for linha in self.db.buscar_todos(_CONSULTA, somente_leitura=True)}
+        with self._lock:
+            self._por_id = por_id
+            self._por_nome = {categoria['nome'].lower(): categoria_id for categoria_id, categoria in por_id.items()}
+            self._carregado = True
+
+    def atualizar(self, ids=None):
+        """Recarregar tudo (a tabela é pequena); antes do primeiro uso não há o que atualizar"""
+        if self._carregado:
+            self.carregar()
+
+    def _garantir(self):
+        if not self._carregado:
+            self.carregar()
+
+    def nome(self, categoria_id):
+        """Nome da categoria (ativa ou não), ou None"""
+        self._garantir()
+        categoria = self._por_id.get(categoria_id)
+        return categoria['nome'] if categoria else None
+
+    def id_por_nome(self, nome):
+        """Id da categoria com esse nome (sem diferenciar maiúsculas), ou None"""
+        self._garantir()
+        return self._por_nome.get(str(nome).strip().lower())
+
+    def buscar(self, categoria_id):
+        """Categoria ativa com o id informado, ou None"""
+        self._garantir()
+        categoria = self._por_id.get(categoria_id)
+        return categoria if categoria and categoria['ativo'] else None
+
+    def ativas(self):
+        """Categorias ativas, em ordem de nome"""
+        self._garantir()
+        return [categoria for categoria in self._por_id.values() if categoria['ativo']]
+
+    def ids_ativos(self):
+        """Conjunto dos ids das categorias ativas (para validar cargas em massa)"""
+        return {categoria['id'] for categoria in self.ativas()}
+
+    def pesquisar(self, termo, campos):
+        """Categorias ativas cujo texto contém o termo em alguma das colunas"""
+        termo = termo.lower()
+        return [categoria for categoria in self.ativas()
+                if any(termo in str(categoria[campo] or '').lower() for campo in campos)]
+
+    def __len__(self):
+        self._garantir()
+        return len(self._por_id)
@@ -1,177 +1,507 @@
 import sqlite3
 import os
+import re
+import time
+from pathlib import Path
 from datetime import datetime
 import logging
+from contextlib import contextmanager
+from db.pool_conexoes import PoolConexoes
+from db.migracoes import aplicar_migracoes
+from db.instrucoes import classificar_instrucao, LEITURA
+from model.dinheiro import Dinheiro  # registra adaptador/conversor CENTAVOS
+from utils.config import Config
+from utils.metricas import Metricas
+from log.logger import registrar_consulta_lenta
+
+# Com PARSE_DECLTYPES, colunas TIMESTAMP continuam vindo como texto
+sqlite3.register_converter('TIMESTAMP', lambda valor: valor.decode())
+
+# Sequência de marcadores de uma lista IN, agrupada nas métricas
+_MARCADORES = re.compile(r"\?(?:\s*,\s*\?)+")
+
+# PRAGMAs aceitos no perfil de armazenamento (database.pragmas no config.json)
+PRAGMAS_PERMITIDOS = {
+    'journal_mode', 'synchronous', 'cache_size', 'mmap_size',
+    'temp_store', 'busy_timeout', 'foreign_keys', 'wal_autocheckpoint'
+}
+
+class Transacao:
+    """Unidade de trabalho: todas as instruções são gravadas em um único commit.
+    medir(conn, query, params, inicio) registra o tempo de cada instrução."""
+    
+    def __init__(self, conn, medir=None):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.medir = medir
+    
+    def executar(self, query, params=()):
+        """Executar uma instrução e retornar o cursor (lastrowid, rowcount, linhas)"""
+        inicio = time.perf_counter()
+        cursor = self.cursor.execute(query, params)
+        if self.medir:
+            self.medir(self.conn, query, params, inicio)
+        return cursor
+    
+    def executar_varios(self, query, lista_params):
+        """Executar a mesma instrução para cada conjunto de parâmetros (executemany)"""
+        inicio = time.perf_counter()
+        cursor = self.cursor.executemany(query, lista_params)
+        if self.medir:
+            # O lote conta como uma amostra; o plano usa o primeiro conjunto de parâmetros
+            primeiro = lista_params[0] if isinstance(lista_params, (list, tuple)) and lista_params else None
+            self.medir(self.conn, query, primeiro, inicio)
+        return cursor
+
+class _CursorMedido(sqlite3.Cursor):
+    """Cursor que acumula em tempo só o que é gasto no SQLite (execute e fetch),
+    sem contar o que o consumidor da leitura em fluxo faz entre um lote e outro"""
+    tempo = 0.0
+    
+    def _medir(self, funcao, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            self.tempo += time.perf_counter() - inicio
+    
+    def execute(self, *args):
+        return self._medir(super().execute, *args)
+    
+    def fetchone(self):
+        return self._medir(super().fetchone)
+    
+    def fetchmany(self, *args):
+        return self._medir(super().fetchmany, *args)
+    
+    def fetchall(self):
+        return self._medir(super().fetchall)
+    
+    def __iter__(self):
+        # Iterar o cursor lê em lotes de fetchmany, medidos acima
+        while True:
+            lote = self.fetchmany()
+            if not lote:
+                return
+            yield from lote
 
 class Database:
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, config=None):
         if db_path is None:
             # Usar diretório do executável como base para o banco
             base_dir = os.path.dirname(os.path.abspath(__file__))
             db_path = os.path.join(base_dir, 'barcaExpert.db')
         
         self.db_path = db_path
-        self.conn = None
+        self.config = config or Config()
         self.logger = logging.getLogger(__name__)
+        self.pragmas = self._perfil_armazenamento()
+        self.pool = PoolConexoes(
+            self.conectar,
+            tamanho_maximo=self.config.get('database.pool.tamanho', 4),
+            tempo_ocioso=self.config.get('database.pool.tempo_ocioso', 300),
+            tempo_espera=self.config.get('database.pool.tempo_espera', 5),
+            intervalo_verificacao=self.config.get('database.pool.intervalo_verificacao', 30),
+        )
+        # Conexões somente leitura para relatórios: com WAL, leem um snapshot
+        # consistente do banco sem bloquear as gravações do caixa
+        self.pool_leitura = PoolConexoes(
+            lambda: self.conectar(somente_leitura=True),
+            tamanho_maximo=self.config.get('database.leitura.tamanho', 2),
+            tempo_ocioso=self.config.get('database.pool.tempo_ocioso', 300),
+            tempo_espera=self.config.get('database.pool.tempo_espera', 5),
+            intervalo_verificacao=self.config.get('database.pool.intervalo_verificacao', 30),
+        )
+        # tabela -> funções chamadas quando linhas dessa tabela são alteradas
+        self._observadores = {}
+        self._indice_barras = None
+        self._indice_fuzzy = None
+        self._servico_busca = None
+        self._catalogo = None
+        self._categorias = None
+        # Histogramas de tempo (consultas e buscas) e limite do log de consultas lentas
+        self.metricas = Metricas()
+        self.limite_consulta_lenta_ms = self.config.get('metricas.consulta_lenta_ms', 100)
         
-    def conectar(self):
-        """Conectar ao banco de dados"""
+    def _perfil_armazenamento(self):
+        """Ler os PRAGMAs do perfil de armazenamento, ignorando nomes desconhecidos"""
+        pragmas = {}
+        for nome, valor in (self.config.get('database.pragmas', {}) or {}).items():
+            if nome not in PRAGMAS_PERMITIDOS:
+                self.logger.warning(f"PRAGMA ignorado no perfil de armazenamento: {nome}")
+                continue
+            if not isinstance(valor, int) and not str(valor).replace('_', '').isalnum():
+                self.logger.warning(f"Valor inválido para PRAGMA {nome}: {valor}")
+                continue
+            pragmas[nome] = valor
+        return pragmas
+    
+    def conectar(self, somente_leitura=False):
+        """Abrir uma nova conexão com o banco de dados.
+        Usado pelos pools; o restante do sistema deve usar conexao()."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-            return self.conn
+            timeout = self.pragmas.get('busy_timeout', 5000) / 1000
+            if somente_leitura:
+                destino, uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro", True
+            else:
+                destino, uri = self.db_path, False
+            # cached_statements mantém as instruções já compiladas em cada conexão do pool
+            conn = sqlite3.connect(
+                destino, timeout=timeout, check_same_thread=False, uri=uri,
+                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                cached_statements=self.config.get('database.cache_instrucoes', 256)
+            )
+            conn.row_factory = sqlite3.Row
+            for nome, valor in self.pragmas.items():
+                if somente_leitura and nome == 'journal_mode':
+                    continue  # modo do journal só pode ser definido por quem grava
+                conn.execute(f"PRAGMA {nome} = {valor}")
+            if somente_leitura:
+                conn.execute("PRAGMA query_only = ON")
+            return conn
         except sqlite3.Error as e:
             self.logger.error(f"Erro ao conectar ao banco: {e}")
             raise
     
+    def conexao(self, somente_leitura=False):
+        """Context manager com uma conexão emprestada do pool.
+        Com somente_leitura=True usa o pool de leitura (relatórios e exportações)."""
+        if somente_leitura and self.db_path != ':memory:':
+            return self.pool_leitura.conexao()
+        return self.pool.conexao()
+    
+    @contextmanager
+    def transacao(self):
+        """Context manager de transação: commit ao sair, rollback em caso de erro.
+        Usa BEGIN IMMEDIATE para reservar a escrita logo no início."""
+        with self.conexao() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                yield Transacao(conn, self._medir_consulta)
+                conn.commit()
+            except BaseException as e:
+                conn.rollback()
+                if isinstance(e, sqlite3.Error):
+                    self.logger.error(f"Erro na transação: {e}")
+                raise
+    
+    def observar(self, tabela, funcao):
+        """Registrar uma função chamada com os ids alterados (ou None = tudo)
+        sempre que notificar_alteracao for chamado para a tabela"""
+        self._observadores.setdefault(tabela, []).append(funcao)
+    
+    def notificar_alteracao(self, tabela, ids=None):
+        """Avisar os caches em memória que linhas da tabela mudaram.
+        Deve ser chamado depois do commit; ids=None indica alteração em massa."""
+        for funcao in self._observadores.get(tabela, ()):
+            try:
+                funcao(ids)
+            except Exception as e:
+                self.logger.error(f"Erro ao atualizar cache de {tabela}: {e}")
+    
+    @property
+    def indice_barras(self):
+        """Índice em memória dos produtos por código de barras (criado no primeiro uso)"""
+        if self._indice_barras is None:
+            from db.indice_barras import IndiceCodigoBarras
+            self._indice_barras = IndiceCodigoBarras(self)
+        return self._indice_barras
+    
+    @property
+    def indice_fuzzy(self):
+        """Índice de busca aproximada por nome de produto (montado na primeira busca)"""
+        if self._indice_fuzzy is None:
+            from db.indice_fuzzy import IndiceFuzzyProdutos
+            self._indice_fuzzy = IndiceFuzzyProdutos(self)
+        return self._indice_fuzzy
+    
+    @property
+    def categorias(self):
+        """Registro das categorias em memória (id -> nome, nome -> id)"""
+        if self._categorias is None:
+            from db.categorias import RegistroCategorias
+            self._categorias = RegistroCategorias(self)
+        return self._categorias
+    
+    @property
+    def catalogo(self):
+        """Catálogo de produtos ativos em memória (recarrega só o que mudou)"""
+        if self._catalogo is None:
+            from db.catalogo import CatalogoProdutos
+            self._catalogo = CatalogoProdutos(self)
+        return self._catalogo
+    
+    @property
+    def servico_busca(self):
+        """Serviço de pesquisa (com cache LRU) compartilhado entre as telas"""
+        if self._servico_busca is None:
+            from utils.servico_busca import ServicoBusca
+            self._servico_busca = ServicoBusca(self)
+        return self._servico_busca
+    
+    def estatisticas_conexao(self):
+        """Contadores dos pools: aberturas, reusos e tempo de espera"""
+        return {**self.pool.estatisticas(), 'leitura': self.pool_leitura.estatisticas()}
+    
+    def checkpoint(self, modo='TRUNCATE'):
+        """Transferir o conteúdo do WAL para o arquivo principal do banco.
+        Retorna (ocupado, paginas_log, paginas_transferidas)."""
+        modo = modo.upper()
+        if modo not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Modo de checkpoint inválido: {modo}")
+        with self.conexao() as conn:
+            return tuple(conn.execute(f"PRAGMA wal_checkpoint({modo})").fetchone())
+    
+    def otimizar(self):
+        """Atualizar estatísticas do planejador de consultas (PRAGMA optimize)"""
+        with self.conexao() as conn:
+            conn.execute("PRAGMA optimize")
+    
+    def fechar(self):
+        """Fechar as conexões mantidas pelo pool"""
+        self.pool.fechar_todas()
+        self.pool_leitura.fechar_todas()
+    
     def inicializar_tabelas(self):
         """Inicializar todas as tabelas do sistema"""
         try:
-            conn = self.conectar()
-            cursor = conn.cursor()
-            
-            # Tabela de usuários
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS usuarios (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    nome TEXT NOT NULL,
-                    nivel_permissao TEXT NOT NULL DEFAULT 'operador',
-                    ativo INTEGER DEFAULT 1,
-                    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Tabela de categorias de produtos
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS categorias (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nome TEXT NOT NULL,
-                    descricao TEXT,
-                    ativo INTEGER DEFAULT 1
-                )
-            ''')
-            
-            # Tabela de produtos
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS produtos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    codigo_barras TEXT UNIQUE,
-                    nome TEXT NOT NULL,
-                    descricao TEXT,
-                    categoria_id INTEGER,
-                    preco_custo DECIMAL(10,2) NOT NULL,
-                    preco_venda DECIMAL(10,2) NOT NULL,
-                    estoque INTEGER DEFAULT 0,
-                    estoque_minimo INTEGER DEFAULT 0,
-                    ncm TEXT,
-                    cest TEXT,
-                    cfop TEXT DEFAULT '5102',
-                    unidade TEXT DEFAULT 'UN',
-                    ativo INTEGER DEFAULT 1,
-                    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (categoria_id) REFERENCES categorias (id)
-                )
-            ''')
-            
-            # Tabela de clientes
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS clientes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nome TEXT NOT NULL,
-                    telefone TEXT,
-                    email TEXT,
-                    endereco TEXT,
-                    cpf_cnpj TEXT,
-                    limite_credito DECIMAL(10,2) DEFAULT 0,
-                    ativo INTEGER DEFAULT 1,
-                    data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Tabela de vendas
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS vendas (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    cliente_id INTEGER,
-                    usuario_id INTEGER NOT NULL,
-                    valor_total DECIMAL(10,2) NOT NULL,
-                    forma_pagamento TEXT DEFAULT 'dinheiro',
-                    status TEXT DEFAULT 'concluida',
-                    data_venda TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (cliente_id) REFERENCES clientes (id),
-                    FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
-                )
-            ''')
-            
-            # Tabela de itens da venda
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS venda_itens (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    venda_id INTEGER NOT NULL,
-                    produto_id INTEGER NOT NULL,
-                    quantidade INTEGER NOT NULL,
-                    preco_unitario DECIMAL(10,2) NOT NULL,
-                    subtotal DECIMAL(10,2) NOT NULL,
-                    FOREIGN KEY (venda_id) REFERENCES vendas (id),
-                    FOREIGN KEY (produto_id) REFERENCES produtos (id)
-                )
-            ''')
-            
-            # Inserir categorias padrão
-            categorias_padrao = [
-                ('Revistas', 'Revistas e periódicos'),
-                ('Doces', 'Doces, balas e chocolates'),
-                ('Refrigerantes', 'Bebidas não alcoólicas'),
-                ('Cervejas', 'Bebidas alcoólicas'),
-                ('Salgadinhos', 'Salgadinhos e snacks'),
-                ('Tabaco', 'Cigarros e derivados'),
-                ('Diversos', 'Outros produtos')
-            ]
-            
-            cursor.executemany(
-                'INSERT OR IGNORE INTO categorias (nome, descricao) VALUES (?, ?)',
-                categorias_padrao
-            )
-            
-            # Inserir usuário admin padrão
-            cursor.execute('''
-                INSERT OR IGNORE INTO usuarios (username, password_hash, nome, nivel_permissao)
-                VALUES ('admin', 'admin123', 'Administrador', 'admin')
-            ''')
-            
-            conn.commit()
+            with self.conexao() as conn:
+                self._criar_tabelas(conn)
+                aplicar_migracoes(conn)
             self.logger.info("Tabelas inicializadas com sucesso")
             
         except sqlite3.Error as e:
             self.logger.error(f"Erro ao inicializar tabelas: {e}")
             raise
-        finally:
-            if conn:
-                conn.close()
+    
+    def _criar_tabelas(self, conn):
+        """Criar tabelas e dados padrão na conexão informada"""
+        cursor = conn.cursor()
+        
+        # Tabela de usuários
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS usuarios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password_hash TEXT NOT NULL,
+                nome TEXT NOT NULL,
+                nivel_permissao TEXT NOT NULL DEFAULT 'operador',
+                ativo INTEGER DEFAULT 1,
+                data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Tabela de categorias de produtos
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS categorias (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nome TEXT NOT NULL,
+                descricao TEXT,
+                ativo INTEGER DEFAULT 1
+            )
+        ''')
+        
+        # Tabela de produtos
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS produtos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                codigo_barras TEXT UNIQUE,
+                nome TEXT NOT NULL,
+                descricao TEXT,
+                categoria_id INTEGER,
+                preco_custo CENTAVOS NOT NULL,
+                preco_venda CENTAVOS NOT NULL,
+                estoque INTEGER DEFAULT 0,
+                estoque_minimo INTEGER DEFAULT 0,
+                ncm TEXT,
+                cest TEXT,
+                cfop TEXT DEFAULT '5102',
+                unidade TEXT DEFAULT 'UN',
+                ativo INTEGER DEFAULT 1,
+                data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (categoria_id) REFERENCES categorias (id)
+            )
+        ''')
+        
+        # Tabela de clientes
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS clientes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nome TEXT NOT NULL,
+                telefone TEXT,
+                email TEXT,
+                endereco TEXT,
+                cpf_cnpj TEXT,
+                limite_credito CENTAVOS DEFAULT 0,
+                ativo INTEGER DEFAULT 1,
+                data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Tabela de vendas
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS vendas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cliente_id INTEGER,
+                usuario_id INTEGER NOT NULL,
+                valor_total CENTAVOS NOT NULL,
+                forma_pagamento TEXT DEFAULT 'dinheiro',
+                status TEXT DEFAULT 'concluida',
+                data_venda TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (cliente_id) REFERENCES clientes (id),
+                FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
+            )
+        ''')
+        
+        # Tabela de itens da venda
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS venda_itens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                venda_id INTEGER NOT NULL,
+                produto_id INTEGER NOT NULL,
+                quantidade INTEGER NOT NULL,
+                preco_unitario CENTAVOS NOT NULL,
+                subtotal CENTAVOS NOT NULL,
+                FOREIGN KEY (venda_id) REFERENCES vendas (id),
+                FOREIGN KEY (produto_id) REFERENCES produtos (id)
+            )
+        ''')
+        
+        # Inserir categorias padrão
+        categorias_padrao = [
+            ('Revistas', 'Revistas e periódicos'),
+            ('Doces', 'Doces, balas e chocolates'),
+            ('Refrigerantes', 'Bebidas não alcoólicas'),
+            ('Cervejas', 'Bebidas alcoólicas'),
+            ('Salgadinhos', 'Salgadinhos e snacks'),
+            ('Tabaco', 'Cigarros e derivados'),
+            ('Diversos', 'Outros produtos')
+        ]
+        
+        cursor.executemany(
+            'INSERT OR IGNORE INTO categorias (nome, descricao) VALUES (?, ?)',
+            categorias_padrao
+        )
+        
+        # Inserir usuário admin padrão
+        cursor.execute('''
+            INSERT OR IGNORE INTO usuarios (username, password_hash, nome, nivel_permissao)
+            VALUES ('admin', 'admin123', 'Administrador', 'admin')
+        ''')
+        
+        conn.commit()
     
     def executar_consulta(self, query, params=None):
-        """Executar consulta no banco de dados"""
+        """Executar consulta no banco de dados.
+        Leituras retornam todas as linhas; escritas fazem commit e retornam o lastrowid."""
         try:
-            conn = self.conectar()
-            cursor = conn.cursor()
-            
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-                
-            if query.strip().upper().startswith('SELECT'):
-                return cursor.fetchall()
-            else:
-                conn.commit()
-                return cursor.lastrowid
+            with self.conexao() as conn:
+                inicio = time.perf_counter()
+                cursor = conn.execute(query, params or ())
+                    
+                if classificar_instrucao(query) == LEITURA:
+                    linhas = cursor.fetchall()
+                    self._medir_consulta(conn, query, params, inicio)
+                    return linhas
+                else:
+                    conn.commit()
+                    self._medir_consulta(conn, query, params, inicio)
+                    return cursor.lastrowid
                 
         except sqlite3.Error as e:
             self.logger.error(f"Erro na consulta: {e}")
             raise
-        finally:
-            if conn:
-                conn.close()
\ No newline at end of file
+    
+    def _medir_consulta(self, conn, query, params, inicio):
+        """Registrar o tempo da instrução no histograma 'sql'; acima do limite,
+        gravar também o plano (EXPLAIN QUERY PLAN) no log de consultas lentas"""
+        ms = (time.perf_counter() - inicio) * 1000
+        # Listas IN (?, ?, ...) de tamanhos diferentes contam como a mesma instrução
+        instrucao = _MARCADORES.sub("?, ...", " ".join(query.split()))
+        self.metricas.registrar('sql', instrucao, ms)
+        if ms < self.limite_consulta_lenta_ms:
+            return
+        try:
+            profundidade = {0: -1}
+            plano = []
+            for no, pai, _, detalhe in conn.execute(f"EXPLAIN QUERY PLAN {query}", params or ()):
+                profundidade[no] = profundidade.get(pai, -1) + 1
+                plano.append("  " * profundidade[no] + detalhe)
+        except sqlite3.Error as e:
+            plano = [f"(plano indisponível: {e})"]
+        registrar_consulta_lenta(instrucao, params, ms, plano)
+    
+    def buscar_um(self, query, params=None, somente_leitura=False, modelo=None):
+        """Executar uma leitura e retornar apenas a primeira linha (ou None).
+        Com modelo (ex.: Produto), a linha já vem como instância do modelo."""
+        try:
+            with self.conexao(somente_leitura) as conn:
+                cursor = conn.cursor()
+                if modelo is not None:
+                    cursor.row_factory = modelo.row_factory()
+                inicio = time.perf_counter()
+                linha = cursor.execute(query, params or ()).fetchone()
+                self._medir_consulta(conn, query, params, inicio)
+                return linha
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro na consulta: {e}")
+            raise
+    
+    def buscar_todos(self, query, params=None, somente_leitura=False, modelo=None):
+        """Executar uma leitura e retornar todas as linhas (como instâncias de modelo, se informado)"""
+        try:
+            with self.conexao(somente_leitura) as conn:
+                cursor = conn.cursor()
+                if modelo is not None:
+                    cursor.row_factory = modelo.row_factory()
+                inicio = time.perf_counter()
+                linhas = cursor.execute(query, params or ()).fetchall()
+                self._medir_consulta(conn, query, params, inicio)
+                return linhas
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro na consulta: {e}")
+            raise
+    
+    @contextmanager
+    def abrir_cursor(self, query, params=None, tamanho_lote=None, tuplas=False, somente_leitura=False,
+                     modelo=None):
+        """Context manager com um cursor já executado, para leitura em fluxo.
+        tamanho_lote define o arraysize usado em fetchmany; com tuplas=True as
+        linhas vêm como tuplas simples (nomes das colunas em cursor.description).
+        somente_leitura=True lê pelo pool de leitura, sem disputar com as gravações.
+        modelo (ex.: Produto) faz cada linha chegar como instância do modelo.
+        O tempo registrado nas métricas é só o de execução e leitura no SQLite."""
+        with self.conexao(somente_leitura) as conn:
+            cursor = conn.cursor(_CursorMedido)
+            cursor.arraysize = tamanho_lote or self.config.get('database.tamanho_lote', 500)
+            if modelo is not None:
+                cursor.row_factory = modelo.row_factory()
+            elif tuplas:
+                cursor.row_factory = None
+            try:
+                cursor.execute(query, params or ())
+                yield cursor
+                self._medir_consulta(conn, query, params, time.perf_counter() - cursor.tempo)
+            except sqlite3.Error as e:
+                self.logger.error(f"Erro na consulta: {e}")
+                raise
+            finally:
+                cursor.close()
+    
+    def iterar_linhas(self, query, params=None, tamanho_lote=None, tuplas=False, somente_leitura=False,
+                      modelo=None):
+        """Gerador que percorre o resultado da leitura em lotes de fetchmany,
+        sem carregar tudo em memória. A conexão fica emprestada até o fim da iteração."""
+        with self.abrir_cursor(query, params, tamanho_lote, tuplas, somente_leitura, modelo) as cursor:
+            while True:
+                lote = cursor.fetchmany()
+                if not lote:
+                    break
+                yield from lote
+    
+    def executar_varios(self, query, lista_params):
+        """Executar a mesma escrita para vários conjuntos de parâmetros em um único commit.
+        Retorna a quantidade de linhas afetadas."""
+        with self.transacao() as t:
+            return t.executar_varios(query, lista_params).rowcount
@@ -0,0 +1,67 @@
+import threading
+from collections import namedtuple
+
+# Registro compacto guardado no índice (tupla, sem __dict__ por produto)
+ProdutoBarras = namedtuple('ProdutoBarras', 'id codigo_barras nome preco_venda estoque')
+
+_CONSULTA = '''
+    SELECT id, codigo_barras, nome, preco_venda, estoque
+    FROM produtos
+    WHERE ativo = 1 AND codigo_barras IS NOT NULL AND codigo_barras <> ''
+'''
+
+
+class IndiceCodigoBarras:
+    """Índice em memória codigo_barras -> produto, para a leitura do scanner no caixa.
+
+    É carregado uma vez e atualizado só nos produtos alterados, a partir das
+    notificações de Database.notificar_alteracao('produtos', ids).
+    """
+
+    def __init__(self, database):
+        self.db = database
+        self._por_codigo = {}
+        self._codigo_por_id = {}
+        self._carregado = False
+        self._lock = threading.Lock()
+        database.observar('produtos', self.atualizar)
+
+    def carregar(self):
+        """(Re)carregar todos os produtos ativos com código de barras"""
+        por_codigo, codigo_por_id = {}, {}
+        for linha in self.db.iterar_linhas(_CONSULTA, tuplas=True):
+            registro = ProdutoBarras(*linha)
+            por_codigo[registro.codigo_barras] = registro
+            codigo_por_id[registro.id] = registro.codigo_barras
+        with self._lock:
+            self._por_codigo, self._codigo_por_id = por_codigo, codigo_por_id
+            self._carregado = True
+
+    def atualizar(self, ids=None):
+        """Atualizar apenas os produtos informados (ou tudo, se ids for None)"""
+        if ids is None or not self._carregado:
+            self.carregar()
+            return
+        ids = list(ids)
+        if not ids:
+            return
+        marcadores = ", ".join("?" * len(ids))
+        linhas = self.db.buscar_todos(f"{_CONSULTA} AND id IN ({marcadores})", ids)
+        with self._lock:
+            for produto_id in ids:
+                codigo = self._codigo_por_id.pop(produto_id, None)
+                if codigo is not None:
+                    self._por_codigo.pop(codigo, None)
+            for linha in linhas:
+                registro = ProdutoBarras(*linha)
+                self._por_codigo[registro.codigo_barras] = registro
+                self._codigo_por_id[registro.id] = registro.codigo_barras
+
+    def buscar(self, codigo_barras):
+        """Produto ativo com o código informado, ou None (sem acessar o banco)"""
+        if not self._carregado:
+            self.carregar()
+        return self._por_codigo.get(codigo_barras.strip())
+
+    def __len__(self):
+        return len(self._por_codigo)
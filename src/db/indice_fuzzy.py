@@ -0,0 +1,185 @@
+import heapq
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+_CONSULTA = "SELECT id, nome FROM produtos WHERE ativo = 1"
+
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e só letras/dígitos separados por espaço"""
+    decomposto = unicodedata.normalize('NFKD', str(texto).lower())
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(re.findall(r"[a-z0-9]+", sem_acentos))
+
+
+def trigramas(texto_normalizado):
+    """Trigramas de cada palavra, com duas posições de margem no início e uma no fim
+    (como no pg_trgm), para que o começo das palavras pese mais"""
+    resultado = set()
+    for palavra in texto_normalizado.split():
+        margem = f"  {palavra} "
+        resultado.update(margem[i:i + 3] for i in range(len(margem) - 2))
+    return resultado
+
+
+def distancia_edicao(a, b, limite=None):
+    """Distância de Levenshtein entre duas palavras (para cedo se passar de limite)"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limite is not None and len(a) - len(b) > limite:
+        return limite + 1
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if limite is not None and min(atual) > limite:
+            return limite + 1
+        anterior = atual
+    return anterior[-1]
+
+
+class IndiceFuzzyProdutos:
+    """Busca aproximada de produtos por nome, tolerante a erros de digitação.
+
+    Um índice invertido trigrama -> ids seleciona os candidatos; os melhores são
+    reordenados pela distância de edição entre as palavras digitadas e as do
+    nome. Montado no primeiro uso e atualizado só nos produtos notificados por
+    Database.notificar_alteracao('produtos', ids).
+    """
+
+    # Candidatos (por trigramas em comum) reavaliados com distância de edição
+    CANDIDATOS = 200
+    # Similaridade mínima (0 a 1) para um produto entrar no resultado
+    SIMILARIDADE_MINIMA = 0.45
+    # Trigramas presentes em mais que esta fração do catálogo não ajudam a separar
+    # candidatos; só são contados se não houver trigramas mais raros suficientes
+    FRACAO_COMUM = 0.05
+
+    def __init__(self, database):
+        self.db = database
+        self._nomes = {}        # id -> nome normalizado
+        self._indice = {}       # trigrama -> set(ids)
+        self._carregado = False
+        self._lock = threading.Lock()
+        database.observar('produtos', self.atualizar)
+
+    def _incluir(self, produto_id, nome):
+        self._nomes[produto_id] = nome
+        for trigrama in trigramas(nome):
+            self._indice.setdefault(trigrama, set()).add(produto_id)
+
+    def _remover(self, produto_id):
+        nome = self._nomes.pop(produto_id, None)
+        if nome is None:
+            return
+        for trigrama in trigramas(nome):
+            ids = self._indice.get(trigrama)
+            if ids is not None:
+                ids.discard(produto_id)
+                if not ids:
+                    del self._indice[trigrama]
+
+    def carregar(self):
+        """(Re)montar o índice com todos os produtos ativos"""
+        with self._lock:
+            self._nomes, self._indice = {}, {}
+            for produto_id, nome in self.db.iterar_linhas(_CONSULTA, tuplas=True):
+                self._incluir(produto_id, normalizar(nome))
+            self._carregado = True
+
+    def atualizar(self, ids=None):
+        """Reindexar apenas os produtos informados (ou tudo, se ids for None).
+        Só é montado sob demanda: antes do primeiro uso não há o que atualizar."""
+        if not self._carregado:
+            return
+        if ids is None:
+            self.carregar()
+            return
+        ids = list(ids)
+        if not ids:
+            return
+        marcadores = ", ".join("?" * len(ids))
+        nomes = {linha[0]: normalizar(linha[1])
+                 for linha in self.db.buscar_todos(f"{_CONSULTA} AND id IN ({marcadores})", ids)}
+        with self._lock:
+            for produto_id in ids:
+                nome = nomes.get(produto_id)
+                if nome == self._nomes.get(produto_id):
+                    continue  # ex.: só o estoque mudou
+                self._remover(produto_id)
+                if nome is not None:
+                    self._incluir(produto_id, nome)
+
+    @staticmethod
+    def _semelhanca(palavra, outra):
+        """Semelhança (0 a 1) entre uma palavra digitada e uma palavra do nome;
+        prefixos contam como acerto"""
+        if outra.startswith(palavra):
+            return 1.0
+        # Compara com o começo da palavra: "refrigerant" ~ "refrigerante"
+        alvo = outra[:len(palavra) + 1]
+        tamanho = max(len(palavra), len(alvo))
+        return 1 - distancia_edicao(palavra, alvo, tamanho // 2) / tamanho
+
+    def _similaridade_palavras(self, palavras_termo, palavras_nome, memoria):
+        """Média, para cada palavra digitada, da melhor semelhança com uma palavra do nome.
+        memoria guarda as comparações já feitas na mesma busca (nomes repetem palavras)."""
+        if not palavras_termo or not palavras_nome:
+            return 0.0
+        total = 0.0
+        for palavra in palavras_termo:
+            melhor = 0.0
+            for outra in palavras_nome:
+                chave = (palavra, outra)
+                semelhanca = memoria.get(chave)
+                if semelhanca is None:
+                    semelhanca = memoria[chave] = self._semelhanca(palavra, outra)
+                if semelhanca > melhor:
+                    melhor = semelhanca
+                    if melhor == 1.0:
+                        break
+            total += melhor
+        return total / len(palavras_termo)
+
+    def buscar(self, termo, limite=20):
+        """Lista de (id, similaridade) dos produtos mais parecidos com o termo,
+        da maior para a menor similaridade"""
+        if not self._carregado:
+            self.carregar()
+        termo = normalizar(termo)
+        grams = trigramas(termo)
+        if not grams:
+            return []
+
+        with self._lock:
+            # Listas de ids da mais rara para a mais comum
+            listas = sorted((ids for ids in map(self._indice.get, grams) if ids), key=len)
+            teto = max(self.CANDIDATOS, int(len(self._nomes) * self.FRACAO_COMUM))
+            raras = [ids for ids in listas if len(ids) <= teto]
+            contagem = Counter()
+            for ids in (raras if len(raras) >= len(listas) // 2 else listas[:max(1, len(listas) // 2)]):
+                contagem.update(ids)
+            candidatos = heapq.nlargest(self.CANDIDATOS, contagem, key=contagem.__getitem__)
+            nomes = {produto_id: self._nomes[produto_id] for produto_id in candidatos}
+
+        palavras_termo = termo.split()
+        memoria = {}
+        resultado = []
+        for produto_id in candidatos:
+            nome = nomes[produto_id]
+            # Coeficiente de Dice dos trigramas + semelhança palavra a palavra
+            trigramas_nome = trigramas(nome)
+            dice = 2 * len(grams & trigramas_nome) / (len(grams) + len(trigramas_nome))
+            similaridade = 0.4 * dice + 0.6 * self._similaridade_palavras(palavras_termo, nome.split(), memoria)
+            if similaridade >= self.SIMILARIDADE_MINIMA:
+                resultado.append((produto_id, round(similaridade, 4)))
+        resultado.sort(key=lambda item: (-item[1], nomes[item[0]]))
+        return resultado[:limite]
+
+    def __len__(self):
+        return len(self._nomes)
@@ -0,0 +1,42 @@
+import re
+from functools import lru_cache
+
+LEITURA = 'leitura'
+ESCRITA = 'escrita'
+
+# Palavras-chave que iniciam instruções que retornam linhas
+_PALAVRAS_LEITURA = {'SELECT', 'VALUES', 'EXPLAIN', 'PRAGMA'}
+# Palavras-chave que podem encerrar um bloco WITH (CTE)
+_PALAVRAS_PRINCIPAIS = {'SELECT', 'VALUES', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE'}
+
+_TOKEN = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|[()]|[A-Za-z_]+", re.S)
+
+
+@lru_cache(maxsize=512)
+def classificar_instrucao(query):
+    """Classificar a instrução SQL como LEITURA (retorna linhas) ou ESCRITA.
+    O resultado fica em cache por texto da instrução, então cada SQL é
+    analisado uma única vez. Blocos WITH são classificados pela instrução
+    principal que vem depois das CTEs."""
+    profundidade = 0
+    primeira = None
+    for token in _TOKEN.findall(query):
+        if token.startswith(('--', '/*', "'", '"')):
+            continue
+        if token == '(':
+            profundidade += 1
+            continue
+        if token == ')':
+            profundidade -= 1
+            continue
+        if profundidade:
+            continue
+        palavra = token.upper()
+        if primeira is None:
+            primeira = palavra
+            if palavra != 'WITH':
+                break
+        elif palavra in _PALAVRAS_PRINCIPAIS:
+            primeira = palavra
+            break
+    return LEITURA if primeira in _PALAVRAS_LEITURA else ESCRITA
@@ -0,0 +1,319 @@
+import logging
+import re
+import sqlite3
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Colunas monetárias que passam a ser gravadas em centavos inteiros
+COLUNAS_DINHEIRO = {
+    'produtos': ('preco_custo', 'preco_venda'),
+    'clientes': ('limite_credito',),
+    'vendas': ('valor_total',),
+    'venda_itens': ('preco_unitario', 'subtotal'),
+}
+
+
+def _converter_para_centavos(conn):
+    """Reconstruir as tabelas com colunas monetárias do tipo CENTAVOS,
+    convertendo os valores em reais (REAL) para centavos (INTEGER).
+    Tabelas já criadas com CENTAVOS são mantidas como estão."""
+    for tabela, colunas in COLUNAS_DINHEIRO.items():
+        info = conn.execute(f"PRAGMA table_info({tabela})").fetchall()
+        tipos = {linha[1]: linha[2].upper() for linha in info}
+        if all(tipos.get(coluna) == 'CENTAVOS' for coluna in colunas):
+            continue
+
+        sql_tabela = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+        ).fetchone()[0]
+        sql_indices = [linha[0] for linha in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (tabela,)
+        )]
+
+        nova = f"{tabela}_centavos"
+        sql_nova = re.sub(rf'\b{tabela}\b', nova, sql_tabela, count=1)
+        for coluna in colunas:
+            sql_nova = re.sub(rf'(\b{coluna}\s+)DECIMAL\(\d+\s*,\s*\d+\)', r'\1CENTAVOS', sql_nova)
+        conn.execute(sql_nova)
+
+        nomes = [linha[1] for linha in info]
+        selecao = [
+            f"CAST(ROUND({nome} * 100) AS INTEGER)" if nome in colunas else nome
+            for nome in nomes
+        ]
+        conn.execute(
+            f"INSERT INTO {nova} ({', '.join(nomes)}) SELECT {', '.join(selecao)} FROM {tabela}"
+        )
+        conn.execute(f"DROP TABLE {tabela}")
+        conn.execute(f"ALTER TABLE {nova} RENAME TO {tabela}")
+        for sql_indice in sql_indices:
+            conn.execute(sql_indice)
+
+def _criar_busca_textual_produtos(conn):
+    """Criar o índice FTS5 de produtos (nome, descrição e código de barras),
+    sincronizado por triggers. Sem acentos na tokenização ("acai" encontra "Açaí")
+    e com índices de prefixo para a busca enquanto se digita.
+    Se o SQLite não tiver FTS5, a busca continua usando LIKE."""
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS produtos_fts USING fts5(
+                nome, descricao, codigo_barras,
+                content='produtos', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 indisponível, busca de produtos seguirá com LIKE: {e}")
+        return
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS produtos_fts_ai AFTER INSERT ON produtos BEGIN
+            INSERT INTO produtos_fts (rowid, nome, descricao, codigo_barras)
+            VALUES (new.id, new.nome, new.descricao, new.codigo_barras);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS produtos_fts_ad AFTER DELETE ON produtos BEGIN
+            INSERT INTO produtos_fts (produtos_fts, rowid, nome, descricao, codigo_barras)
+            VALUES ('delete', old.id, old.nome, old.descricao, old.codigo_barras);
+        END
+    ''')
+    # Só reindexa quando mudam colunas pesquisáveis (a baixa de estoque não dispara)
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS produtos_fts_au AFTER UPDATE OF nome, descricao, codigo_barras ON produtos BEGIN
+            INSERT INTO produtos_fts (produtos_fts, rowid, nome, descricao, codigo_barras)
+            VALUES ('delete', old.id, old.nome, old.descricao, old.codigo_barras);
+            INSERT INTO produtos_fts (rowid, nome, descricao, codigo_barras)
+            VALUES (new.id, new.nome, new.descricao, new.codigo_barras);
+        END
+    ''')
+    conn.execute("INSERT INTO produtos_fts (produtos_fts) VALUES ('rebuild')")
+
+
+def _normalizar_documentos_clientes(conn):
+    """Criar as colunas só com dígitos de CPF/CNPJ e telefone dos clientes,
+    preencher a partir dos valores formatados e indexá-las"""
+    from model.cliente import somente_digitos
+
+    colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(clientes)")}
+    for coluna in ('cpf_cnpj_digitos', 'telefone_digitos'):
+        if coluna not in colunas:
+            conn.execute(f"ALTER TABLE clientes ADD COLUMN {coluna} TEXT")
+
+    conn.executemany(
+        "UPDATE clientes SET cpf_cnpj_digitos = ?, telefone_digitos = ? WHERE id = ?",
+        [(somente_digitos(cpf_cnpj), somente_digitos(telefone), cliente_id)
+         for cliente_id, cpf_cnpj, telefone in conn.execute("SELECT id, cpf_cnpj, telefone FROM clientes")]
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_clientes_cpf_cnpj_digitos ON clientes (cpf_cnpj_digitos)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_clientes_telefone_digitos ON clientes (telefone_digitos)")
+
+
+def _versionar_produtos(conn):
+    """Numerar as alterações de produtos: versoes_tabelas guarda um contador que
+    cada INSERT/UPDATE/DELETE incrementa, e produtos.versao_linha recebe o valor
+    do contador na última alteração da linha. Assim o catálogo em memória recarrega
+    só as linhas com versao_linha maior que a versão que já conhece."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS versoes_tabelas (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO versoes_tabelas (tabela, versao) VALUES ('produtos', 1)")
+
+    colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(produtos)")}
+    if 'versao_linha' not in colunas:
+        conn.execute("ALTER TABLE produtos ADD COLUMN versao_linha INTEGER NOT NULL DEFAULT 0")
+    conn.execute("UPDATE produtos SET versao_linha = 1")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_produtos_versao_linha ON produtos (versao_linha)")
+
+    # Exclusões físicas não deixam linha para comparar: ficam registradas aqui
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS produtos_excluidos (
+            id INTEGER PRIMARY KEY,
+            versao INTEGER NOT NULL
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS produtos_versao_ai AFTER INSERT ON produtos BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'produtos';
+            UPDATE produtos SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'produtos')
+            WHERE id = new.id;
+        END
+    ''')
+    # O WHEN evita que a própria atualização de versao_linha conte como nova alteração
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS produtos_versao_au AFTER UPDATE ON produtos
+        WHEN new.versao_linha = old.versao_linha BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'produtos';
+            UPDATE produtos SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'produtos')
+            WHERE id = new.id;
+        END
+    ''')
+    # Renomear uma categoria muda o que o catálogo mostra (e a ordem) dos produtos dela
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS categorias_versao_au AFTER UPDATE OF nome ON categorias BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'produtos';
+            UPDATE produtos SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'produtos')
+            WHERE categoria_id = new.id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS produtos_versao_ad AFTER DELETE ON produtos BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'produtos';
+            INSERT OR REPLACE INTO produtos_excluidos (id, versao)
+            SELECT old.id, versao FROM versoes_tabelas WHERE tabela = 'produtos';
+        END
+    ''')
+
+
+def _versionar_vendas(conn):
+    """Numerar as alterações de vendas como em _versionar_produtos, para a exportação
+    incremental: incluir ou alterar uma venda, ou mexer nos itens dela, grava em
+    vendas.versao_linha o contador de 'vendas'. A tabela exportacoes guarda até qual
+    versão cada exportação incremental já foi gravada."""
+    conn.execute("INSERT OR IGNORE INTO versoes_tabelas (tabela, versao) VALUES ('vendas', 1)")
+
+    colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(vendas)")}
+    if 'versao_linha' not in colunas:
+        conn.execute("ALTER TABLE vendas ADD COLUMN versao_linha INTEGER NOT NULL DEFAULT 0")
+    conn.execute("UPDATE vendas SET versao_linha = 1")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_vendas_versao_linha ON vendas (versao_linha)")
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS exportacoes (
+            nome TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL,
+            ultimo_id INTEGER,
+            ultima_data TIMESTAMP,
+            data_exportacao TIMESTAMP NOT NULL
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS vendas_versao_ai AFTER INSERT ON vendas BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'vendas';
+            UPDATE vendas SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'vendas')
+            WHERE id = new.id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS vendas_versao_au AFTER UPDATE ON vendas
+        WHEN new.versao_linha = old.versao_linha BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'vendas';
+            UPDATE vendas SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'vendas')
+            WHERE id = new.id;
+        END
+    ''')
+    # Itens gravados junto com a venda encontram a venda já na versão atual e não
+    # geram outra alteração (o checkout não paga um UPDATE a mais por item)
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS venda_itens_versao_ai AFTER INSERT ON venda_itens
+        WHEN (SELECT versao_linha FROM vendas WHERE id = new.venda_id)
+             IS NOT (SELECT versao FROM versoes_tabelas WHERE tabela = 'vendas') BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'vendas';
+            UPDATE vendas SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'vendas')
+            WHERE id = new.venda_id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS venda_itens_versao_au AFTER UPDATE ON venda_itens BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'vendas';
+            UPDATE vendas SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'vendas')
+            WHERE id IN (old.venda_id, new.venda_id);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS venda_itens_versao_ad AFTER DELETE ON venda_itens BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'vendas';
+            UPDATE vendas SET versao_linha = (SELECT versao FROM versoes_tabelas WHERE tabela = 'vendas')
+            WHERE id = old.venda_id;
+        END
+    ''')
+
+
+# Migrações do esquema, em ordem de versão.
+# Cada passo é uma instrução SQL ou uma função que recebe a conexão.
+# Nunca altere uma migração já publicada: acrescente uma nova versão.
+MIGRACOES = [
+    (1, "Índices das consultas frequentes", [
+        # Listagens e buscas de produtos/clientes ativos ordenadas por nome
+        "CREATE INDEX IF NOT EXISTS idx_produtos_ativo_nome ON produtos (ativo, nome)",
+        "CREATE INDEX IF NOT EXISTS idx_clientes_ativo_nome ON clientes (ativo, nome)",
+        # Fiado por cliente (limite de crédito e exclusão): índice de cobertura,
+        # a soma de valor_total é resolvida sem acessar a tabela
+        """CREATE INDEX IF NOT EXISTS idx_vendas_cliente_pagamento_status
+           ON vendas (cliente_id, forma_pagamento, status, data_venda, valor_total)""",
+        # Vendas em aberto de todos os clientes, em ordem de data
+        """CREATE INDEX IF NOT EXISTS idx_vendas_pagamento_status_data
+           ON vendas (forma_pagamento, status, data_venda)""",
+        # Histórico e relatórios por período
+        "CREATE INDEX IF NOT EXISTS idx_vendas_data ON vendas (data_venda)",
+        "CREATE INDEX IF NOT EXISTS idx_venda_itens_venda ON venda_itens (venda_id)",
+    ]),
+    (2, "Valores monetários em centavos inteiros", [
+        _converter_para_centavos,
+    ]),
+    (3, "Busca textual de produtos (FTS5)", [
+        _criar_busca_textual_produtos,
+    ]),
+    (4, "CPF/CNPJ e telefone dos clientes só com dígitos, indexados", [
+        _normalizar_documentos_clientes,
+    ]),
+    (5, "Versão de alteração dos produtos (catálogo em memória)", [
+        _versionar_produtos,
+    ]),
+    (6, "Versão de alteração das vendas (exportação incremental)", [
+        _versionar_vendas,
+    ]),
+]
+
+
+def versao_atual(conn):
+    """Versão do esquema gravada no banco (0 se nenhuma migração foi aplicada)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            versao INTEGER PRIMARY KEY,
+            descricao TEXT NOT NULL,
+            aplicada_em TIMESTAMP NOT NULL
+        )
+    ''')
+    return conn.execute("SELECT COALESCE(MAX(versao), 0) FROM schema_version").fetchone()[0]
+
+
+def aplicar_migracoes(conn, migracoes=None):
+    """Aplicar, em ordem, as migrações ainda pendentes.
+    Cada versão roda em sua própria transação; se falhar, nada dela é gravado.
+    Retorna a lista de versões aplicadas."""
+    migracoes = sorted(migracoes or MIGRACOES, key=lambda m: m[0])
+    atual = versao_atual(conn)
+    conn.commit()
+
+    aplicadas = []
+    for versao, descricao, passos in migracoes:
+        if versao <= atual:
+            continue
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for passo in passos:
+                if callable(passo):
+                    passo(conn)
+                else:
+                    conn.execute(passo)
+            conn.execute(
+                "INSERT INTO schema_version (versao, descricao, aplicada_em) VALUES (?, ?, ?)",
+                (versao, descricao, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"Falha na migração {versao} ({descricao})")
+            raise
+        logger.info(f"Migração {versao} aplicada: {descricao}")
+        aplicadas.append(versao)
+    return aplicadas
@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolConexoes:
+    """Pool limitado de conexões SQLite reaproveitadas entre as consultas.
+
+    As conexões são criadas sob demanda até ``tamanho_maximo``. Conexões
+    ociosas por mais de ``tempo_ocioso`` segundos são fechadas e, antes de
+    reaproveitar uma conexão parada há mais de ``intervalo_verificacao``
+    segundos, é feito um teste simples de saúde (``SELECT 1``).
+    """
+
+    def __init__(self, fabrica, tamanho_maximo=4, tempo_ocioso=300.0,
+                 tempo_espera=5.0, intervalo_verificacao=30.0):
+        self._fabrica = fabrica
+        self.tamanho_maximo = max(1, int(tamanho_maximo))
+        self.tempo_ocioso = float(tempo_ocioso)
+        self.tempo_espera = float(tempo_espera)
+        self.intervalo_verificacao = float(intervalo_verificacao)
+
+        self._livres = []  # pilha de (conexao, instante_devolucao)
+        self._criadas = 0
+        self._condicao = threading.Condition()
+
+        self._aberturas = 0
+        self._reusos = 0
+        self._descartes = 0
+        self._espera_total = 0.0
+        self._espera_maxima = 0.0
+
+    def obter(self):
+        """Obter uma conexão do pool, abrindo uma nova se houver vaga"""
+        inicio = time.perf_counter()
+        limite = time.monotonic() + self.tempo_espera
+
+        with self._condicao:
+            while True:
+                conn = self._retirar_livre()
+                if conn is not None:
+                    self._reusos += 1
+                    self._registrar_espera(time.perf_counter() - inicio)
+                    return conn
+
+                if self._criadas < self.tamanho_maximo:
+                    self._criadas += 1
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0 or not self._condicao.wait(restante):
+                    self._registrar_espera(time.perf_counter() - inicio)
+                    raise sqlite3.OperationalError(
+                        "Tempo esgotado aguardando conexão livre no pool"
+                    )
+
+        # Abrir fora do lock para não bloquear quem está devolvendo conexões
+        try:
+            conn = self._fabrica()
+        except Exception:
+            with self._condicao:
+                self._criadas -= 1
+                self._condicao.notify()
+            raise
+
+        with self._condicao:
+            self._aberturas += 1
+            self._registrar_espera(time.perf_counter() - inicio)
+        return conn
+
+    def devolver(self, conn, descartar=False):
+        """Devolver a conexão ao pool (ou fechá-la se estiver inutilizável)"""
+        if not descartar and conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                descartar = True
+
+        with self._condicao:
+            if descartar:
+                self._fechar(conn)
+            else:
+                self._livres.append((conn, time.monotonic()))
+            self._condicao.notify()
+
+    @contextmanager
+    def conexao(self):
+        """Context manager que obtém e devolve uma conexão do pool"""
+        conn = self.obter()
+        descartar = False
+        try:
+            yield conn
+        except sqlite3.ProgrammingError:
+            # Conexão fechada ou em estado inválido: não volta para o pool
+            descartar = True
+            raise
+        finally:
+            self.devolver(conn, descartar=descartar)
+
+    def fechar_todas(self):
+        """Fechar todas as conexões livres do pool"""
+        with self._condicao:
+            while self._livres:
+                conn, _ = self._livres.pop()
+                self._fechar(conn)
+
+    def estatisticas(self):
+        """Contadores de uso do pool"""
+        with self._condicao:
+            return {
+                'aberturas': self._aberturas,
+                'reusos': self._reusos,
+                'descartes': self._descartes,
+                'em_uso': self._criadas - len(self._livres),
+                'livres': len(self._livres),
+                'tamanho_maximo': self.tamanho_maximo,
+                'espera_total_ms': round(self._espera_total * 1000, 3),
+                'espera_maxima_ms': round(self._espera_maxima * 1000, 3),
+            }
+
+    def _retirar_livre(self):
+        """Retirar a conexão livre mais recente que ainda esteja saudável"""
+        agora = time.monotonic()
+
+        # Conexões no fundo da pilha são as mais antigas: expirar primeiro
+        while self._livres and agora - self._livres[0][1] > self.tempo_ocioso:
+            conn, _ = self._livres.pop(0)
+            self._fechar(conn)
+
+        while self._livres:
+            conn, devolvida_em = self._livres.pop()
+            if agora - devolvida_em > self.intervalo_verificacao and not self._saudavel(conn):
+                self._fechar(conn)
+                continue
+            return conn
+        return None
+
+    def _saudavel(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _fechar(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._criadas -= 1
+        self._descartes += 1
+
+    def _registrar_espera(self, segundos):
+        self._espera_total += segundos
+        if segundos > self._espera_maxima:
+            self._espera_maxima = segundos
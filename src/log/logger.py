@@ -31,4 +31,37 @@ def setup_logger():
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
     
-    return logger
\ No newline at end of file
+    return logger
+
+
+def logger_consultas_lentas():
+    """Logger das consultas lentas, em arquivo próprio (logs/consultas_lentas_AAAAMMDD.log)
+    e sem repetir no console, para não atrapalhar as telas"""
+    logger = logging.getLogger('BarcaExpert.consultas_lentas')
+    if not logger.handlers:
+        os.makedirs('logs', exist_ok=True)
+        log_file = f'logs/consultas_lentas_{datetime.now().strftime("%Y%m%d")}.log'
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        logger.addHandler(file_handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def _descrever_parametros(params):
+    """Só a quantidade e os tipos dos parâmetros: os valores (CPF, telefone...) não vão para o disco"""
+    if not params:
+        return "nenhum"
+    if isinstance(params, dict):
+        tipos = (f"{nome}: {type(valor).__name__}" for nome, valor in params.items())
+    else:
+        tipos = (type(valor).__name__ for valor in params)
+    return f"{len(params)} ({', '.join(tipos)})"
+
+
+def registrar_consulta_lenta(instrucao, params, ms, plano):
+    """Gravar a instrução lenta com o tempo, os tipos dos parâmetros e o EXPLAIN QUERY PLAN"""
+    linhas = [f"{ms:.1f} ms: {instrucao}", f"  parâmetros: {_descrever_parametros(params)}"]
+    linhas += [f"  {detalhe}" for detalhe in plano]
+    logger_consultas_lentas().warning("\n".join(linhas))
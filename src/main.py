@@ -21,10 +21,18 @@ def main():
         db = Database()
         db.inicializar_tabelas()
         
+        # Carregar o índice de códigos de barras usado pelo caixa
+        db.indice_barras.carregar()
+        logger.info(f"Índice de códigos de barras carregado: {len(db.indice_barras)} produtos")
+        
         # Iniciar menu principal
         menu = MenuPrincipal(db)
         menu.executar()
         
+        logger.info(f"Estatísticas do pool de conexões: {db.estatisticas_conexao()}")
+        db.otimizar()
+        db.fechar()
+        
     except KeyboardInterrupt:
         print("\n\nSistema encerrado pelo usuário")
         sys.exit(0)
@@ -1,16 +1,26 @@
+import re
 from dataclasses import dataclass
 from typing import Optional
-from decimal import Decimal
+from model.dinheiro import Dinheiro
+from model.linhas import ModeloLinha
 
-@dataclass
-class Cliente:
+def somente_digitos(texto):
+    """CPF/CNPJ ou telefone sem pontuação ("123.456.789-00" -> "12345678900").
+    Usado nas colunas cpf_cnpj_digitos e telefone_digitos; vazio vira None."""
+    digitos = re.sub(r"\D", "", str(texto or ""))
+    return digitos or None
+
+@dataclass(slots=True)
+class Cliente(ModeloLinha):
+    _CONVERSORES = {'ativo': bool}
+    
     id: Optional[int] = None
     nome: str = ""
     telefone: Optional[str] = None
     email: Optional[str] = None
     endereco: Optional[str] = None
     cpf_cnpj: Optional[str] = None
-    limite_credito: Decimal = Decimal('0.00')
+    limite_credito: Dinheiro = Dinheiro(0)
     ativo: bool = True
     
     def to_dict(self):
@@ -21,7 +31,7 @@ class Cliente:
             'email': self.email,
             'endereco': self.endereco,
             'cpf_cnpj': self.cpf_cnpj,
-            'limite_credito': float(self.limite_credito),
+            'limite_credito': int(self.limite_credito),
             'ativo': self.ativo
         }
     
@@ -34,6 +44,6 @@ class Cliente:
             email=data.get('email'),
             endereco=data.get('endereco'),
             cpf_cnpj=data.get('cpf_cnpj'),
-            limite_credito=Decimal(str(data.get('limite_credito', 0))),
+            limite_credito=Dinheiro(data.get('limite_credito', 0)),
             ativo=bool(data.get('ativo', True))
         )
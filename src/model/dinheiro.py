@@ -0,0 +1,75 @@
+import sqlite3
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+class Dinheiro(int):
+    """Valor monetário guardado em centavos inteiros.
+
+    Soma, subtração e multiplicação por inteiros continuam sendo Dinheiro,
+    sem arredondamentos de ponto flutuante. Na formatação com especificador
+    decimal (ex.: f"{valor:.2f}") e em str() o valor aparece em reais.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def de_reais(cls, valor):
+        """Converter um valor em reais (texto, float, Decimal ou int) para centavos.
+        Aceita vírgula decimal, como em "12,50" ou "1.234,56"."""
+        if isinstance(valor, Dinheiro):
+            return valor
+        if isinstance(valor, str):
+            texto = valor.strip().replace('R$', '').strip()
+            if ',' in texto:
+                texto = texto.replace('.', '').replace(',', '.')
+            valor = texto
+        try:
+            reais = Decimal(str(valor))
+            return cls(int((reais * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP)))
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"Valor monetário inválido: {valor!r}")
+
+    @property
+    def reais(self):
+        return Decimal(int(self)).scaleb(-2)
+
+    def __add__(self, outro):
+        if isinstance(outro, int):
+            return Dinheiro(int(self) + int(outro))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        if isinstance(outro, int):
+            return Dinheiro(int(self) - int(outro))
+        return NotImplemented
+
+    def __rsub__(self, outro):
+        if isinstance(outro, int):
+            return Dinheiro(int(outro) - int(self))
+        return NotImplemented
+
+    def __mul__(self, quantidade):
+        if isinstance(quantidade, int) and not isinstance(quantidade, Dinheiro):
+            return Dinheiro(int(self) * quantidade)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Dinheiro(-int(self))
+
+    def __format__(self, spec):
+        if spec and spec[-1] in 'eEfFgG%':
+            return format(self.reais, spec)
+        return int.__format__(self, spec)
+
+    def __str__(self):
+        return f"{self.reais:.2f}"
+
+    def __repr__(self):
+        return f"Dinheiro({int(self)})"
+
+
+# Colunas declaradas como CENTAVOS (ou aliases "nome [CENTAVOS]") voltam como Dinheiro
+sqlite3.register_adapter(Dinheiro, int)
+sqlite3.register_converter('CENTAVOS', lambda valor: Dinheiro(int(valor)))
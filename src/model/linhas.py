@@ -0,0 +1,64 @@
+from dataclasses import fields, MISSING
+
+
+class ModeloLinha:
+    """Mixin para dataclasses com slots criadas direto das linhas do SQLite.
+
+    Cada modelo pode declarar em _CONVERSORES funções aplicadas a colunas
+    específicas (ex.: 'ativo': bool). Colunas ausentes na consulta recebem o
+    valor padrão do campo; colunas extras são ignoradas.
+    """
+    __slots__ = ()
+    _CONVERSORES = {}
+
+    @classmethod
+    def _plano(cls, colunas):
+        """Montar, para a ordem de colunas informada, a lista (posição, conversor, padrão)
+        de cada campo do modelo"""
+        posicoes = {nome: i for i, nome in enumerate(colunas)}
+        plano = []
+        for campo in fields(cls):
+            if campo.default is not MISSING:
+                padrao = lambda valor=campo.default: valor
+            elif campo.default_factory is not MISSING:
+                padrao = campo.default_factory
+            else:
+                padrao = lambda: None
+            plano.append((posicoes.get(campo.name), cls._CONVERSORES.get(campo.name), padrao))
+        return plano
+
+    @classmethod
+    def _montar(cls, plano, linha):
+        argumentos = []
+        for posicao, conversor, padrao in plano:
+            if posicao is None:
+                argumentos.append(padrao())
+                continue
+            valor = linha[posicao]
+            if conversor is not None and valor is not None:
+                valor = conversor(valor)
+            argumentos.append(valor)
+        return cls(*argumentos)
+
+    @classmethod
+    def from_row(cls, linha, colunas=None):
+        """Criar o modelo a partir de uma linha do cursor (tupla ou sqlite3.Row).
+        Para tuplas, informe os nomes das colunas na mesma ordem."""
+        if colunas is None:
+            colunas = linha.keys()
+        return cls._montar(cls._plano(colunas), linha)
+
+    @classmethod
+    def row_factory(cls):
+        """row_factory do sqlite3 que cria instâncias do modelo sem dicionário
+        intermediário. O plano de colunas é calculado uma vez por consulta."""
+        ultimo = [None, None]  # (cursor.description, plano)
+
+        def fabrica(cursor, linha):
+            descricao = cursor.description
+            if ultimo[0] is not descricao:
+                ultimo[0] = descricao
+                ultimo[1] = cls._plano([d[0] for d in descricao])
+            return cls._montar(ultimo[1], linha)
+
+        return fabrica
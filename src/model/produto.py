@@ -1,16 +1,19 @@
 from dataclasses import dataclass
 from typing import Optional
-from decimal import Decimal
+from model.dinheiro import Dinheiro
+from model.linhas import ModeloLinha
 
-@dataclass
-class Produto:
+@dataclass(slots=True)
+class Produto(ModeloLinha):
+    _CONVERSORES = {'ativo': bool}
+    
     id: Optional[int] = None
     codigo_barras: Optional[str] = None
     nome: str = ""
     descricao: Optional[str] = None
     categoria_id: Optional[int] = None
-    preco_custo: Decimal = Decimal('0.00')
-    preco_venda: Decimal = Decimal('0.00')
+    preco_custo: Dinheiro = Dinheiro(0)
+    preco_venda: Dinheiro = Dinheiro(0)
     estoque: int = 0
     estoque_minimo: int = 0
     ncm: Optional[str] = None
@@ -26,8 +29,8 @@ class Produto:
             'nome': self.nome,
             'descricao': self.descricao,
             'categoria_id': self.categoria_id,
-            'preco_custo': float(self.preco_custo),
-            'preco_venda': float(self.preco_venda),
+            'preco_custo': int(self.preco_custo),
+            'preco_venda': int(self.preco_venda),
             'estoque': self.estoque,
             'estoque_minimo': self.estoque_minimo,
             'ncm': self.ncm,
@@ -45,8 +48,8 @@ class Produto:
             nome=data.get('nome', ''),
             descricao=data.get('descricao'),
             categoria_id=data.get('categoria_id'),
-            preco_custo=Decimal(str(data.get('preco_custo', 0))),
-            preco_venda=Decimal(str(data.get('preco_venda', 0))),
+            preco_custo=Dinheiro(data.get('preco_custo', 0)),
+            preco_venda=Dinheiro(data.get('preco_venda', 0)),
             estoque=data.get('estoque', 0),
             estoque_minimo=data.get('estoque_minimo', 0),
             ncm=data.get('ncm'),
@@ -1,14 +1,17 @@
 from dataclasses import dataclass
 from typing import Optional
 from enum import Enum
+from model.linhas import ModeloLinha
 
 class NivelPermissao(Enum):
     ADMIN = "admin"
     OPERADOR = "operador"
     VENDEDOR = "vendedor"
 
-@dataclass
-class Usuario:
+@dataclass(slots=True)
+class Usuario(ModeloLinha):
+    _CONVERSORES = {'ativo': bool, 'nivel_permissao': NivelPermissao}
+    
     id: Optional[int] = None
     username: str = ""
     password_hash: str = ""
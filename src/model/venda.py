@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Optional
-from decimal import Decimal
+from model.dinheiro import Dinheiro
+from model.linhas import ModeloLinha
 from datetime import datetime
 from enum import Enum
 
@@ -16,29 +17,49 @@ class StatusVenda(Enum):
     CANCELADA = "cancelada"
     PENDENTE = "pendente"
 
-@dataclass
-class ItemVenda:
+@dataclass(slots=True)
+class ItemVenda(ModeloLinha):
     id: Optional[int] = None
     venda_id: Optional[int] = None
     produto_id: int = 0
     quantidade: int = 0
-    preco_unitario: Decimal = Decimal('0.00')
-    subtotal: Decimal = Decimal('0.00')
+    preco_unitario: Dinheiro = Dinheiro(0)
+    subtotal: Dinheiro = Dinheiro(0)
     
     def calcular_subtotal(self):
         self.subtotal = self.preco_unitario * self.quantidade
         return self.subtotal
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'venda_id': self.venda_id,
+            'produto_id': self.produto_id,
+            'quantidade': self.quantidade,
+            'preco_unitario': int(self.preco_unitario),
+            'subtotal': int(self.subtotal)
+        }
 
-@dataclass
-class Venda:
+@dataclass(slots=True)
+class Venda(ModeloLinha):
+    _CONVERSORES = {
+        'forma_pagamento': FormaPagamento,
+        'status': StatusVenda,
+        'data_venda': datetime.fromisoformat,
+    }
+    
     id: Optional[int] = None
     cliente_id: Optional[int] = None
     usuario_id: int = 0
-    valor_total: Decimal = Decimal('0.00')
+    valor_total: Dinheiro = Dinheiro(0)
     forma_pagamento: FormaPagamento = FormaPagamento.DINHEIRO
     status: StatusVenda = StatusVenda.CONCLUIDA
     data_venda: Optional[datetime] = None
     itens: List[ItemVenda] = None
+    # Preenchidos pelas consultas de listagem (JOIN com clientes/usuarios)
+    cliente_nome: Optional[str] = None
+    cliente_telefone: Optional[str] = None
+    usuario_nome: Optional[str] = None
     
     def __post_init__(self):
         if self.itens is None:
@@ -47,10 +68,10 @@ class Venda:
             self.data_venda = datetime.now()
     
     def calcular_total(self):
-        self.valor_total = sum(item.calcular_subtotal() for item in self.itens)
+        self.valor_total = sum((item.calcular_subtotal() for item in self.itens), Dinheiro(0))
         return self.valor_total
     
-    def adicionar_item(self, produto_id: int, quantidade: int, preco_unitario: Decimal):
+    def adicionar_item(self, produto_id: int, quantidade: int, preco_unitario: Dinheiro):
         item = ItemVenda(
             produto_id=produto_id,
             quantidade=quantidade,
@@ -65,9 +86,9 @@ class Venda:
             'id': self.id,
             'cliente_id': self.cliente_id,
             'usuario_id': self.usuario_id,
-            'valor_total': float(self.valor_total),
+            'valor_total': int(self.valor_total),
             'forma_pagamento': self.forma_pagamento.value,
             'status': self.status.value,
             'data_venda': self.data_venda.isoformat() if self.data_venda else None,
-            'itens': [item.__dict__ for item in self.itens]
+            'itens': [item.to_dict() for item in self.itens]
         }
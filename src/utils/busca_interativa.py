@@ -1,20 +1,32 @@
 import os
-from typing import List, Dict, Any, Optional, Callable
-import os
-from utils.tui import print_title, print_table
+from typing import List, Any, Optional
+from utils.tui import print_title, print_table, prompt_incremental, clear_screen
 
 class BuscaInterativa:
-    """Classe para busca interativa com diferentes critérios e seleção por índice"""
+    """Classe para busca interativa com diferentes critérios e seleção por índice.
+    As consultas, o cache e as métricas ficam no ServicoBusca (db.servico_busca)."""
+    
+    # Entidade -> (nome exibido no menu, colunas da tabela de resultados, mensagem de seleção)
+    TELAS = {
+        'produtos': ("produto", ['id', 'nome', 'categoria_nome', 'preco_venda', 'estoque'], "Escolha o produto"),
+        'clientes': ("cliente", ['id', 'nome', 'telefone', 'email'], "Escolha o cliente"),
+        'categorias': ("categoria", ['id', 'nome', 'descricao'], "Escolha a categoria"),
+        'usuarios': ("usuário", ['id', 'username', 'nome', 'nivel_permissao'], "Escolha o usuário"),
+    }
     
     def __init__(self, database):
         self.db = database
+        self.servico = database.servico_busca
     
     def limpar_tela(self):
         """Limpar a tela do terminal"""
         os.system('cls' if os.name == 'nt' else 'clear')
     
-    def exibir_resultados(self, resultados: List[Dict], titulo: str, colunas: List[str]):
-        """Exibir resultados em formato tabular com cabeçalho e zebra"""
+    def exibir_resultados(self, resultados: List, titulo: str, colunas: List[str], pagina: int = 1):
+        """Exibir uma página dos resultados em formato tabular com cabeçalho e zebra.
+        O índice mostrado é a posição na lista completa. A lista já vem inteira do
+        ServicoBusca (ordem por relevância e refino no cache precisam de todas as linhas);
+        só a renderização é paginada."""
         if not resultados:
             print("Nenhum resultado encontrado.")
             return
@@ -23,25 +35,48 @@ class BuscaInterativa:
         header_color = os.getenv('ANSI_HEADER_COLOR', 'yellow')
         print_title(titulo, ansi_enabled, header_color)
 
-        # Montar tabela
+        # Montar tabela apenas com as linhas da página
+        tamanho = self.tamanho_pagina
+        inicio = (pagina - 1) * tamanho
         headers = [("IDX", 4)] + [(c, 20) for c in colunas]
         rows = []
-        for i, item in enumerate(resultados, 1):
+        for i, item in enumerate(resultados[inicio:inicio + tamanho], inicio + 1):
             row = [f"{i}"]
+            disponiveis = item.keys()
             for coluna in colunas:
-                valor = str(item.get(coluna, 'N/A'))[:20]
+                valor = str(item[coluna] if coluna in disponiveis else 'N/A')[:20]
                 row.append(valor)
             rows.append(row)
         print_table(headers, rows, ansi_enabled, header_color, zebra=True)
+        
+        paginas = self.total_paginas(resultados)
+        if paginas > 1:
+            print(f"\nPágina {pagina} de {paginas} ({len(resultados)} resultados) - N: próxima, P: anterior")
     
-    def selecionar_por_indice(self, resultados: List[Dict], mensagem: str = "Escolha o índice") -> Optional[Dict]:
-        """Permitir seleção por índice"""
+    @property
+    def tamanho_pagina(self) -> int:
+        return self.db.config.get('paginacao.tamanho', 20)
+    
+    def total_paginas(self, resultados: List) -> int:
+        return max(1, -(-len(resultados) // self.tamanho_pagina))
+    
+    def selecionar_por_indice(self, resultados: List, mensagem: str = "Escolha o índice",
+                              titulo: Optional[str] = None, colunas: Optional[List[str]] = None) -> Optional[Any]:
+        """Permitir seleção por índice. Com titulo e colunas, N/P trocam a página exibida."""
         if not resultados:
             return None
         
+        pagina = 1
         while True:
             try:
-                indice = int(input(f"\n{mensagem} (1-{len(resultados)}): "))
+                resposta = input(f"\n{mensagem} (1-{len(resultados)}): ").strip().upper()
+                if titulo and resposta in ("N", "P"):
+                    nova = pagina + (1 if resposta == "N" else -1)
+                    if 1 <= nova <= self.total_paginas(resultados):
+                        pagina = nova
+                        self.exibir_resultados(resultados, titulo, colunas or ['id', 'nome'], pagina)
+                    continue
+                indice = int(resposta)
                 if 1 <= indice <= len(resultados):
                     return resultados[indice - 1]
                 else:
@@ -76,220 +111,86 @@ class BuscaInterativa:
             else:
                 print("Opção inválida!")
     
-    def buscar_categoria(self, titulo: str = "SELECIONAR CATEGORIA") -> Optional[Dict]:
-        """Buscar categoria com diferentes critérios"""
-        tipo_busca = self.menu_tipo_busca("categoria")
-        
-        if tipo_busca == "cancelar":
-            return None
-        
-        if tipo_busca == "id":
-            try:
-                categoria_id = int(input("ID da categoria: "))
-                resultado = self.db.executar_consulta(
-                    "SELECT * FROM categorias WHERE id = ? AND ativo = 1", 
-                    (categoria_id,)
-                )
-                return resultado[0] if resultado else None
-            except ValueError:
-                print("ID inválido!")
-                return None
-        
-        # Busca por texto
-        termo = input(f"Digite o termo para buscar por {tipo_busca}: ").strip()
-        if not termo:
-            print("Termo de busca não pode estar vazio!")
-            return None
-        
-        # Construir query baseada no tipo de busca
-        if tipo_busca == "nome":
-            query = "SELECT * FROM categorias WHERE nome LIKE ? AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%",)
-        elif tipo_busca == "descricao":
-            query = "SELECT * FROM categorias WHERE descricao LIKE ? AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%",)
-        else:  # texto
-            query = "SELECT * FROM categorias WHERE (nome LIKE ? OR descricao LIKE ?) AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%", f"%{termo}%")
-        
-        resultados = self.db.executar_consulta(query, params)
-        
-        if not resultados:
-            print("Nenhuma categoria encontrada!")
-            return None
-        
-        # Converter para lista de dicionários
-        categorias = [dict(cat) for cat in resultados]
-        
-        # Exibir resultados
-        self.exibir_resultados(categorias, titulo, ['id', 'nome', 'descricao'])
+    def ler_termo(self, entidade: str, tipo_busca: str, filtros=(), colunas: Optional[List[str]] = None) -> str:
+        """Ler o termo de busca mostrando, a cada tecla, uma prévia dos resultados.
+        A prévia usa o cache: refinar um termo já digitado não consulta o banco."""
+        mensagem = f"Digite o termo para buscar por {tipo_busca}: "
+        if not self.db.config.get('busca.incremental', True):
+            return input(mensagem).strip()
+        
+        limite = self.db.config.get('busca.limite_previa', 10)
+        
+        def previa(texto):
+            clear_screen()
+            print(mensagem + texto)
+            termo = texto.strip()
+            if len(termo) < 2:
+                return
+            resultados = self.servico.pesquisar(entidade, termo, tipo_busca, filtros)
+            if resultados:
+                self.exibir_resultados(resultados[:limite], f"{len(resultados)} resultado(s)",
+                                       colunas or ['id', 'nome'])
+            else:
+                print("Nenhum resultado encontrado.")
         
-        # Selecionar por índice
-        return self.selecionar_por_indice(categorias, "Escolha a categoria")
+        return (prompt_incremental(mensagem, previa) or "").strip()
     
-    def buscar_produto(self, titulo: str = "SELECIONAR PRODUTO", com_estoque: bool = False, tipo_forcado: Optional[str] = None) -> Optional[Dict]:
-        """Buscar produto com diferentes critérios.
-        Se tipo_forcado for informado (ex.: "nome", "descricao", "texto", "id"), ignora o menu.
-        """
-        tipo_busca = tipo_forcado or self.menu_tipo_busca("produto")
+    def buscar(self, entidade: str, titulo: str, filtros=(), tipo_forcado: Optional[str] = None) -> Optional[Any]:
+        """Fluxo comum das buscas: escolher o modo, ler o termo (ou o ID),
+        exibir os resultados e selecionar um por índice.
+        Se tipo_forcado for informado (ex.: "nome", "descricao", "texto", "id"), ignora o menu."""
+        rotulo, colunas, mensagem = self.TELAS[entidade]
+        tipo_busca = tipo_forcado or self.menu_tipo_busca(rotulo)
         
         if tipo_busca == "cancelar":
             return None
         
         if tipo_busca == "id":
             try:
-                produto_id = int(input("ID do produto: "))
-                query = "SELECT * FROM produtos WHERE id = ? AND ativo = 1"
-                if com_estoque:
-                    query += " AND estoque > 0"
-                resultado = self.db.executar_consulta(query, (produto_id,))
-                return resultado[0] if resultado else None
+                registro_id = int(input(f"ID do {rotulo}: "))
+                return self.servico.buscar_por_id(entidade, registro_id, filtros)
             except ValueError:
                 print("ID inválido!")
                 return None
         
         # Busca por texto
-        termo = input(f"Digite o termo para buscar por {tipo_busca}: ").strip()
+        termo = self.ler_termo(entidade, tipo_busca, filtros, colunas)
         if not termo:
             print("Termo de busca não pode estar vazio!")
             return None
         
-        # Construir query baseada no tipo de busca
-        base_query = """
-            SELECT p.*, c.nome as categoria_nome 
-            FROM produtos p 
-            LEFT JOIN categorias c ON p.categoria_id = c.id 
-            WHERE p.ativo = 1
-        """
-        
-        if com_estoque:
-            base_query += " AND p.estoque > 0"
-        
-        if tipo_busca == "nome":
-            base_query += " AND p.nome LIKE ?"
-            params = (f"%{termo}%",)
-        elif tipo_busca == "descricao":
-            base_query += " AND p.descricao LIKE ?"
-            params = (f"%{termo}%",)
-        else:  # texto
-            base_query += " AND (p.nome LIKE ? OR p.descricao LIKE ? OR p.codigo_barras LIKE ?)"
-            params = (f"%{termo}%", f"%{termo}%", f"%{termo}%")
-        
-        base_query += " ORDER BY p.nome"
-        
-        resultados = self.db.executar_consulta(base_query, params)
+        resultados = self.servico.pesquisar(entidade, termo, tipo_busca, filtros)
         
         if not resultados:
-            print("Nenhum produto encontrado!")
+            print(f"Nenhum {rotulo} encontrado!")
             return None
         
-        # Converter para lista de dicionários
-        produtos = [dict(prod) for prod in resultados]
-        
         # Exibir resultados
-        self.exibir_resultados(produtos, titulo, ['id', 'nome', 'categoria_nome', 'preco_venda', 'estoque'])
+        self.exibir_resultados(resultados, titulo, colunas)
         
         # Selecionar por índice
-        return self.selecionar_por_indice(produtos, "Escolha o produto")
+        return self.selecionar_por_indice(resultados, mensagem, titulo, colunas)
+    
+    def pesquisar(self, entidade: str, termo: str, tipo_busca: str = "texto", com_estoque: bool = False) -> List:
+        """Pesquisar produtos, clientes, categorias ou usuários passando pelo cache LRU"""
+        return self.servico.pesquisar(entidade, termo, tipo_busca, ('com_estoque',) if com_estoque else ())
+    
+    def pesquisar_produtos(self, termo: str, tipo_busca: str = "texto", com_estoque: bool = False) -> List:
+        """Executar a pesquisa de produtos direto no banco (sem cache e sem interação)"""
+        return self.servico.consultar('produtos', termo, tipo_busca, ('com_estoque',) if com_estoque else ())
+    
+    def buscar_categoria(self, titulo: str = "SELECIONAR CATEGORIA") -> Optional[Any]:
+        """Buscar categoria com diferentes critérios"""
+        return self.buscar('categorias', titulo)
     
-    def buscar_cliente(self, titulo: str = "SELECIONAR CLIENTE") -> Optional[Dict]:
+    def buscar_produto(self, titulo: str = "SELECIONAR PRODUTO", com_estoque: bool = False, tipo_forcado: Optional[str] = None) -> Optional[Any]:
+        """Buscar produto com diferentes critérios (com_estoque: apenas produtos com saldo)"""
+        return self.buscar('produtos', titulo, ('com_estoque',) if com_estoque else (), tipo_forcado)
+    
+    def buscar_cliente(self, titulo: str = "SELECIONAR CLIENTE") -> Optional[Any]:
         """Buscar cliente com diferentes critérios"""
-        tipo_busca = self.menu_tipo_busca("cliente")
-        
-        if tipo_busca == "cancelar":
-            return None
-        
-        if tipo_busca == "id":
-            try:
-                cliente_id = int(input("ID do cliente: "))
-                resultado = self.db.executar_consulta(
-                    "SELECT * FROM clientes WHERE id = ? AND ativo = 1", 
-                    (cliente_id,)
-                )
-                return resultado[0] if resultado else None
-            except ValueError:
-                print("ID inválido!")
-                return None
-        
-        # Busca por texto
-        termo = input(f"Digite o termo para buscar por {tipo_busca}: ").strip()
-        if not termo:
-            print("Termo de busca não pode estar vazio!")
-            return None
-        
-        # Construir query baseada no tipo de busca
-        if tipo_busca == "nome":
-            query = "SELECT * FROM clientes WHERE nome LIKE ? AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%",)
-        elif tipo_busca == "descricao":
-            query = "SELECT * FROM clientes WHERE (telefone LIKE ? OR email LIKE ? OR endereco LIKE ?) AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%", f"%{termo}%", f"%{termo}%")
-        else:  # texto
-            query = "SELECT * FROM clientes WHERE (nome LIKE ? OR telefone LIKE ? OR email LIKE ? OR cpf_cnpj LIKE ?) AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%", f"%{termo}%", f"%{termo}%", f"%{termo}%")
-        
-        resultados = self.db.executar_consulta(query, params)
-        
-        if not resultados:
-            print("Nenhum cliente encontrado!")
-            return None
-        
-        # Converter para lista de dicionários
-        clientes = [dict(cli) for cli in resultados]
-        
-        # Exibir resultados
-        self.exibir_resultados(clientes, titulo, ['id', 'nome', 'telefone', 'email'])
-        
-        # Selecionar por índice
-        return self.selecionar_por_indice(clientes, "Escolha o cliente")
+        return self.buscar('clientes', titulo)
     
-    def buscar_usuario(self, titulo: str = "SELECIONAR USUÁRIO") -> Optional[Dict]:
+    def buscar_usuario(self, titulo: str = "SELECIONAR USUÁRIO") -> Optional[Any]:
         """Buscar usuário com diferentes critérios"""
-        tipo_busca = self.menu_tipo_busca("usuário")
-        
-        if tipo_busca == "cancelar":
-            return None
-        
-        if tipo_busca == "id":
-            try:
-                usuario_id = int(input("ID do usuário: "))
-                resultado = self.db.executar_consulta(
-                    "SELECT * FROM usuarios WHERE id = ? AND ativo = 1", 
-                    (usuario_id,)
-                )
-                return resultado[0] if resultado else None
-            except ValueError:
-                print("ID inválido!")
-                return None
-        
-        # Busca por texto
-        termo = input(f"Digite o termo para buscar por {tipo_busca}: ").strip()
-        if not termo:
-            print("Termo de busca não pode estar vazio!")
-            return None
-        
-        # Construir query baseada no tipo de busca
-        if tipo_busca == "nome":
-            query = "SELECT * FROM usuarios WHERE nome LIKE ? AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%",)
-        elif tipo_busca == "descricao":
-            query = "SELECT * FROM usuarios WHERE username LIKE ? AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%",)
-        else:  # texto
-            query = "SELECT * FROM usuarios WHERE (nome LIKE ? OR username LIKE ?) AND ativo = 1 ORDER BY nome"
-            params = (f"%{termo}%", f"%{termo}%")
-        
-        resultados = self.db.executar_consulta(query, params)
-        
-        if not resultados:
-            print("Nenhum usuário encontrado!")
-            return None
-        
-        # Converter para lista de dicionários
-        usuarios = [dict(usr) for usr in resultados]
-        
-        # Exibir resultados
-        self.exibir_resultados(usuarios, titulo, ['id', 'username', 'nome', 'nivel_permissao'])
-        
-        # Selecionar por índice
-        return self.selecionar_por_indice(usuarios, "Escolha o usuário")
+        return self.buscar('usuarios', titulo)
@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+
+
+class CacheBusca:
+    """Cache LRU de resultados de pesquisa, chaveado por (entidade, modo, filtros, termo).
+
+    Quando o termo novo apenas estende um termo já pesquisado ("coc" -> "coca"),
+    o resultado é obtido filtrando em memória a lista anterior, sem consultar o
+    banco. Entradas de uma entidade são descartadas em invalidar(entidade).
+    """
+
+    def __init__(self, capacidade=128):
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.refinamentos = 0
+        self.faltas = 0
+
+    @staticmethod
+    def _chave(entidade, modo, filtros, termo):
+        return (entidade, modo, tuple(sorted(filtros)), termo.strip().lower())
+
+    def obter(self, entidade, modo, filtros, termo, filtro):
+        """Resultado do termo sem acessar o banco, ou None se for preciso consultar.
+        filtro(linha, termo) decide se uma linha do termo anterior continua valendo."""
+        chave = self._chave(entidade, modo, filtros, termo)
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave][0]
+            # Maior termo já pesquisado do qual o novo é continuação
+            base = None
+            for outra, (resultados, refinavel) in self._itens.items():
+                if (refinavel and outra[:3] == chave[:3] and outra[3] and chave[3].startswith(outra[3])
+                        and (base is None or len(outra[3]) > len(base[0]))):
+                    base = (outra[3], resultados)
+            if base is None:
+                self.faltas += 1
+                return None
+            self.refinamentos += 1
+
+        refinados = [linha for linha in base[1] if filtro(linha, termo)]
+        self.guardar(entidade, modo, filtros, termo, refinados)
+        return refinados
+
+    def guardar(self, entidade, modo, filtros, termo, resultados, refinavel=True):
+        """Guardar o resultado do termo. refinavel=False impede que termos mais longos
+        sejam filtrados a partir dele (ex.: resultados aproximados, que não seguem
+        o mesmo critério do filtro)"""
+        chave = self._chave(entidade, modo, filtros, termo)
+        with self._lock:
+            self._itens[chave] = (resultados, refinavel)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def invalidar(self, entidade=None):
+        """Descartar os resultados da entidade (ou todos)"""
+        with self._lock:
+            if entidade is None:
+                self._itens.clear()
+                return
+            for chave in [chave for chave in self._itens if chave[0] == entidade]:
+                del self._itens[chave]
+
+    def estatisticas(self):
+        return {
+            'entradas': len(self._itens),
+            'capacidade': self.capacidade,
+            'acertos': self.acertos,
+            'refinamentos': self.refinamentos,
+            'faltas': self.faltas,
+        }
@@ -0,0 +1,102 @@
+import itertools
+import os
+
+
+def _pyarrow():
+    """pyarrow é opcional: só as exportações/leituras colunares dependem dele"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Formato Parquet requer o pacote pyarrow (pip install pyarrow)") from None
+    return pyarrow, pyarrow.parquet
+
+
+def _coluna(pa, valores, tipo):
+    # Datas do SQLite chegam como texto ISO; o Arrow converte na carga
+    if pa.types.is_timestamp(tipo):
+        return pa.array(valores, pa.string()).cast(tipo)
+    return pa.array(valores, tipo)
+
+
+def gravar_parquet(diretorio, colunas, linhas, particao=None, progresso=None, lote=50000):
+    """Gravar as linhas (qualquer iterável de tuplas, ex.: um cursor) em Parquet, em lotes.
+    colunas é uma sequência de (nome, tipo do Arrow), ex.: ('valor_total', 'int64').
+    Com particao (ex.: 'mes'), cada linha começa pelo valor da partição, as linhas vêm
+    ordenadas por ele e cada valor vira uma pasta <particao>=<valor> (layout hive, lido
+    direto por pandas, pyarrow e duckdb). Retorna a quantidade de linhas."""
+    pa, pq = _pyarrow()
+    esquema = pa.schema([(nome, pa.type_for_alias(tipo)) for nome, tipo in colunas])
+    linhas = iter(linhas)
+    if particao is None:
+        grupos = [(None, linhas)]
+    else:
+        grupos = ((valor, (linha[1:] for linha in grupo))
+                  for valor, grupo in itertools.groupby(linhas, key=lambda linha: linha[0]))
+
+    os.makedirs(diretorio, exist_ok=True)
+    total = 0
+    for valor, grupo in grupos:
+        pasta = diretorio if valor is None else os.path.join(diretorio, f"{particao}={valor}")
+        os.makedirs(pasta, exist_ok=True)
+        with pq.ParquetWriter(os.path.join(pasta, 'dados.parquet'), esquema, compression='zstd') as escritor:
+            while True:
+                bloco = list(itertools.islice(grupo, lote))
+                if not bloco:
+                    break
+                valores = list(zip(*bloco))
+                escritor.write_batch(pa.record_batch(
+                    [_coluna(pa, valores[i], campo.type) for i, campo in enumerate(esquema)], schema=esquema))
+                total += len(bloco)
+                if progresso:
+                    progresso(total)
+    return total
+
+
+def _arquivos(diretorio, inicio=None, fim=None):
+    """Arquivos .parquet do diretório; nas pastas de partição, só os com valor entre inicio e fim"""
+    arquivos = []
+    for nome in sorted(os.listdir(diretorio)):
+        caminho = os.path.join(diretorio, nome)
+        if os.path.isdir(caminho):
+            valor = nome.split('=', 1)[-1]
+            if (inicio is None or valor >= inicio) and (fim is None or valor <= fim):
+                arquivos.extend(os.path.join(caminho, arquivo) for arquivo in sorted(os.listdir(caminho))
+                                if arquivo.endswith('.parquet'))
+        elif nome.endswith('.parquet'):
+            arquivos.append(caminho)
+    return arquivos
+
+
+def ler_parquet(diretorio, inicio=None, fim=None, colunas=None):
+    """Ler os arquivos gravados por gravar_parquet como uma tabela do Arrow.
+    Em diretórios particionados, só as pastas com valor entre inicio e fim
+    (inclusive, ex.: '2025-01' a '2025-12') são abertas. Retorna None se não houver dados."""
+    pa, pq = _pyarrow()
+    arquivos = _arquivos(diretorio, inicio, fim)
+    if not arquivos:
+        return None
+    return pa.concat_tables(pq.read_table(arquivo, columns=colunas) for arquivo in arquivos)
+
+
+def iterar_parquet(diretorio, inicio=None, fim=None, lote=50000):
+    """Caminho inverso de gravar_parquet, para gravar no banco: retorna (nomes das colunas,
+    gerador de lotes de tuplas). Os lotes são lidos um por vez e as datas voltam ao texto
+    do SQLite ('AAAA-MM-DD HH:MM:SS'). Sem arquivos, retorna ([], gerador vazio)."""
+    pa, pq = _pyarrow()
+    arquivos = _arquivos(diretorio, inicio, fim)
+    if not arquivos:
+        return [], iter(())
+    esquema = pq.read_schema(arquivos[0])
+
+    def coluna(valores):
+        if pa.types.is_timestamp(valores.type):
+            valores = pa.compute.strftime(valores.cast(pa.timestamp('s'), safe=False), format='%Y-%m-%d %H:%M:%S')
+        return valores.to_pylist()
+
+    def lotes():
+        for arquivo in arquivos:
+            for bloco in pq.ParquetFile(arquivo).iter_batches(batch_size=lote, columns=esquema.names):
+                yield list(zip(*(coluna(valores) for valores in bloco.columns)))
+    return esquema.names, lotes()
@@ -3,6 +3,18 @@ import os
 import json
 from pathlib import Path
 
+def _mesclar(padrao, arquivo):
+    """Sobrepor o config.json aos padrões chave a chave, descendo nos dicionários:
+    um bloco parcial (ex.: só "database.pool") mantém as demais chaves padrão"""
+    resultado = dict(padrao)
+    for chave, valor in arquivo.items():
+        if isinstance(valor, dict) and isinstance(resultado.get(chave), dict):
+            resultado[chave] = _mesclar(resultado[chave], valor)
+        else:
+            resultado[chave] = valor
+    return resultado
+
+
 class Config:
     def __init__(self, config_file="config.json"):
         self.config_file = Path(__file__).parent.parent / config_file
@@ -13,7 +25,40 @@ class Config:
         default_config = {
             "database": {
                 "path": "db/finance.db",
-                "type": "sqlite"
+                "type": "sqlite",
+                "cache_instrucoes": 256,
+                "tamanho_lote": 500,
+                "pool": {
+                    "tamanho": 4,
+                    "tempo_ocioso": 300,
+                    "tempo_espera": 5,
+                    "intervalo_verificacao": 30
+                },
+                "leitura": {
+                    "tamanho": 2
+                },
+                "pragmas": {
+                    "journal_mode": "WAL",
+                    "synchronous": "NORMAL",
+                    "cache_size": -16000,
+                    "mmap_size": 268435456,
+                    "temp_store": "MEMORY",
+                    "busy_timeout": 5000
+                }
+            },
+            "paginacao": {
+                "tamanho": 20
+            },
+            "busca": {
+                "incremental": True,
+                "cache_tamanho": 128,
+                "limite_previa": 10
+            },
+            "importacao": {
+                "lote": 5000
+            },
+            "metricas": {
+                "consulta_lenta_ms": 100
             },
             "logging": {
                 "level": "INFO",
@@ -27,7 +72,7 @@ class Config:
         
         if self.config_file.exists():
             with open(self.config_file, 'r') as f:
-                return {**default_config, **json.load(f)}
+                return _mesclar(default_config, json.load(f))
         return default_config
     
     def get(self, key, default=None):
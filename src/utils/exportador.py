@@ -0,0 +1,66 @@
+import csv
+import gzip
+import itertools
+import os
+from datetime import datetime
+
+# Formato -> extensão do arquivo
+FORMATOS = {'xlsx': '.xlsx', 'csv': '.csv', 'csv.gz': '.csv.gz'}
+
+
+def caminho_exportacao(diretorio, prefixo, formato):
+    """export/<prefixo>_AAAAMMDD_HHMMSS.<extensão>, criando o diretório se preciso.
+    O arquivo é reservado (criado vazio, em modo exclusivo) antes de retornar: nunca
+    aponta para um arquivo existente; em caso de colisão o nome ganha _2, _3..."""
+    os.makedirs(diretorio, exist_ok=True)
+    data_hora = datetime.now().strftime('%Y%m%d_%H%M%S')
+    for numero in itertools.count(1):
+        sufixo = f"_{numero}" if numero > 1 else ""
+        caminho = os.path.join(diretorio, f"{prefixo}_{data_hora}{sufixo}{FORMATOS[formato]}")
+        try:
+            open(caminho, 'x').close()
+            return caminho
+        except FileExistsError:
+            continue
+
+
+def gravar_linhas(caminho, colunas, linhas, formato='xlsx', progresso=None, lote=5000, aba='Dados'):
+    """Gravar as linhas (qualquer iterável de tuplas, ex.: um cursor) em fluxo,
+    sem montar a tabela em memória: o Excel usa o modo write_only do openpyxl e o
+    CSV é escrito (ou compactado com gzip) direto no arquivo.
+    progresso(gravadas) é chamado a cada lote. Retorna a quantidade de linhas."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação inválido: {formato!r}")
+    linhas = iter(linhas)
+    total = 0
+
+    if formato == 'xlsx':
+        from openpyxl import Workbook
+        livro = Workbook(write_only=True)
+        planilha = livro.create_sheet(aba)
+        planilha.append(list(colunas))
+        while True:
+            bloco = list(itertools.islice(linhas, lote))
+            if not bloco:
+                break
+            for linha in bloco:
+                planilha.append(linha)
+            total += len(bloco)
+            if progresso:
+                progresso(total)
+        livro.save(caminho)
+        return total
+
+    abrir = gzip.open if formato == 'csv.gz' else open
+    with abrir(caminho, 'wt', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(colunas)
+        while True:
+            bloco = list(itertools.islice(linhas, lote))
+            if not bloco:
+                break
+            escritor.writerows(bloco)
+            total += len(bloco)
+            if progresso:
+                progresso(total)
+    return total
@@ -0,0 +1,84 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Limites (ms) das faixas do histograma: crescem 2^(1/4) (~19%) de 0,01 ms a ~70 s
+FAIXAS_MS = tuple(0.01 * 2 ** (i / 4) for i in range(92))
+
+
+class Histograma:
+    """Distribuição de durações em faixas fixas (memória constante).
+    Os percentis são o limite superior da faixa, com erro de até ~19%."""
+
+    __slots__ = ('contagens', 'quantidade', 'total_ms', 'maximo_ms')
+
+    def __init__(self):
+        self.contagens = [0] * (len(FAIXAS_MS) + 1)
+        self.quantidade = 0
+        self.total_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def registrar(self, ms):
+        self.contagens[bisect.bisect_left(FAIXAS_MS, ms)] += 1
+        self.quantidade += 1
+        self.total_ms += ms
+        if ms > self.maximo_ms:
+            self.maximo_ms = ms
+
+    def percentil(self, p):
+        if not self.quantidade:
+            return 0.0
+        alvo = max(1, -(-self.quantidade * p // 100))
+        acumulado = 0
+        for faixa, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(FAIXAS_MS[faixa], self.maximo_ms) if faixa < len(FAIXAS_MS) else self.maximo_ms
+        return self.maximo_ms
+
+    def resumo(self):
+        return {
+            'execucoes': self.quantidade,
+            'media_ms': round(self.total_ms / self.quantidade, 3) if self.quantidade else 0.0,
+            'p50_ms': round(self.percentil(50), 3),
+            'p95_ms': round(self.percentil(95), 3),
+            'p99_ms': round(self.percentil(99), 3),
+            'max_ms': round(self.maximo_ms, 3),
+        }
+
+
+class Metricas:
+    """Histogramas de tempo por grupo (ex.: 'busca', 'sql') e chave
+    (ex.: 'produtos/nome/banco', texto da instrução)"""
+
+    def __init__(self):
+        self._histogramas = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, grupo, chave, ms):
+        with self._lock:
+            histograma = self._histogramas.get((grupo, chave))
+            if histograma is None:
+                histograma = self._histogramas[(grupo, chave)] = Histograma()
+            histograma.registrar(ms)
+
+    @contextmanager
+    def medir(self, grupo, chave):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(grupo, chave, (time.perf_counter() - inicio) * 1000)
+
+    def resumo(self, grupo=None):
+        """Lista de (grupo, chave, resumo) do maior para o menor p95"""
+        with self._lock:
+            itens = [(g, chave, h.resumo()) for (g, chave), h in self._histogramas.items()
+                     if grupo is None or g == grupo]
+        itens.sort(key=lambda item: -item[2]['p95_ms'])
+        return itens
+
+    def limpar(self):
+        with self._lock:
+            self._histogramas.clear()
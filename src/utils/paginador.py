@@ -0,0 +1,168 @@
+import math
+import os
+from utils.tui import clear_screen, print_header, print_title, print_table, print_footer_hotkeys, read_key
+
+
+class PaginadorKeyset:
+    """Navegação página a página por uma consulta ordenada, sem OFFSET.
+
+    Cada página é buscada a partir da chave (ex.: nome, id) da última linha
+    exibida: WHERE (nome, id) > (?, ?) ORDER BY nome, id LIMIT n. Assim o
+    custo de uma página não cresce com a posição na lista, e só ela fica em
+    memória. A consulta informada deve terminar na cláusula WHERE, sem ORDER BY.
+    """
+
+    def __init__(self, db, consulta, params=(), chave=('nome', 'id'), posicoes_chave=(1, 0),
+                 tamanho=None, contagem=None, somente_leitura=False):
+        self.db = db
+        self.consulta = consulta
+        self.params = tuple(params)
+        self.chave = chave
+        self.posicoes_chave = posicoes_chave
+        self.tamanho = tamanho or db.config.get('paginacao.tamanho', 20)
+        self.contagem = contagem or f"SELECT COUNT(*) FROM ({consulta})"
+        self.somente_leitura = somente_leitura
+        self.linhas = []
+        self.numero = 0
+        self.tem_proxima = False
+        self._total = None
+
+    def _buscar(self, limite=None, avancar=True):
+        query = self.consulta
+        params = self.params
+        if limite is not None:
+            marcadores = ", ".join("?" * len(limite))
+            query += f" AND ({', '.join(self.chave)}) {'>' if avancar else '<'} ({marcadores})"
+            params += tuple(limite)
+        direcao = "ASC" if avancar else "DESC"
+        query += " ORDER BY " + ", ".join(f"{coluna} {direcao}" for coluna in self.chave) + " LIMIT ?"
+        # Uma linha a mais indica se existe outra página nessa direção
+        linhas = self.db.buscar_todos(query, params + (self.tamanho + 1,), self.somente_leitura)
+        mais = len(linhas) > self.tamanho
+        linhas = linhas[:self.tamanho]
+        if not avancar:
+            linhas.reverse()
+        return linhas, mais
+
+    def _chave_de(self, linha):
+        return tuple(linha[posicao] for posicao in self.posicoes_chave)
+
+    def primeira(self):
+        self.linhas, self.tem_proxima = self._buscar()
+        self.numero = 1
+        return self.linhas
+
+    def proxima(self):
+        if self.tem_proxima and self.linhas:
+            linhas, mais = self._buscar(self._chave_de(self.linhas[-1]))
+            if linhas:
+                self.linhas, self.tem_proxima = linhas, mais
+                self.numero += 1
+        return self.linhas
+
+    def anterior(self):
+        if self.tem_anterior and self.linhas:
+            linhas, _ = self._buscar(self._chave_de(self.linhas[0]), avancar=False)
+            if linhas:
+                self.linhas, self.tem_proxima = linhas, True
+                self.numero -= 1
+        return self.linhas
+
+    @property
+    def tem_anterior(self):
+        return self.numero > 1
+
+    def total(self):
+        """Quantidade de linhas da consulta (calculada uma vez por listagem)"""
+        if self._total is None:
+            self._total = self.db.buscar_um(self.contagem, self.params, self.somente_leitura)[0]
+        return self._total
+
+    def total_paginas(self):
+        return max(1, math.ceil(self.total() / self.tamanho))
+
+
+class PaginadorCatalogo:
+    """Mesma interface do PaginadorKeyset sobre o catálogo de produtos em memória:
+    cada página parte do último (nome, id) exibido, achado por busca binária na
+    ordem que o catálogo já mantém, e só as linhas dela são montadas."""
+
+    def __init__(self, catalogo, colunas, posicoes_chave=(1, 0), ordem='nome', tamanho=None, config=None):
+        self.catalogo = catalogo
+        self.colunas = colunas
+        self.posicoes_chave = posicoes_chave
+        self.ordem = ordem
+        self.tamanho = tamanho or (config.get('paginacao.tamanho', 20) if config else 20)
+        self.linhas = []
+        self.numero = 0
+        self.tem_proxima = False
+
+    def _chave_de(self, linha):
+        return tuple(linha[posicao] for posicao in self.posicoes_chave)
+
+    def primeira(self):
+        self.linhas, self.tem_proxima = self.catalogo.pagina(self.colunas, None, self.tamanho, ordem=self.ordem)
+        self.numero = 1
+        return self.linhas
+
+    def proxima(self):
+        if self.tem_proxima and self.linhas:
+            linhas, mais = self.catalogo.pagina(self.colunas, self._chave_de(self.linhas[-1]), self.tamanho,
+                                                ordem=self.ordem)
+            if linhas:
+                self.linhas, self.tem_proxima = linhas, mais
+                self.numero += 1
+        return self.linhas
+
+    def anterior(self):
+        if self.tem_anterior and self.linhas:
+            linhas, _ = self.catalogo.pagina(self.colunas, self._chave_de(self.linhas[0]), self.tamanho,
+                                             avancar=False, ordem=self.ordem)
+            if linhas:
+                self.linhas, self.tem_proxima = linhas, True
+                self.numero -= 1
+        return self.linhas
+
+    @property
+    def tem_anterior(self):
+        return self.numero > 1
+
+    def total(self):
+        return len(self.catalogo)
+
+    def total_paginas(self):
+        return max(1, math.ceil(self.total() / self.tamanho))
+
+
+def exibir_paginado(paginador, titulo, headers, formatar, usuario_nome=None):
+    """Mostrar uma listagem página a página (N: próxima, P: anterior, outra tecla: voltar).
+    formatar(linha) converte cada linha do banco na lista de textos da tabela."""
+    ansi_enabled = os.getenv('ANSI_ENABLED', 'nao').lower() == 'sim'
+    header_color = os.getenv('ANSI_HEADER_COLOR', 'yellow')
+    footer_color = os.getenv('ANSI_FOOTER_COLOR', 'cyan')
+
+    paginador.primeira()
+    while True:
+        clear_screen()
+        print_header(usuario_nome, ansi_enabled, header_color)
+        print_title(titulo, ansi_enabled, header_color)
+        print_table(headers, [formatar(linha) for linha in paginador.linhas], ansi_enabled, header_color, zebra=True)
+        print(f"\nPágina {paginador.numero} de {paginador.total_paginas()} ({paginador.total()} registros)")
+
+        atalhos = []
+        if paginador.tem_anterior:
+            atalhos.append(("P", "Anterior"))
+        if paginador.tem_proxima:
+            atalhos.append(("N", "Próxima"))
+        atalhos.append(("F12", "Voltar"))
+        print_footer_hotkeys(atalhos, ansi_enabled, footer_color)
+
+        tecla = read_key()
+        if tecla in ("N", "RIGHT", "DOWN") and paginador.tem_proxima:
+            paginador.proxima()
+        elif tecla in ("P", "LEFT", "UP") and paginador.tem_anterior:
+            paginador.anterior()
+        elif tecla in ("N", "P", "RIGHT", "LEFT", "UP", "DOWN"):
+            continue
+        else:
+            return
@@ -0,0 +1,305 @@
+import re
+import time
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from utils.cache_busca import CacheBusca
+
+
+@dataclass(frozen=True)
+class EntidadeBusca:
+    """Definição de uma entidade pesquisável pelo ServicoBusca"""
+    nome: str                               # chave da entidade (nome da tabela)
+    campos: Dict[str, Tuple[str, ...]]      # modo de busca -> colunas comparadas
+    alias: str = 't'
+    colunas: str = 't.*'
+    juncoes: str = ''
+    condicao: str = 't.ativo = 1'
+    ordem: str = 'nome'
+    filtros: Dict[str, str] = field(default_factory=dict)   # nome -> condição SQL extra
+    fts: Optional[str] = None               # tabela FTS5 cujo rowid é o id da entidade
+    colunas_fts: Tuple[str, ...] = ()       # colunas da tabela FTS, na ordem de criação
+    pesos_fts: Tuple[float, ...] = ()       # peso de cada coluna no ranking bm25
+    aproximada: Optional[str] = None        # atributo do Database com índice de busca aproximada
+    colunas_digitos: Tuple[str, ...] = ()   # cópias só com dígitos (CPF/CNPJ, telefone), indexadas
+    nomes: Dict[str, Tuple[str, str]] = field(default_factory=dict)   # coluna -> (coluna do id, registro no Database)
+    memoria: Optional[str] = None           # atributo do Database que pesquisa a entidade em memória
+
+    @property
+    def origem(self):
+        return f"{self.nome} {self.alias} {self.juncoes}"
+
+
+ENTIDADES = (
+    EntidadeBusca(
+        'produtos',
+        campos={'nome': ('nome',), 'descricao': ('descricao',),
+                'texto': ('nome', 'descricao', 'codigo_barras')},
+        alias='p', colunas='p.*', condicao='p.ativo = 1',
+        filtros={'com_estoque': 'p.estoque > 0'},
+        fts='produtos_fts', colunas_fts=('nome', 'descricao', 'codigo_barras'), pesos_fts=(10.0, 2.0, 1.0),
+        aproximada='indice_fuzzy',
+        nomes={'categoria_nome': ('categoria_id', 'categorias')},
+    ),
+    EntidadeBusca(
+        'clientes',
+        campos={'nome': ('nome',), 'descricao': ('telefone', 'email', 'endereco'),
+                'texto': ('nome', 'telefone', 'email', 'cpf_cnpj')},
+        colunas_digitos=('cpf_cnpj_digitos', 'telefone_digitos'),
+    ),
+    EntidadeBusca(
+        'categorias',
+        campos={'nome': ('nome',), 'descricao': ('descricao',), 'texto': ('nome', 'descricao')},
+        memoria='categorias',
+    ),
+    EntidadeBusca(
+        'usuarios',
+        campos={'nome': ('nome',), 'descricao': ('username',), 'texto': ('nome', 'username')},
+    ),
+)
+
+
+@lru_cache(maxsize=65536)
+def tokens_fts(texto):
+    """Palavras do texto em minúsculas e sem acentos, como o tokenizador unicode61
+    do FTS5, no formato " palavra1 palavra2" (prefixo = trecho após um espaço)"""
+    decomposto = unicodedata.normalize('NFKD', texto.lower())
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return "".join(" " + palavra for palavra in re.findall(r"\w+", sem_acentos))
+
+
+# Termo formado só por dígitos e pontuação de documento/telefone ("123.456.789-00", "(11) 9")
+_DOCUMENTO = re.compile(r"[\d\s.\-/()+]*\d[\d\s.\-/()+]*")
+
+
+def digitos_documento(termo):
+    """Dígitos do termo se ele for um CPF/CNPJ ou telefone (completo ou o começo), senão None"""
+    if _DOCUMENTO.fullmatch(termo):
+        return re.sub(r"\D", "", termo)
+    return None
+
+
+def expressao_fts(termo):
+    """Converter o termo digitado em expressão FTS5: cada palavra vira um
+    prefixo entre aspas ("coca"* "cola"*), todas obrigatórias"""
+    palavras = re.findall(r"\w+", termo)
+    return " ".join('"' + palavra.replace('"', '""') + '"*' for palavra in palavras)
+
+
+class ServicoBusca:
+    """Pesquisa única para todas as telas de busca.
+
+    Cada entidade é declarada por um EntidadeBusca; o serviço escolhe o caminho
+    da consulta (registro em memória, FTS5 quando a entidade tem índice textual,
+    LIKE nas colunas do modo caso contrário, busca aproximada quando nada é
+    encontrado), guarda os resultados no cache LRU compartilhado e mede o
+    tempo por entidade.
+    """
+
+    def __init__(self, database, entidades=ENTIDADES):
+        self.db = database
+        self.entidades = {}
+        self.cache = CacheBusca(database.config.get('busca.cache_tamanho', 128))
+        self._fts = {}
+        self._metricas = {}
+        self._lock = threading.Lock()
+        for entidade in entidades:
+            self.registrar(entidade)
+
+    def registrar(self, entidade: EntidadeBusca):
+        self.entidades[entidade.nome] = entidade
+        self._metricas[entidade.nome] = {
+            'pesquisas': 0, 'do_cache': 0, 'tempo_total_ms': 0.0, 'tempo_maximo_ms': 0.0
+        }
+        self.db.observar(entidade.nome, lambda ids, nome=entidade.nome: self.cache.invalidar(nome))
+
+    def fts_disponivel(self, tabela: str) -> bool:
+        """Verificar (uma vez) se a tabela FTS existe neste banco"""
+        if tabela not in self._fts:
+            self._fts[tabela] = self.db.buscar_um(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+            ) is not None
+        return self._fts[tabela]
+
+    def pesquisar(self, entidade: str, termo: str, modo: str = "texto", filtros=()) -> List:
+        """Linhas da entidade que atendem ao termo, passando pelo cache"""
+        inicio = time.perf_counter()
+        termo = termo.strip()
+        definicao = self.entidades[entidade]
+        # Buscas por documento usam outro critério: ficam em entradas próprias do cache
+        chave_modo = "documento" if self._por_documento(definicao, termo, modo) else modo
+        resultados = self.cache.obter(entidade, chave_modo, filtros, termo,
+                                      self._filtro_refino(definicao, chave_modo))
+        do_cache = resultados is not None
+        origem = "cache"
+
+        if not do_cache:
+            resultados = self.consultar(entidade, termo, modo, filtros)
+            refinavel = True
+            origem = "banco"
+            if not resultados and definicao.aproximada and modo != "descricao":
+                # Nada com o termo exato: tentar nomes parecidos (erros de digitação)
+                resultados = self.consultar_aproximado(entidade, termo, filtros)
+                refinavel = False
+                origem = "aproximada"
+            self.cache.guardar(entidade, chave_modo, filtros, termo, resultados, refinavel)
+
+        self._registrar_tempo(entidade, f"{chave_modo}/{origem}", time.perf_counter() - inicio, do_cache)
+        return resultados
+
+    def consultar(self, entidade: str, termo: str, modo: str = "texto", filtros=()) -> List:
+        """Consultar o banco, sem cache. Usa o FTS5 quando disponível; trechos numéricos
+        sem resultado no FTS (ex.: meio de um código de barras) ainda caem no LIKE.
+        CPF/CNPJ e telefone digitados (com ou sem pontuação) usam as colunas só com dígitos."""
+        definicao = self.entidades[entidade]
+        if definicao.memoria:
+            return getattr(self.db, definicao.memoria).pesquisar(termo, definicao.campos[modo])
+        condicoes = [definicao.filtros[nome] for nome in filtros]
+        if self._por_documento(definicao, termo, modo):
+            return self._completar(definicao, self._consultar_documento(definicao, digitos_documento(termo), condicoes))
+        if definicao.fts and self.fts_disponivel(definicao.fts):
+            linhas = self._consultar_fts(definicao, termo, modo, condicoes)
+            if linhas or not (modo == "texto" and termo.isdigit()):
+                return self._completar(definicao, linhas)
+        return self._completar(definicao, self._consultar_like(definicao, termo, modo, condicoes))
+
+    def _completar(self, definicao, linhas):
+        """Acrescentar às linhas as colunas resolvidas em memória (ex.: nome da categoria
+        pelo RegistroCategorias), no lugar de um JOIN em cada consulta"""
+        if not definicao.nomes:
+            return linhas
+        resolvedores = [(coluna, origem, getattr(self.db, registro).nome)
+                        for coluna, (origem, registro) in definicao.nomes.items()]
+        completas = []
+        for linha in linhas:
+            linha = dict(linha)
+            for coluna, origem, nome in resolvedores:
+                linha[coluna] = nome(linha[origem])
+            completas.append(linha)
+        return completas
+
+    @staticmethod
+    def _por_documento(definicao, termo, modo):
+        return bool(definicao.colunas_digitos) and modo == "texto" and digitos_documento(termo) is not None
+
+    def _consultar_documento(self, definicao, digitos, condicoes):
+        """Busca exata ou por começo nas colunas só com dígitos: cada coluna é
+        lida por faixa no seu índice (>= '123' AND < '124').
+        O "+" na condição base impede o planejador de preferir o índice (ativo, nome)."""
+        fim = digitos[:-1] + chr(ord(digitos[-1]) + 1)
+        a = definicao.alias
+        faixas = " OR ".join(f"({a}.{coluna} >= ? AND {a}.{coluna} < ?)" for coluna in definicao.colunas_digitos)
+        query = f"""
+            SELECT {definicao.colunas} FROM {definicao.origem}
+            WHERE ({faixas}) AND +({definicao.condicao}) {"".join(f" AND {c}" for c in condicoes)}
+            ORDER BY {a}.{definicao.ordem}
+        """
+        return self.db.buscar_todos(query, (digitos, fim) * len(definicao.colunas_digitos))
+
+    def _consultar_like(self, definicao, termo, modo, condicoes):
+        campos = definicao.campos[modo]
+        a = definicao.alias
+        busca = " OR ".join(f"{a}.{campo} LIKE ?" for campo in campos)
+        query = f"""
+            SELECT {definicao.colunas} FROM {definicao.origem}
+            WHERE {definicao.condicao} AND ({busca}) {"".join(f" AND {c}" for c in condicoes)}
+            ORDER BY {a}.{definicao.ordem}
+        """
+        return self.db.buscar_todos(query, (f"%{termo}%",) * len(campos))
+
+    def _consultar_fts(self, definicao, termo, modo, condicoes):
+        expressao = expressao_fts(termo)
+        if not expressao:
+            return []
+        campos = definicao.campos[modo]
+        if set(campos) != set(definicao.colunas_fts):
+            expressao = f"{{{' '.join(campos)}}} : ({expressao})"
+
+        a = definicao.alias
+        query = f"""
+            SELECT {definicao.colunas}
+            FROM {definicao.fts} f
+            JOIN {definicao.nome} {a} ON {a}.id = f.rowid {definicao.juncoes}
+            WHERE {definicao.fts} MATCH ? AND {definicao.condicao} {"".join(f" AND {c}" for c in condicoes)}
+            ORDER BY bm25({definicao.fts}, {", ".join(map(str, definicao.pesos_fts))}), {a}.{definicao.ordem}
+        """
+        return self.db.buscar_todos(query, (expressao,))
+
+    def consultar_aproximado(self, entidade: str, termo: str, filtros=(), limite: int = 20) -> List:
+        """Linhas com nome parecido com o termo, da mais para a menos parecida.
+        A comparação roda no índice em memória; o banco só entrega as linhas escolhidas."""
+        definicao = self.entidades[entidade]
+        similares = dict(getattr(self.db, definicao.aproximada).buscar(termo, limite))
+        if not similares:
+            return []
+        a = definicao.alias
+        query = f"""
+            SELECT {definicao.colunas} FROM {definicao.origem}
+            WHERE {a}.id IN ({", ".join("?" * len(similares))}) AND {definicao.condicao}
+            {"".join(f" AND {definicao.filtros[nome]}" for nome in filtros)}
+        """
+        linhas = self._completar(definicao, self.db.buscar_todos(query, tuple(similares)))
+        linhas.sort(key=lambda linha: -similares[linha['id']])
+        return linhas
+
+    def buscar_por_id(self, entidade: str, registro_id: int, filtros=()):
+        """Linha ativa da entidade com o id informado, ou None"""
+        definicao = self.entidades[entidade]
+        with self.db.metricas.medir('busca', f"{entidade}/id"):
+            if definicao.memoria:
+                return getattr(self.db, definicao.memoria).buscar(registro_id)
+            query = f"""
+                SELECT {definicao.colunas} FROM {definicao.origem}
+                WHERE {definicao.alias}.id = ? AND {definicao.condicao}
+                {"".join(f" AND {definicao.filtros[nome]}" for nome in filtros)}
+            """
+            linha = self.db.buscar_um(query, (registro_id,))
+            return self._completar(definicao, [linha])[0] if linha else None
+
+    def _filtro_refino(self, definicao, modo):
+        """Função que reaplica em memória o critério da consulta a uma linha já obtida"""
+        if modo == "documento":
+            def filtro_documento(linha, termo):
+                digitos = digitos_documento(termo) or ""
+                return any(str(linha[c] or '').startswith(digitos) for c in definicao.colunas_digitos)
+            return filtro_documento
+
+        campos = definicao.campos[modo]
+
+        if definicao.fts and self.fts_disponivel(definicao.fts):
+            def filtro_fts(linha, termo):
+                prefixos = tokens_fts(termo).split(" ")[1:]
+                tokens = tokens_fts(" ".join(str(linha[c] or '') for c in campos))
+                if all(" " + prefixo in tokens for prefixo in prefixos):
+                    return True
+                # Trechos numéricos também são aceitos no meio das colunas (LIKE)
+                return modo == "texto" and termo.isdigit() and any(termo in str(linha[c] or '') for c in campos)
+            return filtro_fts
+
+        def filtro_like(linha, termo):
+            termo = termo.lower()
+            return any(termo in str(linha[c] or '').lower() for c in campos)
+        return filtro_like
+
+    def _registrar_tempo(self, entidade, caminho, segundos, do_cache):
+        """Somar aos contadores da entidade e ao histograma 'busca' de
+        entidade/modo/origem (cache, banco ou aproximada) em db.metricas"""
+        ms = segundos * 1000
+        self.db.metricas.registrar('busca', f"{entidade}/{caminho}", ms)
+        with self._lock:
+            metricas = self._metricas[entidade]
+            metricas['pesquisas'] += 1
+            metricas['do_cache'] += do_cache
+            metricas['tempo_total_ms'] += ms
+            metricas['tempo_maximo_ms'] = max(metricas['tempo_maximo_ms'], ms)
+
+    def estatisticas(self):
+        """Pesquisas, acertos de cache e tempos (ms) por entidade, mais os contadores do cache"""
+        with self._lock:
+            por_entidade = {
+                nome: {**m, 'tempo_medio_ms': round(m['tempo_total_ms'] / m['pesquisas'], 3) if m['pesquisas'] else 0.0}
+                for nome, m in self._metricas.items()
+            }
+        return {'entidades': por_entidade, 'cache': self.cache.estatisticas()}
@@ -60,6 +60,54 @@ def read_key():
         return None
 
 
+def prompt_incremental(message: str, on_change):
+    """Ler um texto tecla a tecla, chamando on_change(texto) a cada alteração
+    (on_change é responsável por redesenhar a tela). Retorna o texto ao pressionar ENTER ou
+    None com ESC. Sem terminal interativo, faz fallback para input() simples.
+    """
+    if os.name == "nt":
+        import msvcrt  # type: ignore
+        getch, restore = msvcrt.getwch, None
+    elif sys.stdin.isatty():
+        import termios
+        import tty
+        fd = sys.stdin.fileno()
+        old_attrs = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+        getch = lambda: sys.stdin.read(1)
+        restore = lambda: termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+    else:
+        return input(message)
+
+    text = ""
+    try:
+        sys.stdout.write(message)
+        sys.stdout.flush()
+        while True:
+            ch = getch()
+            if ch in ("\r", "\n"):
+                print()
+                return text
+            if ch == "\x1b":
+                print()
+                return None
+            if ch == "\x03":
+                raise KeyboardInterrupt
+            if os.name == "nt" and ch in ("\x00", "\xe0"):
+                getch()  # tecla estendida (setas, F1-F12): ignorada
+                continue
+            if ch in ("\x08", "\x7f"):
+                text = text[:-1]
+            elif ch.isprintable():
+                text += ch
+            else:
+                continue
+            on_change(text)
+    finally:
+        if restore:
+            restore()
+
+
 def print_footer_hotkeys(hints, enabled_colors: bool = False, color: str | None = None):
     """Imprimir um rodapé com atalhos. hints: lista de tuplas (tecla, descrição)."""
     if not hints:
@@ -0,0 +1,84 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from controler.import_export_controller import ImportExportController, colunas_atualizadas  # noqa: E402
+from db.database import Database  # noqa: E402
+
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = Database(str(tmp_path / 'teste.db'))
+    db.inicializar_tabelas()
+    yield ImportExportController(db)
+    db.fechar()
+
+
+def importar(controller, planilha):
+    registros, erros = controller.preparar_importacao(planilha, atualizar=True)
+    controller.gravar_produtos(registros, atualizar=True, colunas=colunas_atualizadas(planilha))
+    return erros
+
+
+def test_atualizar_duas_vezes_nao_duplica_produtos(controller):
+    planilha = pd.DataFrame({
+        'codigo_barras': ['7890000000001', '7890000000002', None],
+        'nome': ['Coca', 'Pepsi', 'Sem codigo'],
+        'preco_custo': [1.5, 1.4, 1.0],
+        'preco_venda': [3.0, 2.8, 2.0],
+        'estoque': [10, 5, 1],
+    })
+
+    erros = importar(controller, planilha)
+    total = controller.db.buscar_um("SELECT COUNT(*) FROM produtos")[0]
+    assert erros == [(4, "código de barras obrigatório no modo atualizar")]
+
+    importar(controller, planilha)
+    assert controller.db.buscar_um("SELECT COUNT(*) FROM produtos")[0] == total
+    assert controller.db.buscar_um("SELECT COUNT(*) FROM produtos WHERE nome = 'Sem codigo'")[0] == 0
+
+
+def test_atualizar_sem_coluna_estoque(controller):
+    importar(controller, pd.DataFrame({
+        'codigo_barras': ['7890000000001'], 'nome': ['Coca'], 'preco_custo': [1.5],
+        'preco_venda': [3.0], 'estoque': [10],
+    }))
+
+    erros = importar(controller, pd.DataFrame({
+        'codigo_barras': ['7890000000001', '7890000000002'], 'nome': ['Coca', 'Pepsi'],
+        'preco_custo': [1.6, 1.4], 'preco_venda': [3.2, 2.8],
+    }))
+
+    assert erros == []
+    estoques = dict(controller.db.buscar_todos("SELECT nome, estoque FROM produtos"))
+    assert estoques == {'Coca': 10, 'Pepsi': 0}
+
+
+def test_importar_base_colunar(controller, tmp_path):
+    pytest.importorskip('pyarrow')
+    controller.db.executar_consulta(
+        "INSERT INTO clientes (nome, telefone, cpf_cnpj) VALUES ('Ana', '(11) 98765-4321', '123.456.789-00')")
+    importar(controller, pd.DataFrame({
+        'codigo_barras': ['7890000000001'], 'nome': ['Coca'], 'preco_custo': [1.5],
+        'preco_venda': [3.0], 'estoque': [10],
+    }))
+    caminho, _ = controller.gerar_exportacao_colunar()
+
+    destino = Database(str(tmp_path / 'destino.db'))
+    destino.inicializar_tabelas()
+    try:
+        outro = ImportExportController(destino)
+        outro.importar_colunar(caminho)
+        totais = outro.importar_colunar(caminho)
+
+        assert totais['clientes'] == 1 and totais['produtos'] == 1
+        assert destino.buscar_um("SELECT COUNT(*) FROM produtos")[0] == 1
+        assert [tuple(linha) for linha in destino.buscar_todos("SELECT nome, cpf_cnpj_digitos FROM clientes")] == \
+            [('Ana', '12345678900')]
+    finally:
+        destino.fechar()